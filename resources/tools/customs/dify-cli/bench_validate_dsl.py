@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""validate_dsl 참조 검증 마이크로 벤치마크
+
+합성 워크플로우 그래프(기본 1k / 10k 노드)에 대해 단일 순회 validate_references와
+기존 2회 순회 방식(변수 참조 + value_selector 각각 전체 순회, 모든 키마다 경로 문자열 생성)을 비교.
+두 방식의 이슈 결과가 동일한지도 함께 확인.
+
+Usage:
+    python bench_validate_dsl.py [--nodes 1000 10000] [--repeat 3]
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from validate_dsl import ValidationResult, validate_references
+
+
+# ── 기존 방식 (비교 기준) ───────────────────────────────────────────
+
+def _legacy_var_refs(workflow: dict, result: ValidationResult):
+    nodes = workflow.get("graph", {}).get("nodes", [])
+    node_ids = {n.get("id") for n in nodes if isinstance(n, dict) and n.get("id")}
+    pattern = re.compile(r'\{\{#([^.]+)\.')
+
+    def walk(obj: Any, path: str):
+        if isinstance(obj, str):
+            for match in pattern.finditer(obj):
+                ref = match.group(1)
+                if ref not in node_ids and ref not in ("sys", "env"):
+                    result.warning("VAR_REF", f"변수 참조 '{{{{#{ref}...#}}}}'의 노드가 존재하지 않음", path=path)
+        elif isinstance(obj, dict):
+            for key, value in obj.items():
+                walk(value, f"{path}.{key}")
+        elif isinstance(obj, list):
+            for j, item in enumerate(obj):
+                walk(item, f"{path}[{j}]")
+
+    for i, node in enumerate(nodes):
+        if isinstance(node, dict):
+            walk(node.get("data", {}), f"workflow.graph.nodes[{i}]")
+
+
+def _legacy_selectors(workflow: dict, result: ValidationResult):
+    nodes = workflow.get("graph", {}).get("nodes", [])
+    node_ids = {n.get("id") for n in nodes if isinstance(n, dict) and n.get("id")} | {"sys", "env"}
+
+    def walk(obj: Any, path: str):
+        if isinstance(obj, dict):
+            if "value_selector" in obj:
+                selector = obj["value_selector"]
+                if isinstance(selector, list) and len(selector) >= 1:
+                    ref = selector[0]
+                    if isinstance(ref, str) and ref not in node_ids:
+                        result.warning("SELECTOR", f"value_selector [{ref}, ...] 의 노드가 존재하지 않음",
+                                       path=f"{path}.value_selector")
+            for key, value in obj.items():
+                walk(value, f"{path}.{key}")
+        elif isinstance(obj, list):
+            for j, item in enumerate(obj):
+                walk(item, f"{path}[{j}]")
+
+    for i, node in enumerate(nodes):
+        if isinstance(node, dict):
+            walk(node.get("data", {}), f"workflow.graph.nodes[{i}].data")
+
+
+def legacy(workflow: dict, result: ValidationResult):
+    _legacy_var_refs(workflow, result)
+    _legacy_selectors(workflow, result)
+
+
+# ── 합성 그래프 ─────────────────────────────────────────────────────
+
+def make_workflow(node_count: int, broken_every: int = 97) -> dict:
+    """LLM/Code 노드가 섞인 합성 그래프. broken_every개마다 존재하지 않는 노드를 참조"""
+    prompt = "당신은 고객 문의를 분류하는 어시스턴트입니다. " * 20
+    nodes = [{"id": "start", "data": {"type": "start", "title": "Start", "variables": []}}]
+    for n in range(1, node_count):
+        prev = f"n{n - 1}" if n > 1 else "start"
+        ref = "missing" if n % broken_every == 0 else prev
+        if n % 2:
+            data = {
+                "type": "llm", "title": f"LLM {n}",
+                "model": {"provider": "langgenius/openai/openai", "name": "gpt-4o", "mode": "chat"},
+                "prompt_template": [
+                    {"role": "system", "text": prompt},
+                    {"role": "user", "text": f"{prompt} {{{{#{ref}.text#}}}} {{{{#sys.query#}}}}"},
+                ],
+                "context": {"enabled": False, "variable_selector": []},
+            }
+        else:
+            data = {
+                "type": "code", "title": f"Code {n}", "code_language": "python3",
+                "code": "def main(x):\n    return {'y': x}\n" * 5,
+                "variables": [{"variable": "x", "value_selector": [ref, "text"]}],
+                "outputs": {"y": {"type": "string", "children": None}},
+            }
+        nodes.append({"id": f"n{n}", "data": data, "position": {"x": n * 10, "y": 0}})
+    return {"graph": {"nodes": nodes, "edges": []}}
+
+
+def _best_of(func, workflow: dict, repeat: int) -> tuple[float, ValidationResult]:
+    best = float("inf")
+    result = ValidationResult()
+    for _ in range(repeat):
+        result = ValidationResult()
+        start = time.perf_counter()
+        func(workflow, result)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="validate_references 벤치마크")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 10000], help="그래프 노드 수 (기본값: 1000 10000)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수, 최솟값 사용 (기본값: 3)")
+    args = parser.parse_args()
+
+    print(f"{'노드 수':>8} | {'기존(ms)':>10} | {'단일 순회(ms)':>13} | {'속도 향상':>8} | 결과 일치")
+    print("-" * 62)
+    for count in args.nodes:
+        workflow = make_workflow(count)
+        legacy_ms, legacy_result = _best_of(legacy, workflow, args.repeat)
+        new_ms, new_result = _best_of(validate_references, workflow, args.repeat)
+        same = legacy_result.issues == new_result.issues
+        print(f"{count:>8,} | {legacy_ms:>10.1f} | {new_ms:>13.1f} | {legacy_ms / new_ms:>7.2f}x | {'OK' if same else 'MISMATCH'}")
+        if not same:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
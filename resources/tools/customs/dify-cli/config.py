@@ -7,6 +7,13 @@ from dotenv import load_dotenv
 load_dotenv(Path(__file__).parent / ".env")
 
 
+def _env_bool(name: str, default: bool = False) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
 @dataclass
 class DifyConfig:
     """Dify Console API 접속 설정"""
@@ -15,12 +22,31 @@ class DifyConfig:
     password: str = os.getenv("DIFY_PASSWORD", "")
     admin_api_key: str = os.getenv("DIFY_ADMIN_API_KEY", "")
     workspace_id: str = os.getenv("DIFY_WORKSPACE_ID", "")
+    app_api_key: str = os.getenv("DIFY_APP_API_KEY", "")
+
+    # HTTP 전송 계층 (연결 풀 / keep-alive / HTTP/2)
+    max_connections: int = int(os.getenv("DIFY_HTTP_MAX_CONNECTIONS", "100"))
+    max_keepalive_connections: int = int(os.getenv("DIFY_HTTP_MAX_KEEPALIVE", "20"))
+    keepalive_expiry: float = float(os.getenv("DIFY_HTTP_KEEPALIVE_EXPIRY", "30"))
+    http2: bool = _env_bool("DIFY_HTTP2")
+
+    # 작업별 타임아웃 (초)
+    connect_timeout: float = float(os.getenv("DIFY_CONNECT_TIMEOUT", "10"))
+    timeout: float = float(os.getenv("DIFY_TIMEOUT", "30"))
+    export_timeout: float = float(os.getenv("DIFY_EXPORT_TIMEOUT", "60"))
+    import_timeout: float = float(os.getenv("DIFY_IMPORT_TIMEOUT", "120"))
+    run_timeout: float = float(os.getenv("DIFY_RUN_TIMEOUT", "300"))
 
     @property
     def console_api_url(self) -> str:
         """Console API base URL"""
         return f"{self.base_url.rstrip('/')}/console/api"
 
+    @property
+    def service_api_url(self) -> str:
+        """Service API base URL (워크플로우 실행)"""
+        return f"{self.base_url.rstrip('/')}/v1"
+
     @property
     def use_admin_key(self) -> bool:
         """Admin API Key 사용 여부"""
@@ -4,18 +4,27 @@
 사용법:
   python dify_cli.py list [--mode MODE]
   python dify_cli.py export <app_id> [-o FILE]
+  python dify_cli.py export-all [-o DIR] [--mode MODE] [--concurrency N]
   python dify_cli.py import <file> [--name NAME]
   python dify_cli.py update <app_id> <file>
+  python dify_cli.py import-dir <dir> [--concurrency N] [--jobs N] [--manifest FILE]
+  python dify_cli.py update-dir <dir> [--map FILE] [--concurrency N] [--jobs N] [--manifest FILE]
   python dify_cli.py publish <app_id> [--name NAME] [--comment COMMENT]
   python dify_cli.py run [--inputs JSON] [--mode blocking|streaming] [--user USER]
-  python dify_cli.py validate [file]
+  python dify_cli.py bench <inputs.jsonl> [--concurrency N] [--rps N] [--requests N] [-m MODE] [-o FILE]
+  python dify_cli.py validate [file|dir|glob ...] [--jobs N] [--format text|json|junit|sarif] [-o FILE]
 """
 import argparse
 import asyncio
+import csv
 import json
 import os
+import re
 import sys
 import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
 
 # 동일 디렉토리의 모듈 import를 위한 경로 추가
@@ -26,6 +35,7 @@ load_dotenv(Path(__file__).parent / ".env")
 
 from config import DifyConfig
 from dify_client import DifyClient, DifyClientError
+from sse import EventDispatcher
 
 # Windows 콘솔 UTF-8 출력 지원
 import io
@@ -33,14 +43,16 @@ if sys.platform == "win32":
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
 
-from validate_dsl import validate_dsl, print_result as print_validation_result
+from validate_dsl import (
+    Severity, ValidationCache, validate_dsl, collect_dsl_files, validate_many, write_report,
+    REPORT_FORMATTERS,
+)
 
 # .env 기본값 (~, $USERPROFILE 등 환경변수 확장 지원)
 DEFAULT_APP_ID = os.getenv("DIFY_DEFAULT_APP_ID", "")
 _raw_dsl_path = os.getenv("DIFY_DEFAULT_DSL_PATH", "")
 DEFAULT_DSL_PATH = str(Path(os.path.expandvars(_raw_dsl_path)).expanduser()) if _raw_dsl_path else ""
 APP_API_KEY = os.getenv("DIFY_APP_API_KEY", "")
-BASE_URL = os.getenv("DIFY_BASE_URL", "http://localhost")
 
 
 def format_table(rows: list[tuple], headers: tuple) -> str:
@@ -72,8 +84,7 @@ async def cmd_list(args):
     client = DifyClient(config)
 
     try:
-        result = await client.list_apps(mode=args.mode, page=1, limit=100)
-        apps = result.get("data", [])
+        apps = [app async for app in client.iter_apps(mode=args.mode)]
 
         if not apps:
             print("앱이 없습니다.")
@@ -112,6 +123,66 @@ async def cmd_export(args):
         await client.close()
 
 
+def _safe_filename(name: str) -> str:
+    """앱 이름을 파일명으로 쓸 수 있게 정리"""
+    cleaned = re.sub(r'[\\/:*?"<>|\s]+', "_", name).strip("._")
+    return cleaned or "app"
+
+
+async def cmd_export_all(args):
+    """모든 앱 DSL 일괄 내보내기 (페이지 순회 + 동시 실행 제한)"""
+    if args.concurrency < 1:
+        print("오류: --concurrency는 1 이상이어야 합니다.", file=sys.stderr)
+        sys.exit(1)
+    config = DifyConfig()
+    client = DifyClient(config)
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    total_bytes = 0
+    exported = 0
+    errors: list[tuple[str, str]] = []
+    start_time = time.time()
+
+    async def export_one(app: dict):
+        nonlocal total_bytes, exported
+        app_id = app["id"]
+        try:
+            async with semaphore:
+                yaml_content = await client.export_dsl(app_id, include_secret=False)
+            output_path = output_dir / f"{_safe_filename(app.get('name', ''))}_{app_id}.yaml"
+            data = yaml_content.encode("utf-8")
+            # 도착 즉시 디스크에 기록 (이벤트 루프를 막지 않도록 스레드에서 수행)
+            await asyncio.to_thread(output_path.write_bytes, data)
+            total_bytes += len(data)
+            exported += 1
+            print(f"  [{exported}] {output_path.name} ({len(data):,} bytes)")
+        except Exception as e:
+            errors.append((app_id, str(e)))
+            print(f"  [실패] {app.get('name', '')} ({app_id}): {e}", file=sys.stderr)
+
+    tasks: list[asyncio.Task] = []
+    try:
+        # 페이지를 받는 즉시 해당 앱들의 내보내기를 시작 (목록 조회와 내보내기 중첩)
+        async for app in client.iter_apps(mode=args.mode):
+            tasks.append(asyncio.create_task(export_one(app)))
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    finally:
+        await client.close()
+
+    elapsed = max(time.time() - start_time, 1e-9)
+    print(f"\n내보내기 완료: {exported}/{len(tasks)}개 앱 -> {output_dir} ({elapsed:.1f}초)")
+    print(f"처리량: {exported / elapsed:.1f} apps/s, {total_bytes / elapsed / 1024:.1f} KB/s "
+          f"(총 {total_bytes:,} bytes)")
+    if errors:
+        print(f"오류 {len(errors)}건", file=sys.stderr)
+        sys.exit(1)
+
+
 async def cmd_import(args):
     """DSL 가져오기 (신규 앱 생성)"""
     if not args.file:
@@ -201,6 +272,140 @@ async def cmd_update(args):
         await client.close()
 
 
+DSL_SUFFIXES = (".yml", ".yaml")
+_UUID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$", re.IGNORECASE)
+
+
+async def _import_with_confirm(client: DifyClient, yaml_content: str, app_id: str | None = None) -> tuple[str, str | None]:
+    """DSL 가져오기 + 버전 충돌(pending) 시 자동 확인. (최종 상태, app_id) 반환"""
+    result = await client.import_dsl(yaml_content=yaml_content, app_id=app_id)
+    status = result.get("status")
+    if status == "pending":
+        confirm_result = await client.confirm_import(result.get("id"))
+        return "confirmed", confirm_result.get("app_id") or app_id
+    return status, result.get("app_id") or app_id
+
+
+def _resolve_app_ids(files: list[Path], map_file: str | None) -> dict[Path, str]:
+    """update-dir 대상 파일별 app_id 결정 (--map JSON 우선, 없으면 파일명 끝의 UUID)"""
+    mapping: dict[str, str] = {}
+    if map_file:
+        mapping = json.loads(Path(map_file).read_text(encoding="utf-8"))
+    app_ids: dict[Path, str] = {}
+    for f in files:
+        app_id = mapping.get(f.name) or mapping.get(f.stem)
+        if not app_id:
+            match = _UUID_PATTERN.search(f.stem)
+            app_id = match.group(0) if match else None
+        if app_id:
+            app_ids[f] = app_id
+    return app_ids
+
+
+async def _deploy_dir(args, update: bool):
+    """디렉토리 단위 DSL 배포 파이프라인 (검증 → import → confirm)
+
+    검증은 프로세스 풀에서, import/confirm은 하나의 인증된 클라이언트에서
+    동시 실행 수를 제한하여 수행. 앞선 파일이 import되는 동안 뒤 파일의 검증이 진행됨.
+    """
+    if args.concurrency < 1 or (args.jobs is not None and args.jobs < 1):
+        print("오류: --concurrency/--jobs는 1 이상이어야 합니다.", file=sys.stderr)
+        sys.exit(1)
+    directory = Path(args.directory)
+    if not directory.is_dir():
+        print(f"오류: 디렉토리를 찾을 수 없습니다 - {directory}", file=sys.stderr)
+        sys.exit(1)
+    files = sorted(f for f in directory.iterdir() if f.is_file() and f.suffix.lower() in DSL_SUFFIXES)
+    if not files:
+        print(f"DSL 파일이 없습니다: {directory}")
+        return
+
+    app_ids = _resolve_app_ids(files, args.map) if update else {}
+    command = "update-dir" if update else "import-dir"
+    manifest_path = Path(args.manifest) if args.manifest else directory / f"{command}-manifest.json"
+
+    config = DifyConfig()
+    client = DifyClient(config)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    cache = None if args.no_cache else ValidationCache()
+    loop = asyncio.get_running_loop()
+    started_at = datetime.now(timezone.utc)
+    start_time = time.time()
+
+    async def deploy_one(pool: ProcessPoolExecutor | None, file_path: Path) -> dict:
+        entry: dict = {"file": file_path.name, "status": "ok", "app_id": app_ids.get(file_path)}
+        file_start = time.time()
+        try:
+            if update and not entry["app_id"]:
+                entry["status"] = "skipped"
+                entry["error"] = "app_id를 결정할 수 없음 (--map 또는 파일명 끝의 UUID 필요)"
+                return entry
+
+            if pool is not None:
+                validation = await loop.run_in_executor(pool, partial(validate_dsl, str(file_path), cache=cache))
+                entry["validation"] = {"errors": validation.error_count, "warnings": validation.warning_count}
+                if not validation.is_valid:
+                    entry["status"] = "invalid"
+                    entry["error"] = "; ".join(
+                        f"[{i.category}] {i.message}" for i in validation.issues if i.severity == Severity.ERROR
+                    )
+                    return entry
+
+            yaml_content = await asyncio.to_thread(file_path.read_text, encoding="utf-8")
+            async with semaphore:
+                import_status, app_id = await _import_with_confirm(client, yaml_content, entry["app_id"])
+            entry["import_status"] = import_status
+            entry["app_id"] = app_id
+            if import_status not in ("completed", "completed-with-warnings", "confirmed"):
+                entry["status"] = "error"
+                entry["error"] = f"예상치 못한 상태: {import_status}"
+        except Exception as e:
+            entry["status"] = "error"
+            entry["error"] = str(e)
+        finally:
+            entry["elapsed_seconds"] = round(time.time() - file_start, 3)
+            mark = "OK" if entry["status"] == "ok" else entry["status"].upper()
+            print(f"  [{mark}] {file_path.name}" + (f" -> {entry['app_id']}" if entry.get("app_id") else "")
+                  + (f" ({entry['error']})" if entry.get("error") else ""))
+        return entry
+
+    pool = None if args.no_validate else ProcessPoolExecutor(max_workers=args.jobs)
+    try:
+        entries = await asyncio.gather(*(deploy_one(pool, f) for f in files))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        await client.close()
+
+    elapsed = time.time() - start_time
+    summary = {status: sum(1 for e in entries if e["status"] == status) for status in ("ok", "invalid", "error", "skipped")}
+    manifest = {
+        "command": command,
+        "directory": str(directory),
+        "started_at": started_at.isoformat(),
+        "elapsed_seconds": round(elapsed, 3),
+        "summary": {"total": len(entries), **summary},
+        "files": entries,
+    }
+    manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    print(f"\n완료: 성공 {summary['ok']} / 검증 실패 {summary['invalid']} / 오류 {summary['error']} / "
+          f"건너뜀 {summary['skipped']} (총 {len(entries)}개, {elapsed:.1f}초)")
+    print(f"결과 매니페스트: {manifest_path}")
+    if summary["ok"] != len(entries):
+        sys.exit(1)
+
+
+async def cmd_import_dir(args):
+    """디렉토리의 DSL 파일 일괄 가져오기 (신규 앱 생성)"""
+    await _deploy_dir(args, update=False)
+
+
+async def cmd_update_dir(args):
+    """디렉토리의 DSL 파일로 기존 앱 일괄 덮어쓰기"""
+    await _deploy_dir(args, update=True)
+
+
 async def cmd_publish(args):
     """워크플로우 배포"""
     if not args.app_id:
@@ -250,91 +455,281 @@ async def cmd_run(args):
             sys.exit(1)
         inputs = json.loads(file_path.read_text(encoding="utf-8"))
 
-    import httpx
-    url = f"{BASE_URL.rstrip('/')}/v1/workflows/run"
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
+    config = DifyConfig()
+    client = DifyClient(config)
+    start_time = time.time()
+
+    try:
+        if args.response_mode == "streaming":
+            # SSE 스트리밍 수신 — 이벤트 타입별 핸들러로 출력
+            dispatcher = EventDispatcher()
+
+            @dispatcher.on("workflow_started")
+            def on_workflow_started(event):
+                print(f"[시작] workflow_run_id: {event.get('workflow_run_id')}")
+
+            @dispatcher.on("node_started")
+            def on_node_started(event):
+                node = event.get("data", {})
+                print(f"  [노드 시작] {node.get('title', '')} ({node.get('node_type', '')})")
+
+            @dispatcher.on("node_finished")
+            def on_node_finished(event):
+                node = event.get("data", {})
+                status = node.get("status", "")
+                elapsed = node.get("elapsed_time", 0)
+                print(f"  [노드 완료] {node.get('title', '')} - {status} ({elapsed:.1f}초)")
+
+            @dispatcher.on("text_chunk")
+            def on_text_chunk(event):
+                sys.stdout.write(event.get("data", {}).get("text", ""))
+                sys.stdout.flush()
+
+            @dispatcher.on("workflow_finished")
+            def on_workflow_finished(event):
+                wf = event.get("data", {})
+                print(f"\n[완료] 상태: {wf.get('status')}")
+                outputs = wf.get("outputs")
+                if outputs:
+                    print(json.dumps(outputs, ensure_ascii=False, indent=2))
+                elapsed_total = time.time() - start_time
+                tokens = wf.get("total_tokens", 0)
+                print(f"소요: {elapsed_total:.1f}초, 토큰: {tokens}")
+
+            @dispatcher.on("error")
+            def on_error(event):
+                print(f"\n[오류] {event.get('message', '')}", file=sys.stderr)
+
+            await dispatcher.consume(client.stream_workflow(inputs, user=args.user, api_key=api_key))
+        else:
+            # 블로킹 실행
+            result = await client.run_workflow(inputs, user=args.user, api_key=api_key)
+            print(json.dumps(result.get("data", {}), ensure_ascii=False, indent=2))
+
+    finally:
+        await client.close()
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float | None:
+    """정렬된 값의 백분위수 (선형 보간)"""
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * pct / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+def _percentiles(sorted_values: list[float]) -> dict[str, float | None]:
+    """p50/p90/p99 (소수 첫째 자리 반올림)"""
+    result = {}
+    for pct in (50, 90, 99):
+        value = _percentile(sorted_values, pct)
+        result[f"p{pct}"] = round(value, 1) if value is not None else None
+    return result
+
+
+def _load_bench_inputs(path: Path) -> list[dict]:
+    """JSONL 입력 파일 로드 (한 줄에 inputs 객체 하나)"""
+    inputs_list = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                inputs = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_no} JSON 파싱 실패 - {e}") from e
+            if not isinstance(inputs, dict):
+                raise ValueError(f"{path}:{line_no} inputs가 객체가 아님")
+            inputs_list.append(inputs)
+    return inputs_list
+
+
+async def _bench_one(client: DifyClient, index: int, inputs: dict, args, api_key: str, origin: float,
+                     scheduled_at: float) -> dict:
+    """워크플로우 1회 실행 후 측정 샘플 반환
+
+    scheduled_at: 요청을 보내려던 시각 (--rps면 고정 간격 예정 시각, 아니면 동시 실행 슬롯 대기 시작 시각).
+    --rps에서는 지연을 예정 시각부터 측정하여 --concurrency 상한으로 밀린 대기 시간을 포함 (coordinated omission 방지).
+    """
+    start = time.perf_counter()
+    base = scheduled_at if args.rps else start
+    sample: dict = {
+        "index": index,
+        "start_offset_ms": round((start - origin) * 1000, 1),
+        "queue_ms": round((start - scheduled_at) * 1000, 1),
+        "latency_ms": None,
+        "ttfe_ms": None,
+        "status": "ok",
+        "workflow_status": None,
+        "total_tokens": 0,
+        "error": "",
     }
-    body = {
-        "inputs": inputs,
+    try:
+        if args.response_mode == "streaming":
+            async for event in client.stream_workflow(inputs, user=args.user, api_key=api_key):
+                if sample["ttfe_ms"] is None:
+                    sample["ttfe_ms"] = round((time.perf_counter() - base) * 1000, 1)
+                event_type = event.get("event", "")
+                if event_type == "workflow_finished":
+                    wf = event.get("data", {})
+                    sample["workflow_status"] = wf.get("status")
+                    sample["total_tokens"] = wf.get("total_tokens") or 0
+                elif event_type == "error":
+                    sample["status"] = "error"
+                    sample["error"] = event.get("message", "")
+        else:
+            result = await client.run_workflow(inputs, user=args.user, api_key=api_key)
+            data = result.get("data", {})
+            sample["workflow_status"] = data.get("status")
+            sample["total_tokens"] = data.get("total_tokens") or 0
+        if sample["status"] == "ok" and sample["workflow_status"] != "succeeded":
+            sample["status"] = "error"
+            sample["error"] = (f"workflow status: {sample['workflow_status']}" if sample["workflow_status"]
+                               else "workflow_finished 이벤트 없음")
+    except Exception as e:
+        sample["status"] = "error"
+        sample["error"] = str(e)
+    sample["latency_ms"] = round((time.perf_counter() - base) * 1000, 1)
+    return sample
+
+
+def _fmt_ms(value: float | None) -> str:
+    return f"{value:.1f}" if value is not None else "-"
+
+
+def _bench_summary(samples: list[dict], elapsed: float, args) -> dict:
+    """샘플 집계 (지연 백분위수, 오류율, 토큰, 처리량)"""
+    ok = [s for s in samples if s["status"] == "ok"]
+    latencies = sorted(s["latency_ms"] for s in ok)
+    ttfes = sorted(s["ttfe_ms"] for s in ok if s["ttfe_ms"] is not None)
+    return {
         "response_mode": args.response_mode,
-        "user": args.user,
+        "concurrency": args.concurrency,
+        "target_rps": args.rps,
+        "requests": len(samples),
+        "succeeded": len(ok),
+        "errors": len(samples) - len(ok),
+        "error_rate": round((len(samples) - len(ok)) / len(samples), 4) if samples else 0.0,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            **_percentiles(latencies),
+            "mean": round(sum(latencies) / len(latencies), 1) if latencies else None,
+            "max": latencies[-1] if latencies else None,
+        },
+        "ttfe_ms": _percentiles(ttfes),
+        "queue_ms": _percentiles(sorted(s["queue_ms"] for s in samples)),
+        "total_tokens": sum(s["total_tokens"] for s in samples),
     }
 
-    start_time = time.time()
 
-    if args.response_mode == "streaming":
-        # SSE 스트리밍 수신
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            async with client.stream("POST", url, headers=headers, json=body) as resp:
-                if resp.status_code >= 400:
-                    error_body = await resp.aread()
-                    print(f"API 오류 [{resp.status_code}]: {error_body.decode()}", file=sys.stderr)
-                    sys.exit(1)
-
-                async for line in resp.aiter_lines():
-                    if line.startswith("data: "):
-                        data = line[6:]
-                        try:
-                            event = json.loads(data)
-                            event_type = event.get("event", "")
-                            if event_type == "workflow_started":
-                                print(f"[시작] workflow_run_id: {event.get('workflow_run_id')}")
-                            elif event_type == "node_started":
-                                node = event.get("data", {})
-                                print(f"  [노드 시작] {node.get('title', '')} ({node.get('node_type', '')})")
-                            elif event_type == "node_finished":
-                                node = event.get("data", {})
-                                status = node.get("status", "")
-                                elapsed = node.get("elapsed_time", 0)
-                                print(f"  [노드 완료] {node.get('title', '')} - {status} ({elapsed:.1f}초)")
-                            elif event_type == "text_chunk":
-                                text = event.get("data", {}).get("text", "")
-                                sys.stdout.write(text)
-                                sys.stdout.flush()
-                            elif event_type == "workflow_finished":
-                                wf = event.get("data", {})
-                                print(f"\n[완료] 상태: {wf.get('status')}")
-                                outputs = wf.get("outputs")
-                                if outputs:
-                                    print(json.dumps(outputs, ensure_ascii=False, indent=2))
-                                elapsed_total = time.time() - start_time
-                                tokens = wf.get("total_tokens", 0)
-                                print(f"소요: {elapsed_total:.1f}초, 토큰: {tokens}")
-                            elif event_type == "error":
-                                print(f"\n[오류] {event.get('message', '')}", file=sys.stderr)
-                        except json.JSONDecodeError:
-                            pass
+def _write_bench_samples(path: Path, summary: dict, samples: list[dict]):
+    """원시 샘플 저장 (.csv 또는 .json)"""
+    if path.suffix.lower() == ".csv":
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(samples[0].keys()))
+            writer.writeheader()
+            writer.writerows(samples)
     else:
-        # 블로킹 실행
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            resp = await client.post(url, headers=headers, json=body)
-            if resp.status_code >= 400:
-                print(f"API 오류 [{resp.status_code}]: {resp.text}", file=sys.stderr)
-                sys.exit(1)
-
-            result = resp.json()
-            data = result.get("data", {})
-            elapsed = time.time() - start_time
+        path.write_text(json.dumps({"summary": summary, "samples": samples}, ensure_ascii=False, indent=2),
+                        encoding="utf-8")
+
+
+async def cmd_bench(args):
+    """워크플로우 부하 생성 (Service API) — 지연 백분위수 측정"""
+    api_key = args.key
+    if not api_key or api_key.startswith("app-여기"):
+        print("오류: API Key가 필요합니다. (.env의 DIFY_APP_API_KEY 또는 --key 인자로 지정)", file=sys.stderr)
+        sys.exit(1)
+    if args.concurrency < 1 or (args.rps is not None and args.rps <= 0):
+        print("오류: --concurrency는 1 이상, --rps는 0보다 커야 합니다.", file=sys.stderr)
+        sys.exit(1)
+    if args.requests is not None and args.requests < 1:
+        print("오류: --requests는 1 이상이어야 합니다.", file=sys.stderr)
+        sys.exit(1)
+
+    file_path = Path(os.path.expandvars(args.file)).expanduser()
+    if not file_path.exists():
+        print(f"오류: 파일을 찾을 수 없습니다 - {file_path}", file=sys.stderr)
+        sys.exit(1)
+    inputs_list = _load_bench_inputs(file_path)
+    if not inputs_list:
+        print(f"오류: 입력이 비어 있습니다 - {file_path}", file=sys.stderr)
+        sys.exit(1)
+    total = args.requests if args.requests is not None else len(inputs_list)
+
+    config = DifyConfig()
+    client = DifyClient(config)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    origin = time.perf_counter()
+
+    async def scheduled(index: int) -> dict:
+        if args.rps:
+            # 목표 RPS: 요청 시작 시각을 고정 간격으로 배치 (동시 실행 수는 --concurrency로 상한)
+            scheduled_at = origin + index / args.rps
+            delay = scheduled_at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        else:
+            scheduled_at = time.perf_counter()
+        async with semaphore:
+            sample = await _bench_one(client, index, inputs_list[index % len(inputs_list)], args, api_key, origin,
+                                      scheduled_at)
+        if sample["status"] != "ok":
+            print(f"  [오류] #{index}: {sample['error']}", file=sys.stderr)
+        return sample
+
+    mode_desc = f"목표 {args.rps} rps" if args.rps else f"동시 {args.concurrency}개"
+    print(f"벤치마크 시작: {total}회, {args.response_mode}, {mode_desc}")
+    try:
+        samples = await asyncio.gather(*(scheduled(i) for i in range(total)))
+    finally:
+        await client.close()
+    elapsed = time.perf_counter() - origin
+
+    summary = _bench_summary(samples, elapsed, args)
+    lat = summary["latency_ms"]
+    print(f"\n요청: {summary['requests']}  성공: {summary['succeeded']}  "
+          f"오류: {summary['errors']} ({summary['error_rate'] * 100:.1f}%)")
+    print(f"소요: {summary['elapsed_seconds']:.1f}초  처리량: {summary['throughput_rps']:.2f} req/s")
+    print(f"지연(ms)  p50: {_fmt_ms(lat['p50'])}  p90: {_fmt_ms(lat['p90'])}  p99: {_fmt_ms(lat['p99'])}  "
+          f"평균: {_fmt_ms(lat['mean'])}  최대: {_fmt_ms(lat['max'])}")
+    if args.response_mode == "streaming":
+        ttfe = summary["ttfe_ms"]
+        print(f"첫 이벤트(ms)  p50: {_fmt_ms(ttfe['p50'])}  p90: {_fmt_ms(ttfe['p90'])}  p99: {_fmt_ms(ttfe['p99'])}")
+    if args.rps:
+        queue = summary["queue_ms"]
+        print(f"예정 시각 대비 대기(ms)  p50: {_fmt_ms(queue['p50'])}  p90: {_fmt_ms(queue['p90'])}  "
+              f"p99: {_fmt_ms(queue['p99'])}  (지연에 포함)")
+    print(f"총 토큰: {summary['total_tokens']:,}")
 
-            print(json.dumps(data, ensure_ascii=False, indent=2))
+    if args.output:
+        output_path = Path(args.output)
+        _write_bench_samples(output_path, summary, samples)
+        print(f"샘플 저장: {output_path}")
 
 
 def cmd_validate(args):
-    """DSL 파일 사전 검증"""
-    if not args.file:
+    """DSL 파일 사전 검증 (여러 파일/디렉토리/glob 일괄 검증 지원)"""
+    if not args.files:
         print("오류: YAML 파일 경로가 필요합니다. (.env의 DIFY_DEFAULT_DSL_PATH 또는 인자로 지정)", file=sys.stderr)
         sys.exit(1)
 
-    file_path = Path(args.file)
-    if not file_path.exists():
-        print(f"오류: 파일을 찾을 수 없습니다 - {file_path}", file=sys.stderr)
+    files = collect_dsl_files(args.files)
+    if len(files) == 1 and not files[0].exists():
+        print(f"오류: 파일을 찾을 수 없습니다 - {files[0]}", file=sys.stderr)
+        sys.exit(1)
+    if not files:
+        print(f"오류: DSL 파일을 찾을 수 없습니다 - {' '.join(args.files)}", file=sys.stderr)
         sys.exit(1)
 
-    result = validate_dsl(str(file_path))
-    print_validation_result(result, str(file_path))
-    if not result.is_valid:
+    cache = None if args.no_cache else ValidationCache()
+    report = validate_many(files, jobs=args.jobs, cache=cache, with_marks=args.marks)
+    write_report(report, args.format, args.output)
+    if not report.is_valid:
         sys.exit(1)
 
 
@@ -359,6 +754,17 @@ def main():
     parser_export.add_argument("app_id", nargs="?", default=DEFAULT_APP_ID, help=f"앱 ID (기본값: {DEFAULT_APP_ID[:12]}...)" if DEFAULT_APP_ID else "앱 ID")
     parser_export.add_argument("-o", "--output", default=DEFAULT_DSL_PATH or None, help=f"출력 파일 경로 (기본값: {Path(DEFAULT_DSL_PATH).name})" if DEFAULT_DSL_PATH else "출력 파일 경로 (기본값: stdout)")
 
+    # export-all 명령어
+    parser_export_all = subparsers.add_parser("export-all", help="모든 앱 DSL 일괄 내보내기")
+    parser_export_all.add_argument("-o", "--output", default="dify-export", help="출력 디렉토리 (기본값: dify-export)")
+    parser_export_all.add_argument(
+        "--mode",
+        default="all",
+        choices=["all", "workflow", "advanced-chat", "chat", "agent-chat", "completion"],
+        help="앱 유형 필터 (기본값: all)"
+    )
+    parser_export_all.add_argument("--concurrency", "-j", type=int, default=8, help="동시 내보내기 수 (기본값: 8)")
+
     # import 명령어
     parser_import = subparsers.add_parser("import", help="DSL 가져오기 (신규 앱 생성)")
     parser_import.add_argument("file", nargs="?", default=DEFAULT_DSL_PATH or None, help=f"YAML 파일 경로 (기본값: {Path(DEFAULT_DSL_PATH).name})" if DEFAULT_DSL_PATH else "YAML 파일 경로")
@@ -369,6 +775,18 @@ def main():
     parser_update.add_argument("app_id", nargs="?", default=DEFAULT_APP_ID, help=f"앱 ID (기본값: {DEFAULT_APP_ID[:12]}...)" if DEFAULT_APP_ID else "앱 ID")
     parser_update.add_argument("file", nargs="?", default=DEFAULT_DSL_PATH or None, help=f"YAML 파일 경로 (기본값: {Path(DEFAULT_DSL_PATH).name})" if DEFAULT_DSL_PATH else "YAML 파일 경로")
 
+    # import-dir / update-dir 명령어
+    parser_import_dir = subparsers.add_parser("import-dir", help="디렉토리의 DSL 일괄 가져오기 (신규 앱 생성)")
+    parser_update_dir = subparsers.add_parser("update-dir", help="디렉토리의 DSL로 기존 앱 일괄 덮어쓰기")
+    parser_update_dir.add_argument("--map", help="파일명 → app_id JSON 매핑 파일 (기본값: 파일명 끝의 UUID 사용)")
+    for sub in (parser_import_dir, parser_update_dir):
+        sub.add_argument("directory", help="DSL 파일(*.yml, *.yaml) 디렉토리")
+        sub.add_argument("--concurrency", "-c", type=int, default=4, help="동시 import 수 (기본값: 4)")
+        sub.add_argument("--jobs", type=int, default=None, help="검증 프로세스 수 (기본값: CPU 코어 수)")
+        sub.add_argument("--no-validate", action="store_true", help="사전 검증 생략")
+        sub.add_argument("--no-cache", action="store_true", help="검증 결과 캐시 사용 안 함")
+        sub.add_argument("--manifest", help="결과 매니페스트 경로 (기본값: <directory>/<명령어>-manifest.json)")
+
     # publish 명령어
     parser_publish = subparsers.add_parser("publish", help="워크플로우 배포")
     parser_publish.add_argument("app_id", nargs="?", default=DEFAULT_APP_ID, help=f"앱 ID (기본값: {DEFAULT_APP_ID[:12]}...)" if DEFAULT_APP_ID else "앱 ID")
@@ -377,7 +795,12 @@ def main():
 
     # validate 명령어
     parser_validate = subparsers.add_parser("validate", help="DSL 파일 사전 검증")
-    parser_validate.add_argument("file", nargs="?", default=DEFAULT_DSL_PATH or None, help=f"YAML 파일 경로 (기본값: {Path(DEFAULT_DSL_PATH).name})" if DEFAULT_DSL_PATH else "YAML 파일 경로")
+    parser_validate.add_argument("files", nargs="*", default=[DEFAULT_DSL_PATH] if DEFAULT_DSL_PATH else [], help=f"YAML 파일/디렉토리/glob (기본값: {Path(DEFAULT_DSL_PATH).name})" if DEFAULT_DSL_PATH else "YAML 파일/디렉토리/glob")
+    parser_validate.add_argument("--jobs", type=int, default=None, help="검증 프로세스 수 (기본값: CPU 코어 수)")
+    parser_validate.add_argument("--format", "-f", default="text", choices=["text", *REPORT_FORMATTERS], help="보고서 형식 (기본값: text)")
+    parser_validate.add_argument("--output", "-o", help="보고서 저장 경로 (기본값: stdout)")
+    parser_validate.add_argument("--no-cache", action="store_true", help="검증 결과 캐시 사용 안 함")
+    parser_validate.add_argument("--marks", action="store_true", help="이슈에 YAML 소스 줄 번호 표시")
 
     # run 명령어
     parser_run = subparsers.add_parser("run", help="워크플로우 실행 (Service API)")
@@ -387,6 +810,17 @@ def main():
     parser_run.add_argument("--response-mode", "-m", default="streaming", choices=["blocking", "streaming"], help="응답 모드 (기본값: streaming)")
     parser_run.add_argument("--user", "-u", default="cli-user", help="사용자 ID (기본값: cli-user)")
 
+    # bench 명령어
+    parser_bench = subparsers.add_parser("bench", help="워크플로우 부하 생성 및 지연 측정 (Service API)")
+    parser_bench.add_argument("file", help="입력 JSONL 파일 (한 줄에 inputs 객체 하나)")
+    parser_bench.add_argument("--key", "-k", default=APP_API_KEY, help="API Key (기본값: .env의 DIFY_APP_API_KEY)")
+    parser_bench.add_argument("--response-mode", "-m", default="blocking", choices=["blocking", "streaming"], help="응답 모드 (기본값: blocking)")
+    parser_bench.add_argument("--concurrency", "-c", type=int, default=4, help="최대 동시 실행 수 (기본값: 4)")
+    parser_bench.add_argument("--rps", type=float, help="목표 초당 요청 수 (지정 시 고정 간격으로 요청 시작)")
+    parser_bench.add_argument("--requests", "-n", type=int, help="총 요청 수, 1 이상 (기본값: 입력 줄 수, 입력은 순환 사용)")
+    parser_bench.add_argument("--user", "-u", default="bench-user", help="사용자 ID (기본값: bench-user)")
+    parser_bench.add_argument("--output", "-o", help="원시 샘플 저장 경로 (.csv 또는 .json)")
+
     args = parser.parse_args()
 
     if not args.command:
@@ -398,16 +832,24 @@ def main():
             asyncio.run(cmd_list(args))
         elif args.command == "export":
             asyncio.run(cmd_export(args))
+        elif args.command == "export-all":
+            asyncio.run(cmd_export_all(args))
         elif args.command == "import":
             asyncio.run(cmd_import(args))
         elif args.command == "update":
             asyncio.run(cmd_update(args))
+        elif args.command == "import-dir":
+            asyncio.run(cmd_import_dir(args))
+        elif args.command == "update-dir":
+            asyncio.run(cmd_update_dir(args))
         elif args.command == "publish":
             asyncio.run(cmd_publish(args))
         elif args.command == "validate":
             cmd_validate(args)
         elif args.command == "run":
             asyncio.run(cmd_run(args))
+        elif args.command == "bench":
+            asyncio.run(cmd_bench(args))
     except DifyClientError as e:
         print(f"API 오류: {e}", file=sys.stderr)
         sys.exit(1)
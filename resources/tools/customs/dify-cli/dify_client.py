@@ -1,11 +1,15 @@
 """Dify Console API 클라이언트"""
+import asyncio
 import base64
+import importlib.util
+import json
 import logging
-from typing import Any
+from typing import Any, AsyncIterator
 
 import httpx
 
 from config import DifyConfig
+from sse import SSEEvent, aiter_sse
 
 logger = logging.getLogger(__name__)
 
@@ -26,17 +30,44 @@ class DifyClient:
         self._authenticated = False
         self._csrf_token: str | None = None
         self._client: httpx.AsyncClient | None = None
+        # 동시 요청이 로그인을 중복 수행하지 않도록 직렬화
+        self._auth_lock = asyncio.Lock()
 
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None:
-            # cookies=True: httpx가 쿠키를 자동 관리 (쿠키 기반 인증)
-            self._client = httpx.AsyncClient(timeout=30.0, cookies=httpx.Cookies())
+            config = self.config
+            http2 = config.http2
+            if http2 and importlib.util.find_spec("h2") is None:
+                logger.warning("HTTP/2 사용 불가 (pip install httpx[http2] 필요) — HTTP/1.1로 연결")
+                http2 = False
+            # 모든 호출이 하나의 연결 풀을 공유 (keep-alive 연결 재사용으로 TCP/TLS 핸드셰이크 절감)
+            # cookies: httpx가 쿠키를 자동 관리 (쿠키 기반 인증)
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout(config.timeout),
+                limits=httpx.Limits(
+                    max_connections=config.max_connections,
+                    max_keepalive_connections=config.max_keepalive_connections,
+                    keepalive_expiry=config.keepalive_expiry,
+                ),
+                http2=http2,
+                cookies=httpx.Cookies(),
+            )
         return self._client
 
+    def _timeout(self, seconds: float) -> httpx.Timeout:
+        """작업별 타임아웃 (연결 타임아웃은 공통)"""
+        return httpx.Timeout(seconds, connect=self.config.connect_timeout)
+
     async def _ensure_authenticated(self):
         """인증 토큰 확보 (쿠키 기반 + CSRF 토큰)"""
         if self._authenticated:
             return
+        async with self._auth_lock:
+            if not self._authenticated:
+                await self._login()
+
+    async def _login(self):
+        """로그인 수행 (_auth_lock 보유 상태에서 호출)"""
         if self.config.use_admin_key:
             self._authenticated = True
             return
@@ -76,12 +107,16 @@ class DifyClient:
         await self._ensure_authenticated()
         client = await self._get_client()
         url = f"{self.config.console_api_url}{path}"
+        sent_csrf = self._csrf_token
         resp = await client.request(method, url, headers=self._headers(), **kwargs)
         if resp.status_code == 401:
-            # Token expired, retry login
-            self._authenticated = False
-            self._csrf_token = None
-            await self._ensure_authenticated()
+            # Token expired, retry login (동시 요청 중 하나만 재로그인)
+            async with self._auth_lock:
+                if self._authenticated and self._csrf_token == sent_csrf:
+                    self._authenticated = False
+                    self._csrf_token = None
+                if not self._authenticated:
+                    await self._login()
             resp = await client.request(method, url, headers=self._headers(), **kwargs)
         if resp.status_code >= 400:
             raise DifyClientError(resp.status_code, resp.text)
@@ -93,6 +128,18 @@ class DifyClient:
         """앱 목록 조회"""
         return await self._request("GET", "/apps", params={"mode": mode, "page": page, "limit": limit})
 
+    async def iter_apps(self, mode: str = "all", limit: int = 100) -> AsyncIterator[dict]:
+        """앱 목록 전체 페이지 순회 (has_more가 false가 될 때까지)"""
+        page = 1
+        while True:
+            result = await self.list_apps(mode=mode, page=page, limit=limit)
+            apps = result.get("data", [])
+            for app in apps:
+                yield app
+            if not apps or not result.get("has_more"):
+                return
+            page += 1
+
     async def get_app(self, app_id: str) -> dict:
         """앱 상세 조회"""
         return await self._request("GET", f"/apps/{app_id}")
@@ -101,7 +148,11 @@ class DifyClient:
 
     async def export_dsl(self, app_id: str, include_secret: bool = False) -> str:
         """DSL 내보내기 (YAML 문자열 반환)"""
-        result = await self._request("GET", f"/apps/{app_id}/export", params={"include_secret": str(include_secret).lower()})
+        result = await self._request(
+            "GET", f"/apps/{app_id}/export",
+            params={"include_secret": str(include_secret).lower()},
+            timeout=self._timeout(self.config.export_timeout),
+        )
         return result.get("data", "")
 
     async def import_dsl(self, yaml_content: str, name: str | None = None, description: str | None = None, app_id: str | None = None) -> dict:
@@ -116,11 +167,14 @@ class DifyClient:
             body["description"] = description
         if app_id:
             body["app_id"] = app_id
-        return await self._request("POST", "/apps/imports", json=body)
+        return await self._request("POST", "/apps/imports", json=body, timeout=self._timeout(self.config.import_timeout))
 
     async def confirm_import(self, import_id: str) -> dict:
         """대기 중인 가져오기 확인"""
-        return await self._request("POST", f"/apps/imports/{import_id}/confirm")
+        return await self._request(
+            "POST", f"/apps/imports/{import_id}/confirm",
+            timeout=self._timeout(self.config.import_timeout),
+        )
 
     # ========== Workflow ==========
 
@@ -154,6 +208,61 @@ class DifyClient:
         """워크플로우 버전 목록"""
         return await self._request("GET", f"/apps/{app_id}/workflows", params={"page": page, "limit": limit})
 
+    # ========== Service API (Workflow Run) ==========
+
+    def _service_request(self, inputs: dict, response_mode: str, user: str, api_key: str | None) -> dict[str, Any]:
+        """Service API 워크플로우 실행 요청 인자 (App API Key 인증)"""
+        return {
+            "url": f"{self.config.service_api_url}/workflows/run",
+            "headers": {
+                "Authorization": f"Bearer {api_key or self.config.app_api_key}",
+                "Content-Type": "application/json",
+            },
+            "json": {"inputs": inputs, "response_mode": response_mode, "user": user},
+            "timeout": self._timeout(self.config.run_timeout),
+        }
+
+    async def run_workflow(self, inputs: dict, user: str = "cli-user", api_key: str | None = None) -> dict:
+        """워크플로우 실행 (blocking 모드)"""
+        client = await self._get_client()
+        resp = await client.post(**self._service_request(inputs, "blocking", user, api_key))
+        if resp.status_code >= 400:
+            raise DifyClientError(resp.status_code, resp.text)
+        return resp.json()
+
+    async def stream_events(
+        self, inputs: dict, user: str = "cli-user", api_key: str | None = None,
+    ) -> AsyncIterator[SSEEvent]:
+        """워크플로우 실행 (streaming 모드) — 원시 SSE 이벤트 순차 반환
+
+        POST /workflows/run 스트림은 이어받기를 지원하지 않으므로 (다시 호출하면 새 실행이 시작됨)
+        끊긴 스트림은 재연결하지 않음.
+        """
+        client = await self._get_client()
+        request = self._service_request(inputs, "streaming", user, api_key)
+        async with client.stream("POST", **request) as resp:
+            if resp.status_code >= 400:
+                error_body = await resp.aread()
+                raise DifyClientError(resp.status_code, error_body.decode("utf-8", errors="replace"))
+            async for event in aiter_sse(resp.aiter_lines()):
+                yield event
+
+    async def stream_workflow(
+        self, inputs: dict, user: str = "cli-user", api_key: str | None = None,
+    ) -> AsyncIterator[dict]:
+        """워크플로우 실행 (streaming 모드) — Dify 이벤트(JSON)를 dict로 순차 반환
+
+        JSON 파싱에 실패한 이벤트는 경고 로그만 남기고 건너뜀.
+        """
+        async for event in self.stream_events(inputs, user=user, api_key=api_key):
+            try:
+                payload = event.json()
+            except json.JSONDecodeError:
+                logger.warning("SSE 이벤트 JSON 파싱 실패 (event=%s, id=%s): %.200s", event.event, event.id, event.data)
+                continue
+            if isinstance(payload, dict):
+                yield payload
+
     async def close(self):
         """HTTP 클라이언트 종료"""
         if self._client:
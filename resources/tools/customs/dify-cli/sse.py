@@ -0,0 +1,148 @@
+"""Server-Sent Events 스트림 디코더
+
+WHATWG HTML 표준의 SSE 해석 규칙을 따르는 증분 디코더.
+- event / data / id / retry 필드, 주석(':' 시작) 처리
+- 여러 줄 data 필드는 '\\n'으로 결합
+- 마지막으로 받은 id(last_event_id)와 retry 값 보관
+- Dify 워크플로우 이벤트(JSON 본문의 "event" 필드) 기준 핸들러 디스패치
+"""
+import inspect
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class SSEEvent:
+    """디코딩된 SSE 이벤트"""
+    event: str
+    data: str
+    id: str
+    retry: int | None = None
+
+    def json(self) -> Any:
+        """data를 JSON으로 파싱"""
+        return json.loads(self.data)
+
+
+class SSEDecoder:
+    """줄/청크 단위로 입력받아 완성된 SSEEvent를 반환하는 증분 디코더"""
+
+    __slots__ = ("_event_type", "_data", "_pending", "_last_cr", "last_event_id", "retry")
+
+    def __init__(self, last_event_id: str = ""):
+        self._event_type = ""
+        self._data: list[str] = []
+        self._pending = ""
+        self._last_cr = False
+        self.last_event_id = last_event_id
+        self.retry: int | None = None
+
+    def decode_line(self, line: str) -> SSEEvent | None:
+        """한 줄(줄바꿈 제외)을 처리. 빈 줄에서 이벤트가 완성되면 반환"""
+        if not line:
+            return self._dispatch()
+        if line[0] == ":":
+            return None  # 주석 (keep-alive 등)
+
+        field, _, value = line.partition(":")
+        if value[:1] == " ":
+            value = value[1:]
+
+        if field == "data":
+            self._data.append(value)
+        elif field == "event":
+            self._event_type = value
+        elif field == "id":
+            if "\0" not in value:
+                self.last_event_id = value
+        elif field == "retry":
+            if value.isascii() and value.isdigit():  # '²' 등 비ASCII 숫자는 int() 실패
+                self.retry = int(value)
+        return None
+
+    def feed(self, chunk: str) -> list[SSEEvent]:
+        """임의로 분할된 텍스트 청크를 처리 (\\r\\n, \\r, \\n 줄바꿈 모두 지원)"""
+        if self._last_cr and chunk[:1] == "\n":
+            chunk = chunk[1:]  # 이전 청크 끝의 \r 과 짝을 이루는 \n
+        self._last_cr = chunk[-1:] == "\r"
+
+        buffer = self._pending + chunk
+        lines = buffer.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        self._pending = lines.pop()
+
+        events = []
+        for line in lines:
+            event = self.decode_line(line)
+            if event is not None:
+                events.append(event)
+        return events
+
+    def _dispatch(self) -> SSEEvent | None:
+        """버퍼를 이벤트로 확정하고 초기화 (data가 없으면 이벤트 없음)"""
+        if not self._data:
+            self._event_type = ""
+            return None
+        event = SSEEvent(
+            event=self._event_type or "message",
+            data="\n".join(self._data),
+            id=self.last_event_id,
+            retry=self.retry,
+        )
+        self._event_type = ""
+        self._data = []
+        return event
+
+
+async def aiter_sse(lines: AsyncIterator[str], decoder: SSEDecoder | None = None) -> AsyncIterator[SSEEvent]:
+    """줄 단위 비동기 이터레이터(httpx Response.aiter_lines 등)를 SSEEvent 스트림으로 변환
+
+    스트림 종료 시 빈 줄로 끝나지 않은 미완성 이벤트는 표준에 따라 버림.
+    """
+    decoder = decoder or SSEDecoder()
+    async for line in lines:
+        event = decoder.decode_line(line)
+        if event is not None:
+            yield event
+
+
+Handler = Callable[[dict], Awaitable[None] | None]
+
+
+class EventDispatcher:
+    """Dify 워크플로우 이벤트 타입별 핸들러 디스패처
+
+    사용 예:
+        dispatcher = EventDispatcher()
+
+        @dispatcher.on("text_chunk")
+        def on_text(event):
+            print(event["data"]["text"], end="")
+
+        await dispatcher.consume(client.stream_workflow(inputs))
+    """
+
+    def __init__(self):
+        self._handlers: dict[str, list[Handler]] = {}
+
+    def on(self, event_type: str, handler: Handler | None = None):
+        """핸들러 등록 ('*'는 모든 이벤트). 데코레이터로도 사용 가능"""
+        def register(func: Handler) -> Handler:
+            self._handlers.setdefault(event_type, []).append(func)
+            return func
+        return register(handler) if handler is not None else register
+
+    async def dispatch(self, event: dict):
+        """이벤트 하나를 해당 타입 핸들러와 '*' 핸들러에 전달"""
+        for handler in (*self._handlers.get(event.get("event", ""), ()), *self._handlers.get("*", ())):
+            result = handler(event)
+            if inspect.isawaitable(result):
+                await result
+
+    async def consume(self, events: AsyncIterator[dict]):
+        """이벤트 스트림을 끝까지 소비하며 디스패치"""
+        async for event in events:
+            await self.dispatch(event)
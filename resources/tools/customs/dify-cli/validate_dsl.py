@@ -8,20 +8,30 @@ Dify 소스 코드의 검증 로직을 기반으로 구현.
 Usage:
     python validate_dsl.py <yaml_file>
     python validate_dsl.py smart-inquiry-routing.yml
+    python validate_dsl.py <file|dir|glob> ... [--jobs N] [--format text|json|junit|sarif] [-o FILE]
 """
 
+import argparse
+import glob
+import hashlib
+import os
 import sys
 import io
 import json
 import re
+import time
 
 # Windows 콘솔 UTF-8 출력 설정
 if sys.platform == "win32" and not isinstance(sys.stdout, io.TextIOWrapper):
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Any
+from xml.etree import ElementTree as ET
 
 try:
     import yaml
@@ -43,18 +53,21 @@ class ValidationIssue:
     message: str
     path: str = ""
     suggestion: str = ""
+    line: int | None = None  # YAML 소스 줄 번호 (with_marks 검증 시)
 
 
 @dataclass
 class ValidationResult:
     issues: list[ValidationIssue] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)  # 검증 단계별 소요 시간 (ms)
 
     def add(self, severity: Severity, category: str, message: str,
-            path: str = "", suggestion: str = ""):
-        self.issues.append(ValidationIssue(severity, category, message, path, suggestion))
+            path: str = "", suggestion: str = "", line: int | None = None):
+        self.issues.append(ValidationIssue(severity, category, message, path, suggestion, line))
 
-    def error(self, category: str, message: str, path: str = "", suggestion: str = ""):
-        self.add(Severity.ERROR, category, message, path, suggestion)
+    def error(self, category: str, message: str, path: str = "", suggestion: str = "",
+              line: int | None = None):
+        self.add(Severity.ERROR, category, message, path, suggestion, line)
 
     def warning(self, category: str, message: str, path: str = "", suggestion: str = ""):
         self.add(Severity.WARNING, category, message, path, suggestion)
@@ -74,13 +87,28 @@ class ValidationResult:
     def is_valid(self) -> bool:
         return self.error_count == 0
 
+    @contextmanager
+    def timed(self, stage: str):
+        """검증 단계 소요 시간 측정"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.timings[stage] = self.timings.get(stage, 0.0) + elapsed
+
 
 # ── 상수 정의 ──────────────────────────────────────────────────────
 
 CURRENT_DSL_VERSION = "0.5.0"
 DSL_MAX_SIZE_BYTES = 10 * 1024 * 1024  # 10MB
+READ_CHUNK_BYTES = 1024 * 1024          # 크기 제한 검사하며 읽는 단위
 MAX_VARIABLE_SIZE_BYTES = 200 * 1024   # 200KB
 
+# libyaml(C) 로더 우선, 없으면 순수 Python 로더
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+YAML_LOADER_NAME = "CSafeLoader (libyaml)" if YAML_LOADER is not yaml.SafeLoader else "SafeLoader (pure Python)"
+
 VALID_APP_MODES = {
     "completion", "chat", "advanced-chat", "agent-chat",
     "workflow", "channel", "rag-pipeline",
@@ -100,6 +128,12 @@ VALID_NODE_TYPES = {
 
 TRIGGER_NODE_TYPES = {"trigger-webhook", "trigger-schedule", "trigger-plugin"}
 
+ENTRY_NODE_TYPES = {"start", "datasource"} | TRIGGER_NODE_TYPES
+TERMINAL_NODE_TYPES = {"end", "answer"}
+CONTAINER_START_NODE_TYPES = {"iteration-start", "loop-start"}
+LLM_NODE_TYPES = {"llm", "agent", "question-classifier", "parameter-extractor"}  # 모델 호출 노드
+CRITICAL_PATH_PREVIEW = 8  # 최장 경로 메시지에 표시할 최대 노드 수
+
 VALID_LLM_MODES = {"chat", "completion"}
 
 VALID_CODE_LANGUAGES = {"python3", "javascript"}
@@ -565,6 +599,167 @@ def _validate_edge(edge: dict, index: int, node_ids: set, result: ValidationResu
                            path=f"{path}.sourceHandle")
 
 
+def validate_graph_flow(workflow: dict, result: ValidationResult):
+    """그래프 흐름 분석: 도달 불가 노드, 종료 경로 없는 노드, 순환, 최장 실행 경로
+
+    인접 리스트를 한 번만 구성하고 BFS/DFS 각 1회로 처리하므로 O(V+E).
+    loop/iteration 내부 노드(parentId)는 컨테이너를 거쳐 도달하는 것으로 보며,
+    내부 엣지는 순환·종료 경로·최장 경로 분석에서 제외.
+    """
+    graph = workflow.get("graph")
+    if not isinstance(graph, dict):
+        return
+    nodes = graph.get("nodes", [])
+    edges = graph.get("edges", [])
+    if not isinstance(nodes, list) or not isinstance(edges, list) or not nodes:
+        return
+
+    # 노드 정보 (중복/누락 id는 validate_graph에서 이미 오류 처리)
+    index: dict[str, int] = {}
+    types: dict[str, str] = {}
+    parents: dict[str, str] = {}
+    for i, node in enumerate(nodes):
+        if not isinstance(node, dict):
+            continue
+        node_id = node.get("id")
+        if not node_id or not isinstance(node_id, str) or node_id in index:
+            continue
+        data = node.get("data")
+        data = data if isinstance(data, dict) else {}
+        index[node_id] = i
+        types[node_id] = data.get("type", "")
+        parent = node.get("parentId") or data.get("iteration_id") or data.get("loop_id")
+        if parent:
+            parents[node_id] = parent
+
+    # 인접 리스트: flow = 최상위 노드 간 엣지, reach = 도달성 계산용 (컨테이너 → 내부 시작 노드 포함)
+    flow_succ: dict[str, list[str]] = {node_id: [] for node_id in index}
+    flow_pred: dict[str, list[str]] = {node_id: [] for node_id in index}
+    reach_succ: dict[str, list[str]] = {node_id: [] for node_id in index}
+    for edge in edges:
+        if not isinstance(edge, dict):
+            continue
+        source, target = edge.get("source"), edge.get("target")
+        if source not in index or target not in index:
+            continue
+        reach_succ[source].append(target)
+        if source not in parents and target not in parents:
+            flow_succ[source].append(target)
+            flow_pred[target].append(source)
+
+    children: dict[str, list[str]] = {}
+    for node_id, parent in parents.items():
+        if parent in index:
+            children.setdefault(parent, []).append(node_id)
+    for container, inner in children.items():
+        data = nodes[index[container]].get("data")
+        start_id = data.get("start_node_id") if isinstance(data, dict) else None
+        if start_id in index:
+            entry = [start_id]
+        else:
+            entry = [c for c in inner if types[c] in CONTAINER_START_NODE_TYPES] or inner
+        reach_succ[container].extend(entry)
+
+    def label(node_id: str) -> str:
+        data = nodes[index[node_id]].get("data")
+        title = data.get("title") if isinstance(data, dict) else None
+        return f"'{title}' ({node_id})" if title else f"'{node_id}'"
+
+    def node_path(node_id: str) -> str:
+        return f"workflow.graph.nodes[{index[node_id]}]"
+
+    # 1) 도달성: 진입 노드에서 순방향 BFS
+    roots = [node_id for node_id in index if types[node_id] in ENTRY_NODE_TYPES]
+    reachable = set(roots)
+    if roots:
+        queue = deque(roots)
+        while queue:
+            for nxt in reach_succ[queue.popleft()]:
+                if nxt not in reachable:
+                    reachable.add(nxt)
+                    queue.append(nxt)
+        for node_id in index:
+            if node_id not in reachable:
+                result.warning("FLOW", f"노드 {label(node_id)}에 도달할 수 없음 — 진입 노드와 연결되지 않음",
+                               path=node_path(node_id),
+                               suggestion="엣지를 연결하거나 사용하지 않는 노드 삭제")
+
+    # 2) 종료 경로: END/Answer 노드에서 역방향 BFS (최상위 노드만 대상)
+    terminals = [node_id for node_id in index if types[node_id] in TERMINAL_NODE_TYPES and node_id not in parents]
+    if terminals:
+        finishing = set(terminals)
+        queue = deque(terminals)
+        while queue:
+            for prev in flow_pred[queue.popleft()]:
+                if prev not in finishing:
+                    finishing.add(prev)
+                    queue.append(prev)
+        for node_id in index:
+            if node_id in parents or node_id in finishing or (roots and node_id not in reachable):
+                continue
+            result.warning("FLOW", f"노드 {label(node_id)}에서 END/Answer 노드로 가는 경로가 없음 "
+                                   "— 실행 결과가 출력에 반영되지 않음 (불필요한 토큰 소모)",
+                           path=node_path(node_id),
+                           suggestion="후속 노드를 END/Answer까지 연결하거나 분기 삭제")
+
+    # 3) 순환 검출 + 위상 정렬: 반복 DFS (최상위 노드만, 역방향 엣지 = 순환)
+    WHITE, GRAY, BLACK = 0, 1, 2
+    color = dict.fromkeys(flow_succ, WHITE)
+    postorder: list[str] = []
+    back_edges: set[tuple[str, str]] = set()
+    for start in (*roots, *flow_succ):
+        if color[start] != WHITE or start in parents:
+            continue
+        color[start] = GRAY
+        trail = [start]
+        stack = [(start, iter(flow_succ[start]))]
+        while stack:
+            current, successors = stack[-1]
+            for nxt in successors:
+                if color[nxt] == WHITE:
+                    color[nxt] = GRAY
+                    trail.append(nxt)
+                    stack.append((nxt, iter(flow_succ[nxt])))
+                    break
+                if color[nxt] == GRAY:
+                    back_edges.add((current, nxt))
+                    cycle = trail[trail.index(nxt):] + [nxt]
+                    result.error("FLOW", "순환 경로 감지: " + " → ".join(label(c) for c in cycle),
+                                 path=node_path(nxt),
+                                 suggestion="반복 처리는 loop/iteration 노드 사용")
+            else:
+                color[current] = BLACK
+                postorder.append(current)
+                trail.pop()
+                stack.pop()
+
+    # 4) 최장 실행 경로: 위상 순서(역 후위 순서)로 DP, 순환 엣지는 무시
+    if not postorder:
+        return
+    length = dict.fromkeys(postorder, 1)
+    previous: dict[str, str] = {}
+    for node_id in reversed(postorder):
+        for nxt in flow_succ[node_id]:
+            if (node_id, nxt) not in back_edges and length[node_id] + 1 > length[nxt]:
+                length[nxt] = length[node_id] + 1
+                previous[nxt] = node_id
+    tail = max(postorder, key=length.__getitem__)
+    critical = [tail]
+    while critical[-1] in previous:
+        critical.append(previous[critical[-1]])
+    critical.reverse()
+
+    llm_calls = sum(1 for c in critical if types[c] in LLM_NODE_TYPES)
+    if len(critical) > CRITICAL_PATH_PREVIEW:
+        half = CRITICAL_PATH_PREVIEW // 2
+        shown = ([label(c) for c in critical[:half]] + [f"... ({len(critical) - CRITICAL_PATH_PREVIEW}개 생략)"]
+                 + [label(c) for c in critical[-half:]])
+    else:
+        shown = [label(c) for c in critical]
+    result.info("FLOW", f"최장 실행 경로: {len(critical)}단계 (LLM 호출 {llm_calls}회) — " + " → ".join(shown),
+                path="workflow.graph")
+
+
 def validate_variables(workflow: dict, var_type: str, result: ValidationResult):
     """환경변수/대화변수 검증"""
     variables = workflow.get(f"{var_type}_variables", [])
@@ -629,81 +824,192 @@ def validate_dependencies(data: dict, result: ValidationResult):
             result.warning("DEPS", f"알 수 없는 의존성 타입: '{dep_type}'", path=f"{path}.type")
 
 
-def validate_variable_references(workflow: dict, result: ValidationResult):
-    """변수 참조 일관성 검증"""
-    graph = workflow.get("graph", {})
-    nodes = graph.get("nodes", [])
-
-    node_ids = {n.get("id") for n in nodes if isinstance(n, dict) and n.get("id")}
+VAR_REF_PATTERN = re.compile(r'\{\{#([^.]+)\.')
+BUILTIN_REF_IDS = frozenset({"sys", "env"})  # 시스템 변수 / 환경변수
 
-    # 모든 노드의 텍스트 필드에서 변수 참조 {{#nodeId.var#}} 패턴 검색
-    pattern = re.compile(r'\{\{#([^.]+)\.')
-
-    for i, node in enumerate(nodes):
-        if not isinstance(node, dict):
-            continue
-        data = node.get("data", {})
-        _check_var_refs_in_dict(data, node_ids, pattern,
-                                f"workflow.graph.nodes[{i}]", result)
-
-
-def _check_var_refs_in_dict(obj: Any, node_ids: set, pattern: re.Pattern,
-                            path: str, result: ValidationResult):
-    """딕셔너리/리스트에서 재귀적으로 변수 참조 검증"""
-    if isinstance(obj, str):
-        for match in pattern.finditer(obj):
-            ref_node_id = match.group(1)
-            if ref_node_id not in node_ids and ref_node_id not in ("sys", "env"):
-                result.warning("VAR_REF",
-                               f"변수 참조 '{{{{#{ref_node_id}...#}}}}'의 노드가 존재하지 않음",
-                               path=path)
-    elif isinstance(obj, dict):
-        for key, value in obj.items():
-            _check_var_refs_in_dict(value, node_ids, pattern, f"{path}.{key}", result)
-    elif isinstance(obj, list):
-        for j, item in enumerate(obj):
-            _check_var_refs_in_dict(item, node_ids, pattern, f"{path}[{j}]", result)
 
+def validate_references(workflow: dict, result: ValidationResult):
+    """변수 참조 {{#nodeId.var#}} 일관성 + value_selector 참조를 한 번의 순회로 검증
 
-def validate_value_selectors(workflow: dict, result: ValidationResult):
-    """value_selector 참조 검증"""
+    노드 data 트리를 한 번만 순회하며, 경로 문자열은 이슈를 보고할 때만 생성.
+    """
     graph = workflow.get("graph", {})
     nodes = graph.get("nodes", [])
     node_ids = {n.get("id") for n in nodes if isinstance(n, dict) and n.get("id")}
-    node_ids.add("sys")  # 시스템 변수
-    node_ids.add("env")  # 환경변수
+    known_ids = node_ids | BUILTIN_REF_IDS
+
+    var_ref_hits: list[tuple[int, tuple, str]] = []   # (노드 인덱스, 경로 세그먼트, 참조 노드 id)
+    selector_hits: list[tuple[int, tuple, str]] = []
 
     for i, node in enumerate(nodes):
         if not isinstance(node, dict):
             continue
-        data = node.get("data", {})
-        _check_selectors_in_dict(data, node_ids,
-                                 f"workflow.graph.nodes[{i}].data", result)
+        _walk_references(node.get("data", {}), [], i, known_ids, var_ref_hits, selector_hits)
+
+    # 보고 순서: 변수 참조 → value_selector
+    for i, segments, ref_id in var_ref_hits:
+        result.warning("VAR_REF",
+                       f"변수 참조 '{{{{#{ref_id}...#}}}}'의 노드가 존재하지 않음",
+                       path=f"workflow.graph.nodes[{i}]{_join_segments(segments)}")
+    for i, segments, ref_id in selector_hits:
+        result.warning("SELECTOR",
+                       f"value_selector [{ref_id}, ...] 의 노드가 존재하지 않음",
+                       path=f"workflow.graph.nodes[{i}].data{_join_segments(segments)}.value_selector")
+
 
+def _walk_references(obj: Any, segments: list, index: int, known_ids: set,
+                     var_ref_hits: list, selector_hits: list):
+    """data 트리 재귀 순회. segments는 공유 스택(dict 키는 str, 리스트 인덱스는 int)
 
-def _check_selectors_in_dict(obj: Any, node_ids: set, path: str,
-                              result: ValidationResult):
-    """value_selector 필드의 노드 참조 검증"""
+    문자열 값은 재귀 호출 없이 부모에서 바로 검사 ('{{#'가 없으면 정규식 생략).
+    """
     if isinstance(obj, dict):
-        if "value_selector" in obj:
-            selector = obj["value_selector"]
-            if isinstance(selector, list) and len(selector) >= 1:
-                ref_id = selector[0]
-                if isinstance(ref_id, str) and ref_id not in node_ids:
-                    result.warning("SELECTOR",
-                                   f"value_selector [{ref_id}, ...] 의 노드가 존재하지 않음",
-                                   path=f"{path}.value_selector")
-        for key, value in obj.items():
-            _check_selectors_in_dict(value, node_ids, f"{path}.{key}", result)
+        selector = obj.get("value_selector")
+        if type(selector) is list and selector:
+            ref_id = selector[0]
+            if isinstance(ref_id, str) and ref_id not in known_ids:
+                selector_hits.append((index, tuple(segments), ref_id))
+        items = obj.items()
+        keyed = True
     elif isinstance(obj, list):
-        for j, item in enumerate(obj):
-            _check_selectors_in_dict(item, node_ids, f"{path}[{j}]", result)
+        items = enumerate(obj)
+        keyed = False
+    else:
+        return
+
+    for key, value in items:
+        if keyed and not isinstance(key, str):
+            key = str(key)  # YAML의 숫자/불리언 키는 '.1' 형태로 표기 (리스트 인덱스 '[1]'과 구분)
+        if isinstance(value, str):
+            if "{{#" in value:
+                for match in VAR_REF_PATTERN.finditer(value):
+                    ref_id = match.group(1)
+                    if ref_id not in known_ids:
+                        segments.append(key)
+                        var_ref_hits.append((index, tuple(segments), ref_id))
+                        segments.pop()
+        elif isinstance(value, (dict, list)):
+            segments.append(key)
+            _walk_references(value, segments, index, known_ids, var_ref_hits, selector_hits)
+            segments.pop()
+
+
+def _join_segments(segments: tuple) -> str:
+    """경로 세그먼트를 'a.b[0].c' 형식으로 결합"""
+    return "".join(f"[{seg}]" if isinstance(seg, int) else f".{seg}" for seg in segments)
+
+
+# ── 검증 결과 캐시 ──────────────────────────────────────────────────
+
+# 검증 규칙 버전: 이 파일의 내용 해시. 규칙이 바뀌면 기존 캐시 항목은 자동으로 무효화됨
+RULESET_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+
+DEFAULT_CACHE_DIR = Path(os.path.expanduser(
+    os.getenv("DIFY_VALIDATE_CACHE_DIR", "~/.cache/dify-dsl-validate")
+))
+DEFAULT_CACHE_MAX_BYTES = int(os.getenv("DIFY_VALIDATE_CACHE_MAX_MB", "64")) * 1024 * 1024
+
+
+class ValidationCache:
+    """파일 내용 해시 + 검증 규칙 버전을 키로 하는 디스크 검증 결과 캐시
+
+    항목 하나 = JSON 파일 하나. 조회 시 mtime을 갱신하고,
+    전체 크기가 max_bytes를 넘으면 mtime이 오래된 항목부터 삭제 (LRU).
+    쓰기는 임시 파일 + rename으로 원자적으로 수행하여 여러 프로세스가 공유 가능.
+    """
+
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._size: int | None = None  # 현재 캐시 크기 추정치 (첫 기록 시 계산)
+
+    def key(self, content: bytes, with_marks: bool = False) -> str:
+        digest = hashlib.sha256(f"{RULESET_VERSION}|{YAML_LOADER_NAME}|marks={with_marks}".encode())
+        digest.update(b"\0")
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> ValidationResult | None:
+        entry = self._entry_path(key)
+        try:
+            payload = json.loads(entry.read_text(encoding="utf-8"))
+            os.utime(entry)  # LRU: 최근 사용 시각 갱신
+        except (OSError, ValueError):
+            return None
+        if payload.get("ruleset") != RULESET_VERSION:
+            return None
+        issues = [
+            ValidationIssue(Severity(i["severity"]), i["category"], i["message"], i["path"], i["suggestion"],
+                            i.get("line"))
+            for i in payload["issues"]
+        ]
+        return ValidationResult(issues=issues)
+
+    def put(self, key: str, result: ValidationResult):
+        entry = self._entry_path(key)
+        payload = json.dumps({
+            "ruleset": RULESET_VERSION,
+            "issues": [
+                {"severity": i.severity.value, "category": i.category, "message": i.message,
+                 "path": i.path, "suggestion": i.suggestion, "line": i.line}
+                for i in result.issues
+            ],
+        }, ensure_ascii=False).encode("utf-8")
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            tmp = entry.with_name(f"{entry.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(payload)
+            os.replace(tmp, entry)
+        except OSError:
+            return  # 캐시 기록 실패는 검증 결과에 영향 없음
+        if self._size is None:
+            self._size = self._scan_size()
+        else:
+            self._size += len(payload)
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for entry in self.directory.glob("*/*.json"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self):
+        """오래 사용되지 않은 항목부터 삭제하여 max_bytes의 90% 이하로 축소"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, entry in entries:
+            if total <= target:
+                break
+            try:
+                entry.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._size = total
 
 
 # ── 메인 검증 오케스트레이터 ────────────────────────────────────────
 
-def validate_dsl(file_path: str) -> ValidationResult:
-    """DSL YAML 파일 전체 검증"""
+def validate_dsl(file_path: str, cache: "ValidationCache | None" = None,
+                 with_marks: bool = False) -> ValidationResult:
+    """DSL YAML 파일 전체 검증
+
+    cache 지정 시 내용이 같은 파일은 재검증 생략.
+    with_marks=True이면 파싱 중 노드 위치를 함께 수집하여 이슈에 YAML 줄 번호(line)를 채움.
+    """
     result = ValidationResult()
     path = Path(file_path)
 
@@ -719,57 +1025,251 @@ def validate_dsl(file_path: str) -> ValidationResult:
         return result
 
     result.info("FILE", f"파일 크기: {file_size:,} bytes")
+    result.info("FILE", f"YAML 로더: {YAML_LOADER_NAME}")
+
+    with result.timed("read"):
+        raw = _read_limited(path, DSL_MAX_SIZE_BYTES)
+    if raw is None:
+        # stat 이후 파일이 커진 경우 (읽는 도중 제한 초과 시 즉시 중단)
+        result.error("FILE", "파일 크기가 10MB 제한 초과 (읽는 중 감지)")
+        return result
+
+    cache_key = None
+    if cache is not None:
+        with result.timed("cache"):
+            cache_key = cache.key(raw, with_marks)
+            cached = cache.get(cache_key)
+        if cached is not None:
+            cached.timings = result.timings
+            return cached
+
+    _validate_content(raw, result, with_marks)
+
+    if cache is not None:
+        cache.put(cache_key, result)
+    return result
+
 
+def _read_limited(path: Path, limit: int) -> bytes | None:
+    """limit 바이트까지만 청크 단위로 읽음. 초과하면 None"""
+    chunks = []
+    total = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(READ_CHUNK_BYTES)
+            if not chunk:
+                return b"".join(chunks)
+            total += len(chunk)
+            if total > limit:
+                return None
+            chunks.append(chunk)
+
+
+def _load_yaml(text: str, with_marks: bool) -> tuple[Any, dict[str, int] | None]:
+    """YAML 파싱. with_marks이면 동일한 노드 트리에서 경로 → 줄 번호 맵도 생성 (재파싱 없음)"""
+    loader = YAML_LOADER(text)
+    try:
+        node = loader.get_single_node()
+        if node is None:
+            return None, {} if with_marks else None
+        marks = _collect_marks(node) if with_marks else None
+        return loader.construct_document(node), marks
+    finally:
+        loader.dispose()
+
+
+def _collect_marks(root: yaml.Node) -> dict[str, int]:
+    """노드 트리를 순회하여 이슈 경로 형식('a.b[0].c') → 1-based 줄 번호 맵 생성"""
+    marks: dict[str, int] = {}
+    stack: list[tuple[str, yaml.Node]] = [("", root)]
+    while stack:
+        path, node = stack.pop()
+        marks[path] = node.start_mark.line + 1
+        if isinstance(node, yaml.MappingNode):
+            for key_node, value_node in node.value:
+                key = key_node.value if isinstance(key_node, yaml.ScalarNode) else str(key_node.start_mark.line)
+                child = f"{path}.{key}" if path else key
+                marks.setdefault(child, key_node.start_mark.line + 1)
+                stack.append((child, value_node))
+        elif isinstance(node, yaml.SequenceNode):
+            for j, item in enumerate(node.value):
+                stack.append((f"{path}[{j}]", item))
+    return marks
+
+
+_PARENT_PATH = re.compile(r"(\.[^.\[]*|\[\d+\])$")
+
+
+def _annotate_lines(result: ValidationResult, marks: dict[str, int]):
+    """이슈 경로에 줄 번호 부여 (경로가 없으면 가장 가까운 상위 경로의 줄 번호)"""
+    for issue in result.issues:
+        if issue.line is not None or not issue.path:
+            continue
+        path = issue.path
+        while path and path not in marks:
+            parent = _PARENT_PATH.sub("", path)
+            if parent == path:
+                break
+            path = parent
+        issue.line = marks.get(path)
+
+
+def _validate_content(raw: bytes, result: ValidationResult, with_marks: bool = False):
+    """파일 내용 파싱 및 단계별 검증"""
     # YAML 파싱
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            raw_content = f.read()
-            data = yaml.safe_load(raw_content)
+        with result.timed("parse"):
+            data, marks = _load_yaml(raw.decode("utf-8"), with_marks)
+    except UnicodeDecodeError as e:
+        result.error("FILE", f"UTF-8 디코딩 실패: {e}")
+        return
     except yaml.YAMLError as e:
-        result.error("YAML", f"YAML 파싱 실패: {e}")
-        return result
+        problem_mark = getattr(e, "problem_mark", None)
+        result.error("YAML", f"YAML 파싱 실패: {e}",
+                     line=problem_mark.line + 1 if problem_mark is not None else None)
+        return
 
-    # 1. 기본 구조 검증
-    if not validate_yaml_structure(data, result):
-        return result
+    _run_checks(data, result)
+    if marks:
+        _annotate_lines(result, marks)
 
-    # 2. 버전 검증
-    validate_version(data, result)
 
-    # 3. kind 검증
-    validate_kind(data, result)
+def _run_checks(data: Any, result: ValidationResult):
+    """파싱된 DSL 데이터 단계별 검증"""
+    with result.timed("structure"):
+        # 1. 기본 구조 검증
+        if not validate_yaml_structure(data, result):
+            return
 
-    # 4. app 섹션 검증
-    app_data = validate_app_section(data, result)
-    if app_data is None:
-        return result
+        # 2. 버전 검증
+        validate_version(data, result)
+
+        # 3. kind 검증
+        validate_kind(data, result)
 
-    app_mode = app_data.get("mode", "")
+        # 4. app 섹션 검증
+        app_data = validate_app_section(data, result)
+        if app_data is None:
+            return
 
-    # 5. workflow 섹션 검증 (workflow/advanced-chat 모드)
-    workflow = validate_workflow_section(data, app_mode, result)
+        app_mode = app_data.get("mode", "")
+
+        # 5. workflow 섹션 검증 (workflow/advanced-chat 모드)
+        workflow = validate_workflow_section(data, app_mode, result)
 
     if workflow:
         # 6. 그래프 검증
-        validate_graph(workflow, result)
+        with result.timed("graph"):
+            validate_graph(workflow, result)
 
-        # 7. 변수 검증
-        validate_variables(workflow, "environment", result)
-        validate_variables(workflow, "conversation", result)
+        # 7. 그래프 흐름 분석 (도달성, 종료 경로, 순환, 최장 경로)
+        with result.timed("flow"):
+            validate_graph_flow(workflow, result)
 
-        # 8. 피처 검증
-        validate_features(workflow, app_mode, result)
+        # 8. 변수 검증
+        with result.timed("variables"):
+            validate_variables(workflow, "environment", result)
+            validate_variables(workflow, "conversation", result)
 
-        # 9. 변수 참조 일관성 검증
-        validate_variable_references(workflow, result)
+        # 9. 피처 검증
+        with result.timed("features"):
+            validate_features(workflow, app_mode, result)
 
-        # 10. value_selector 참조 검증
-        validate_value_selectors(workflow, result)
+        # 10. 변수 참조 일관성 + value_selector 참조 검증 (단일 순회)
+        with result.timed("references"):
+            validate_references(workflow, result)
 
     # 11. 의존성 검증
-    validate_dependencies(data, result)
+    with result.timed("dependencies"):
+        validate_dependencies(data, result)
 
-    return result
+
+# ── 일괄 검증 ────────────────────────────────────────────────────────
+
+DSL_SUFFIXES = (".yml", ".yaml")
+
+
+@dataclass
+class FileReport:
+    path: str
+    result: ValidationResult
+    elapsed_ms: float
+
+
+@dataclass
+class BatchReport:
+    files: list[FileReport]
+    elapsed_ms: float
+    jobs: int
+
+    @property
+    def failed(self) -> list[FileReport]:
+        return [f for f in self.files if not f.result.is_valid]
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.failed
+
+    def stage_timings(self) -> dict[str, float]:
+        """전체 파일의 단계별 소요 시간 합계 (ms)"""
+        totals: dict[str, float] = {}
+        for report in self.files:
+            for stage, ms in report.result.timings.items():
+                totals[stage] = totals.get(stage, 0.0) + ms
+        return totals
+
+
+def collect_dsl_files(patterns: list[str]) -> list[Path]:
+    """파일 경로 / 디렉토리(재귀) / glob 패턴을 DSL 파일 목록으로 확장 (입력 순서 유지, 중복 제거)"""
+    seen: set[Path] = set()
+    files: list[Path] = []
+
+    def add(candidate: Path):
+        key = candidate.resolve()
+        if key not in seen:
+            seen.add(key)
+            files.append(candidate)
+
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            for candidate in sorted(path.rglob("*")):
+                if candidate.is_file() and candidate.suffix.lower() in DSL_SUFFIXES:
+                    add(candidate)
+        elif glob.has_magic(pattern):
+            for match in sorted(glob.glob(pattern, recursive=True)):
+                candidate = Path(match)
+                if candidate.is_file():
+                    add(candidate)
+        else:
+            add(path)  # 존재하지 않으면 validate_dsl이 FILE 오류로 보고
+    return files
+
+
+def _validate_file_timed(file_path: str, cache: ValidationCache | None = None,
+                         with_marks: bool = False) -> FileReport:
+    """프로세스 풀 작업 단위: 파일 1개 검증 + 소요 시간"""
+    start = time.perf_counter()
+    result = validate_dsl(file_path, cache=cache, with_marks=with_marks)
+    return FileReport(file_path, result, (time.perf_counter() - start) * 1000)
+
+
+def validate_many(paths: list[Path], jobs: int | None = None,
+                  cache: ValidationCache | None = None, with_marks: bool = False) -> BatchReport:
+    """여러 DSL 파일을 CPU 코어에 분산하여 검증 (결과는 입력 순서 유지)"""
+    jobs = jobs or os.cpu_count() or 1
+    start = time.perf_counter()
+    file_paths = [str(p) for p in paths]
+    if jobs == 1 or len(file_paths) < 2:
+        reports = [_validate_file_timed(p, cache, with_marks) for p in file_paths]
+    else:
+        jobs = min(jobs, len(file_paths))
+        chunksize = max(1, len(file_paths) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            n = len(file_paths)
+            reports = list(pool.map(_validate_file_timed, file_paths, [cache] * n, [with_marks] * n,
+                                    chunksize=chunksize))
+    return BatchReport(reports, (time.perf_counter() - start) * 1000, jobs)
 
 
 # ── 출력 포맷팅 ──────────────────────────────────────────────────────
@@ -798,7 +1298,8 @@ def print_result(result: ValidationResult, file_path: str):
 
         for issue in issues:
             path_str = f" @ {issue.path}" if issue.path else ""
-            print(f"  {icon} [{issue.category}]{path_str}")
+            line_str = f" (L{issue.line})" if issue.line else ""
+            print(f"  {icon} [{issue.category}]{path_str}{line_str}")
             print(f"      {issue.message}")
             if issue.suggestion:
                 print(f"      -> {issue.suggestion}")
@@ -819,18 +1320,196 @@ def print_result(result: ValidationResult, file_path: str):
         print(f"\n  오류 {result.error_count}건 해결 필요. Import 실패 가능성 높음.")
 
 
+def _issue_dict(issue: ValidationIssue) -> dict:
+    return {
+        "severity": issue.severity.value,
+        "category": issue.category,
+        "message": issue.message,
+        "path": issue.path,
+        "suggestion": issue.suggestion,
+        "line": issue.line,
+    }
+
+
+def _at(path: str, line: int | None = None) -> str:
+    return (f" @ {path}" if path else "") + (f" (L{line})" if line else "")
+
+
+def _round_timings(timings: dict[str, float]) -> dict[str, float]:
+    return {stage: round(ms, 3) for stage, ms in timings.items()}
+
+
+def format_json(report: BatchReport) -> str:
+    """일괄 검증 결과 JSON"""
+    return json.dumps({
+        "summary": {
+            "files": len(report.files),
+            "passed": len(report.files) - len(report.failed),
+            "failed": len(report.failed),
+            "errors": sum(f.result.error_count for f in report.files),
+            "warnings": sum(f.result.warning_count for f in report.files),
+            "jobs": report.jobs,
+            "elapsed_ms": round(report.elapsed_ms, 3),
+            "stage_timings_ms": _round_timings(report.stage_timings()),
+        },
+        "files": [
+            {
+                "path": f.path,
+                "valid": f.result.is_valid,
+                "elapsed_ms": round(f.elapsed_ms, 3),
+                "timings_ms": _round_timings(f.result.timings),
+                "issues": [_issue_dict(i) for i in f.result.issues],
+            }
+            for f in report.files
+        ],
+    }, ensure_ascii=False, indent=2)
+
+
+def format_junit(report: BatchReport) -> str:
+    """일괄 검증 결과 JUnit XML (파일 1개 = testcase 1개)"""
+    suite = ET.Element("testsuite", {
+        "name": "dify-dsl-validate",
+        "tests": str(len(report.files)),
+        "failures": str(len(report.failed)),
+        "errors": "0",
+        "time": f"{report.elapsed_ms / 1000:.3f}",
+    })
+    for f in report.files:
+        case = ET.SubElement(suite, "testcase", {
+            "classname": "dify-dsl",
+            "name": f.path,
+            "time": f"{f.elapsed_ms / 1000:.3f}",
+        })
+        errors = [i for i in f.result.issues if i.severity == Severity.ERROR]
+        if errors:
+            failure = ET.SubElement(case, "failure", {
+                "message": f"오류 {len(errors)}건",
+                "type": "ValidationError",
+            })
+            failure.text = "\n".join(
+                f"[{i.category}]{_at(i.path, i.line)} {i.message}" + (f" -> {i.suggestion}" if i.suggestion else "")
+                for i in errors
+            )
+        others = [i for i in f.result.issues if i.severity != Severity.ERROR]
+        if others:
+            out = ET.SubElement(case, "system-out")
+            out.text = "\n".join(f"{i.severity.value} [{i.category}]{_at(i.path, i.line)} {i.message}" for i in others)
+    suites = ET.Element("testsuites")
+    suites.append(suite)
+    return ET.tostring(suites, encoding="unicode", xml_declaration=True)
+
+
+_SARIF_LEVELS = {Severity.ERROR: "error", Severity.WARNING: "warning", Severity.INFO: "note"}
+
+
+def format_sarif(report: BatchReport) -> str:
+    """일괄 검증 결과 SARIF 2.1.0 (카테고리 = ruleId)"""
+    results = []
+    rule_ids: set[str] = set()
+    for f in report.files:
+        uri = Path(f.path).as_posix()
+        for issue in f.result.issues:
+            rule_ids.add(issue.category)
+            text = issue.message + (f" (제안: {issue.suggestion})" if issue.suggestion else "")
+            location: dict[str, Any] = {"physicalLocation": {"artifactLocation": {"uri": uri}}}
+            if issue.line:
+                location["physicalLocation"]["region"] = {"startLine": issue.line}
+            if issue.path:
+                location["logicalLocations"] = [{"fullyQualifiedName": issue.path}]
+            results.append({
+                "ruleId": issue.category,
+                "level": _SARIF_LEVELS[issue.severity],
+                "message": {"text": text},
+                "locations": [location],
+            })
+    return json.dumps({
+        "version": "2.1.0",
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "runs": [{
+            "tool": {"driver": {
+                "name": "dify-dsl-validator",
+                "informationUri": "https://github.com/unicorn-plugins/dmap",
+                "rules": [{"id": rule_id} for rule_id in sorted(rule_ids)],
+            }},
+            "results": results,
+        }],
+    }, ensure_ascii=False, indent=2)
+
+
+def print_batch_summary(report: BatchReport):
+    """일괄 검증 결과 요약 출력 (파일별 한 줄 + 단계별 소요 시간)"""
+    print("=" * 70)
+    print(f"  Dify DSL Validator — {len(report.files)}개 파일 (프로세스 {report.jobs}개)")
+    print("=" * 70)
+    for f in report.files:
+        status = "PASS" if f.result.is_valid else "FAIL"
+        print(f"  [{status}] {f.path}  (오류 {f.result.error_count}, 경고 {f.result.warning_count}, "
+              f"{f.elapsed_ms:.1f}ms)")
+        for issue in f.result.issues:
+            if issue.severity == Severity.ERROR:
+                print(f"      [X] [{issue.category}]{_at(issue.path, issue.line)} {issue.message}")
+    print()
+    print("  단계별 소요 시간 (전체 합계):")
+    for stage, ms in report.stage_timings().items():
+        print(f"    {stage:<14} {ms:10.1f}ms")
+    print("=" * 70)
+    print(f"  결과: {'PASS' if report.is_valid else 'FAIL'}  |  "
+          f"통과: {len(report.files) - len(report.failed)}  |  실패: {len(report.failed)}  |  "
+          f"소요: {report.elapsed_ms / 1000:.2f}초")
+    print("=" * 70)
+
+
+REPORT_FORMATTERS = {
+    "json": format_json,
+    "junit": format_junit,
+    "sarif": format_sarif,
+}
+
+
+def write_report(report: BatchReport, fmt: str, output: str | None):
+    """보고서 출력 (text는 콘솔 요약, 그 외는 파일 또는 stdout)"""
+    if fmt == "text":
+        if len(report.files) == 1:
+            print_result(report.files[0].result, report.files[0].path)
+        else:
+            print_batch_summary(report)
+        return
+    content = REPORT_FORMATTERS[fmt](report)
+    if output:
+        Path(output).write_text(content, encoding="utf-8")
+        print(f"보고서 저장: {output} ({len(report.files)}개 파일, 실패 {len(report.failed)}개)")
+    else:
+        print(content)
+
+
 # ── 엔트리포인트 ─────────────────────────────────────────────────────
 
 def main():
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(description="Dify DSL YAML 사전 검증 도구")
+    parser.add_argument("paths", nargs="*", help="DSL 파일, 디렉토리(재귀) 또는 glob 패턴")
+    parser.add_argument("--jobs", "-j", type=int, default=None, help="검증 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument("--format", "-f", default="text", choices=["text", *REPORT_FORMATTERS],
+                        help="보고서 형식 (기본값: text)")
+    parser.add_argument("--output", "-o", help="보고서 저장 경로 (기본값: stdout)")
+    parser.add_argument("--no-cache", action="store_true", help="검증 결과 캐시 사용 안 함")
+    parser.add_argument("--marks", action="store_true", help="이슈에 YAML 소스 줄 번호 표시")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR), help=f"캐시 디렉토리 (기본값: {DEFAULT_CACHE_DIR})")
+    args = parser.parse_args()
+
+    if not args.paths:
         print("Usage: python validate_dsl.py <yaml_file>")
         print("Example: python validate_dsl.py smart-inquiry-routing.yml")
         sys.exit(1)
 
-    file_path = sys.argv[1]
-    result = validate_dsl(file_path)
-    print_result(result, file_path)
-    sys.exit(0 if result.is_valid else 1)
+    files = collect_dsl_files(args.paths)
+    if not files:
+        print(f"DSL 파일을 찾을 수 없음: {' '.join(args.paths)}")
+        sys.exit(1)
+
+    cache = None if args.no_cache else ValidationCache(Path(args.cache_dir))
+    report = validate_many(files, jobs=args.jobs, cache=cache, with_marks=args.marks)
+    write_report(report, args.format, args.output)
+    sys.exit(0 if report.is_valid else 1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""convert-to-markdown _resize_image 마이크로 벤치마크
+
+합성 슬라이드 스크린샷(텍스트 줄 + 도형 + 사진 영역)을 여러 해상도로 만들어
+예산 기반 _resize_image와 기존 방식(품질 15씩 낮추고 해상도 절반 반복)을 비교.
+인코딩 횟수, 소요 시간, 결과 크기/해상도를 출력.
+
+Usage:
+    python bench_resize_image.py [--max-bytes 3500000 2000000] [--repeat 3]
+"""
+import argparse
+import importlib.util
+import io
+import random
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+_spec = importlib.util.spec_from_file_location(
+    "convert_to_markdown", Path(__file__).parent / "convert-to-markdown.py"
+)
+c2m = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(c2m)
+
+
+# ── 기존 방식 (비교 기준) ───────────────────────────────────────────
+
+def legacy_resize(image_bytes: bytes, max_bytes: int = 3_500_000) -> tuple[bytes, str]:
+    img = Image.open(io.BytesIO(image_bytes))
+    quality = 85
+    while True:
+        buf = io.BytesIO()
+        if img.mode in ("RGBA", "P"):
+            img = img.convert("RGB")
+        img.save(buf, format="JPEG", quality=quality)
+        if buf.tell() <= max_bytes or quality <= 20:
+            return buf.getvalue(), "image/jpeg"
+        quality -= 15
+        if quality <= 20:
+            w, h = img.size
+            img = img.resize((w // 2, h // 2), Image.LANCZOS)
+            quality = 70
+
+
+# ── 합성 스크린샷 ───────────────────────────────────────────────────
+
+def make_screenshot(width: int, height: int, fmt: str, seed: int = 0) -> bytes:
+    """텍스트 줄, 도형, 노이즈가 섞인 사진 영역을 가진 슬라이드 캡처 이미지"""
+    rng = random.Random(seed)
+    img = Image.new("RGB", (width, height), (250, 250, 252))
+    draw = ImageDraw.Draw(img)
+    line_h = max(12, height // 40)
+    for y in range(line_h * 3, height // 2, line_h * 2):
+        x = width // 20
+        while x < width // 2:
+            w = rng.randint(line_h, line_h * 5)
+            draw.rectangle([x, y, x + w, y + line_h], fill=(30, 30, 30))
+            x += w + line_h // 2
+    for _ in range(30):
+        x, y = rng.randint(0, width), rng.randint(height // 2, height)
+        draw.ellipse([x, y, x + width // 10, y + height // 10],
+                     fill=tuple(rng.randint(0, 255) for _ in range(3)))
+    photo = Image.effect_noise((width // 2, height // 2), 80).convert("RGB")
+    img.paste(photo, (width // 2, height // 8))
+    buf = io.BytesIO()
+    img.save(buf, format=fmt, **({"quality": 95} if fmt == "JPEG" else {}))
+    return buf.getvalue()
+
+
+def _measure(func, image_bytes: bytes, max_bytes: int, repeat: int) -> tuple[float, int, bytes]:
+    """(최소 소요 시간 ms, 인코딩 횟수, 결과) 반환"""
+    encodes = 0
+    original_save = Image.Image.save
+
+    def counting_save(self, fp, format=None, **params):
+        nonlocal encodes
+        encodes += 1
+        return original_save(self, fp, format, **params)
+
+    best = float("inf")
+    data = b""
+    Image.Image.save = counting_save
+    try:
+        for _ in range(repeat):
+            encodes = 0
+            start = time.perf_counter()
+            data, _ = func(image_bytes, max_bytes=max_bytes)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        Image.Image.save = original_save
+    return best * 1000, encodes, data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="_resize_image 벤치마크")
+    parser.add_argument("--max-bytes", type=int, nargs="+", default=[3_500_000, 2_000_000, 500_000],
+                        help="목표 크기 (기본값: 3500000 2000000 500000)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 횟수, 최솟값 사용 (기본값: 3)")
+    args = parser.parse_args()
+
+    cases = [(1920, 1080, "PNG"), (2560, 1440, "PNG"), (3840, 2160, "PNG"), (3840, 2160, "JPEG")]
+    print(f"{'원본':>18} | {'예산':>7} | {'기존 ms':>8} {'인코딩':>5} {'결과':>14} | "
+          f"{'신규 ms':>8} {'인코딩':>5} {'결과':>14} | {'속도':>6}")
+    print("-" * 112)
+    for width, height, fmt in cases:
+        source = make_screenshot(width, height, fmt)
+        for max_bytes in args.max_bytes:
+            if len(source) <= max_bytes:
+                continue  # 실제 변환기는 예산 이하 이미지를 리사이즈하지 않음
+            old_ms, old_enc, old = _measure(legacy_resize, source, max_bytes, args.repeat)
+            new_ms, new_enc, new = _measure(c2m._resize_image, source, max_bytes, args.repeat)
+            old_size = Image.open(io.BytesIO(old)).size
+            new_size = Image.open(io.BytesIO(new)).size
+            label = f"{width}x{height} {fmt} {len(source) / 1e6:.1f}MB"
+            print(f"{label:>18} | {max_bytes / 1e6:>5.1f}MB | {old_ms:>8.0f} {old_enc:>5} "
+                  f"{f'{old_size[0]}x{old_size[1]} {len(old) / 1e6:.2f}MB':>14} | {new_ms:>8.0f} {new_enc:>5} "
+                  f"{f'{new_size[0]}x{new_size[1]} {len(new) / 1e6:.2f}MB':>14} | {old_ms / new_ms:>5.1f}x")
+            assert len(new) <= max_bytes, "예산 초과"
+
+
+if __name__ == "__main__":
+    main()
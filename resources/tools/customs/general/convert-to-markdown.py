@@ -3,10 +3,14 @@ Office 문서(pptx, docx, xlsx)를 Markdown으로 변환하는 도구.
 이미지를 추출하고 Groq VLM(Llama 4 Scout)으로 설명을 생성합니다.
 
 사용법:
-    python tools/convert-to-markdown.py [input_dir] [output_dir]
+    python tools/convert-to-markdown.py [input_dir] [output_dir] [--jobs N] [--incremental] [--format md|jsonl|both]
 
 환경변수:
     GROQ_API_KEY: Groq API 키 (이미지 설명 생성에 필요)
+    VLM_CONCURRENCY: 프로세스당 동시 VLM 요청 수 (기본값 4)
+    GROQ_RPM: VLM 분당 요청 한도 (기본값 30)
+    VLM_CACHE_DIR: 이미지 설명 캐시 디렉토리 (기본값 ~/.cache/convert-to-markdown/vlm)
+    VLM_CACHE_MAX_MB / VLM_CACHE_MAX_DAYS: 캐시 크기 상한 (256MB) / 미사용 만료 기간 (180일)
 
 기본값:
     input_dir:  resources/references
@@ -15,10 +19,21 @@ Office 문서(pptx, docx, xlsx)를 Markdown으로 변환하는 도구.
 
 import sys
 import os
+import argparse
 import base64
+import hashlib
+import struct
+import json
 import time
 import io
+import re
+import posixpath
+import threading
+import zipfile
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 from pathlib import Path
+from xml.etree import ElementTree as ET
 from dotenv import load_dotenv
 
 # tools/.env 파일에서 환경변수 로드
@@ -28,9 +43,16 @@ from pptx import Presentation
 from pptx.util import Pt
 from pptx.enum.shapes import MSO_SHAPE_TYPE
 from docx import Document
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph
 from docx.opc.constants import RELATIONSHIP_TYPE as RT
 from openpyxl import load_workbook
-from openpyxl.drawing.image import Image as XlImage
+
+try:
+    import tiktoken  # 선택: 청크 토큰 수를 정확히 계산 (없으면 추정)
+except ImportError:
+    tiktoken = None
 
 # ---------------------------------------------------------------------------
 # Groq VLM
@@ -43,6 +65,15 @@ VLM_PROMPT = (
     "텍스트가 있으면 그대로 옮겨 적고, 시각적 레이아웃과 구조도 설명해 주세요."
 )
 
+VLM_MAX_TOKENS = 2048
+VLM_MAX_RETRIES = 3
+VLM_CONCURRENCY = int(os.environ.get("VLM_CONCURRENCY", "4"))  # 동시 VLM 요청 수
+GROQ_RPM = float(os.environ.get("GROQ_RPM", "30"))             # 분당 요청 수 상한
+
+VLM_CACHE_DIR = Path(os.path.expanduser(os.environ.get("VLM_CACHE_DIR", "~/.cache/convert-to-markdown/vlm")))
+VLM_CACHE_MAX_BYTES = int(os.environ.get("VLM_CACHE_MAX_MB", "256")) * 1024 * 1024
+VLM_CACHE_MAX_DAYS = float(os.environ.get("VLM_CACHE_MAX_DAYS", "180"))
+
 _groq_client = None
 
 
@@ -53,12 +84,211 @@ def _get_groq_client():
         if not api_key:
             return None
         from groq import Groq
-        _groq_client = Groq(api_key=api_key)
+        # 재시도/대기는 RateLimiter가 담당하므로 SDK 자동 재시도는 끔
+        _groq_client = Groq(api_key=api_key, max_retries=0)
     return _groq_client
 
 
+def _parse_reset(value: str | None) -> float | None:
+    """rate limit 리셋 시간 헤더 파싱 ("7.66s", "2m59.56s", "120ms", "15" → 초)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    total = 0.0
+    for amount, unit in re.findall(r"([\d.]+)(ms|h|m|s)", value):
+        total += float(amount) * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+    return total or None
+
+
+class RateLimiter:
+    """토큰 버킷 요청 속도 제한기 (스레드 안전).
+
+    분당 rate_per_min개의 토큰이 균등하게 채워지며, 응답의 x-ratelimit-* / retry-after
+    헤더를 받으면 남은 한도에 맞춰 버킷을 줄이거나 리셋 시각까지 전체 요청을 멈춘다.
+    """
+
+    def __init__(self, rate_per_min: float, burst: int = 1):
+        self.rate = max(rate_per_min, 0.1) / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """요청 1건을 보낼 수 있을 때까지 대기."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def block(self, seconds: float):
+        """seconds 동안 모든 요청 중지 (429 / 한도 소진)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def update(self, headers) -> float | None:
+        """응답 헤더 반영. 대기가 필요하면 대기 시간(초)을 반환."""
+        if not headers:
+            return None
+        waits = [_parse_reset(headers.get("retry-after"))]
+        remaining = headers.get("x-ratelimit-remaining-requests")
+        if remaining is not None and remaining.isdigit():
+            with self._lock:
+                self._tokens = min(self._tokens, float(remaining))
+            if int(remaining) == 0:
+                waits.append(_parse_reset(headers.get("x-ratelimit-reset-requests")))
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        if remaining_tokens is not None and remaining_tokens.isdigit() and int(remaining_tokens) < VLM_MAX_TOKENS:
+            waits.append(_parse_reset(headers.get("x-ratelimit-reset-tokens")))
+        wait = max((w for w in waits if w), default=None)
+        if wait:
+            self.block(wait)
+        return wait
+
+
+_rate_limiter = RateLimiter(GROQ_RPM, burst=VLM_CONCURRENCY)
+
+
+def _vlm_request(client, data_url: str):
+    """VLM 호출 1회. (응답 텍스트, 응답 헤더) 반환."""
+    raw = client.chat.completions.with_raw_response.create(
+        model=GROQ_MODEL,
+        messages=[
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": VLM_PROMPT},
+                    {"type": "image_url", "image_url": {"url": data_url}},
+                ],
+            }
+        ],
+        temperature=0.3,
+        max_completion_tokens=VLM_MAX_TOKENS,
+    )
+    response = raw.parse()
+    return response.choices[0].message.content.strip(), raw.headers
+
+
+class DescriptionCache:
+    """이미지 바이트 + 모델 + 프롬프트 해시를 키로 하는 VLM 설명 디스크 캐시.
+
+    항목 하나 = JSON 파일 하나. 조회 시 mtime을 갱신하고, max_days 동안 사용되지 않은
+    항목은 만료. 전체 크기가 max_bytes를 넘으면 오래 사용되지 않은 항목부터 삭제 (LRU).
+    쓰기는 임시 파일 + rename으로 원자적으로 수행하여 여러 프로세스/스레드가 공유 가능.
+    """
+
+    def __init__(self, directory: Path = VLM_CACHE_DIR, max_bytes: int = VLM_CACHE_MAX_BYTES,
+                 max_days: float = VLM_CACHE_MAX_DAYS):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_days * 86400
+        self._size: int | None = None  # 현재 캐시 크기 추정치 (첫 기록 시 계산)
+        self._lock = threading.Lock()
+
+    def key(self, image_bytes: bytes) -> str:
+        digest = hashlib.sha256(f"{GROQ_MODEL}|{VLM_PROMPT}".encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(image_bytes)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        entry = self._entry_path(key)
+        try:
+            if time.time() - entry.stat().st_mtime > self.max_age:
+                entry.unlink()
+                return None
+            payload = json.loads(entry.read_text(encoding="utf-8"))
+            os.utime(entry)  # LRU: 최근 사용 시각 갱신
+        except (OSError, ValueError):
+            return None
+        if payload.get("model") != GROQ_MODEL:
+            return None
+        return payload.get("description")
+
+    def lookup(self, image_bytes: bytes) -> str | None:
+        return self.get(self.key(image_bytes))
+
+    def put(self, key: str, description: str):
+        entry = self._entry_path(key)
+        payload = json.dumps({
+            "model": GROQ_MODEL,
+            "created": int(time.time()),
+            "description": description,
+        }, ensure_ascii=False).encode("utf-8")
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            tmp = entry.with_name(f"{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(payload)
+            os.replace(tmp, entry)
+        except OSError:
+            return  # 캐시 기록 실패는 변환 결과에 영향 없음
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(payload)
+            if self._size > self.max_bytes:
+                self.prune()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for entry in self.directory.glob("*/*.json"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def prune(self):
+        """만료 항목을 삭제하고, 크기 초과 시 오래 사용되지 않은 항목부터 max_bytes의 90% 이하로 축소."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        expire_before = time.time() - self.max_age
+        for mtime, size, entry in entries:
+            if total <= target and mtime >= expire_before:
+                break
+            try:
+                entry.unlink()
+                total -= size
+            except OSError:
+                pass
+        self._size = total
+
+
+_description_cache: DescriptionCache | None = DescriptionCache()
+
+
 def describe_image(image_bytes: bytes, content_type: str = "image/png") -> str:
-    """Groq VLM으로 이미지를 설명."""
+    """Groq VLM으로 이미지를 설명 (블로킹, 설명 캐시와 공용 RateLimiter 사용)."""
+    cache_key = None
+    if _description_cache is not None:
+        cache_key = _description_cache.key(image_bytes)
+        cached = _description_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     client = _get_groq_client()
     if client is None:
         return "(GROQ_API_KEY 미설정 - 이미지 설명 생략)"
@@ -71,31 +301,25 @@ def describe_image(image_bytes: bytes, content_type: str = "image/png") -> str:
     b64 = base64.b64encode(image_bytes).decode("utf-8")
     data_url = f"data:{content_type};base64,{b64}"
 
-    max_retries = 3
-    for attempt in range(max_retries):
+    for attempt in range(VLM_MAX_RETRIES):
+        _rate_limiter.acquire()
         try:
-            response = client.chat.completions.create(
-                model=GROQ_MODEL,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": VLM_PROMPT},
-                            {"type": "image_url", "image_url": {"url": data_url}},
-                        ],
-                    }
-                ],
-                temperature=0.3,
-                max_completion_tokens=2048,
-            )
-            return response.choices[0].message.content.strip()
+            text, headers = _vlm_request(client, data_url)
+            _rate_limiter.update(headers)
+            if cache_key is not None:
+                _description_cache.put(cache_key, text)
+            return text
         except Exception as e:
+            status = getattr(e, "status_code", None)
             err_str = str(e).lower()
-            if "rate_limit" in err_str or "429" in err_str:
-                wait = 15 * (attempt + 1)
-                print(f"\n    [Rate limit] {wait}초 대기 중...", end="", flush=True)
-                time.sleep(wait)
-            elif "413" in err_str or "too large" in err_str:
+            if status == 429 or "rate_limit" in err_str or "429" in err_str:
+                response = getattr(e, "response", None)
+                wait = _rate_limiter.update(getattr(response, "headers", None))
+                if not wait:
+                    wait = 15 * (attempt + 1)  # 헤더가 없으면 점진적 대기
+                    _rate_limiter.block(wait)
+                print(f"\n    [Rate limit] {wait:.0f}초 대기 후 재시도", flush=True)
+            elif status == 413 or "413" in err_str or "too large" in err_str:
                 image_bytes, content_type = _resize_image(image_bytes, max_bytes=2_000_000)
                 b64 = base64.b64encode(image_bytes).decode("utf-8")
                 data_url = f"data:{content_type};base64,{b64}"
@@ -104,53 +328,256 @@ def describe_image(image_bytes: bytes, content_type: str = "image/png") -> str:
     return "(이미지 설명 실패: rate limit 초과)"
 
 
+class ImageDescriptionQueue:
+    """이미지 설명 작업 큐.
+
+    변환기는 submit()으로 작업을 넣고 즉시 자리표시자를 받아 텍스트/테이블 추출을 계속한다.
+    스레드 풀이 RateLimiter 한도 안에서 VLM 요청을 동시에 처리하고,
+    resolve()가 완성된 설명을 Markdown의 자리표시자 위치에 끼워 넣는다.
+    """
+
+    PLACEHOLDER = re.compile(r"\x00VLM:(\d+)\x00")
+
+    def __init__(self, max_workers: int = VLM_CONCURRENCY):
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="vlm")
+        self._futures: dict[int, Future] = {}
+        self._inflight: dict[str, Future] = {}  # 중복 제거 키 → 진행 중/완료된 작업
+        self._next_id = 0
+        self.cache_hits = 0
+
+    def submit(self, image_bytes: bytes, content_type: str, name: str, key: str | None = None) -> str:
+        """설명 작업을 큐에 넣고 자리표시자 문자열 반환 (캐시 적중 시 설명을 바로 반환).
+
+        key가 같은 이미지는 이 프로세스에서 VLM 요청을 한 번만 보내고 결과를 공유.
+        """
+        future = self._inflight.get(key) if key else None
+        if future is None:
+            cached = _description_cache.lookup(image_bytes) if _description_cache is not None else None
+            if cached is not None:
+                self.cache_hits += 1
+                print(f"\n    [CACHE] {name}", flush=True)
+                return cached
+            if _get_groq_client() is None:
+                return describe_image(image_bytes, content_type)
+            future = self._pool.submit(self._describe, image_bytes, content_type, name)
+            if key:
+                self._inflight[key] = future
+        self._next_id += 1
+        self._futures[self._next_id] = future
+        return f"\x00VLM:{self._next_id}\x00"
+
+    @staticmethod
+    def _describe(image_bytes: bytes, content_type: str, name: str) -> str:
+        start = time.perf_counter()
+        desc = describe_image(image_bytes, content_type)
+        print(f"\n    [VLM] {name} 완료 ({time.perf_counter() - start:.1f}초)", flush=True)
+        return desc
+
+    def resolve(self, text: str, used: set[int] | None = None) -> str:
+        """text 안의 자리표시자를 완성된 설명으로 교체 (미완료 작업은 대기).
+
+        used를 넘기면 사용한 자리표시자를 여기에 모으고 release()할 때까지 유지
+        (같은 자리표시자가 여러 조각에 나뉘어 있는 스트리밍 출력용).
+        """
+        release = used is None
+        used = set() if used is None else used
+
+        def replace(match: re.Match) -> str:
+            placeholder_id = int(match.group(1))
+            used.add(placeholder_id)
+            try:
+                return self._futures[placeholder_id].result()
+            except Exception as e:
+                return f"(이미지 설명 실패: {e})"
+        text = self.PLACEHOLDER.sub(replace, text)
+        if release:
+            self.release(used)
+        return text
+
+    def release(self, used: set[int]):
+        """resolve()에 사용된 자리표시자 작업 정리."""
+        for placeholder_id in used:
+            self._futures.pop(placeholder_id, None)
+
+    def configure(self, max_workers: int):
+        self._pool.shutdown(wait=True)
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="vlm")
+        self._inflight.clear()
+
+
+_vlm_queue = ImageDescriptionQueue()
+
+
+def configure_vlm(concurrency: int, rpm: float, use_cache: bool = True):
+    """VLM 동시 요청 수, 분당 요청 한도, 설명 캐시 사용 여부 설정 (프로세스 풀 initializer로도 사용)."""
+    global _rate_limiter, _description_cache
+    _rate_limiter = RateLimiter(rpm, burst=concurrency)
+    _vlm_queue.configure(concurrency)
+    if not use_cache:
+        _description_cache = None
+
+
 MIN_IMAGE_WIDTH = 150   # 이 미만이면 아이콘으로 간주
 MIN_IMAGE_HEIGHT = 150
 MIN_IMAGE_BYTES = 5_000  # 5KB 미만이면 아이콘으로 간주
 
 
+def _probe_image_size(image_bytes: bytes) -> tuple[int, int] | None:
+    """이미지 헤더만 읽어 (너비, 높이) 반환 (픽셀 디코딩 없음). 알 수 없으면 None."""
+    data = image_bytes
+    if data[:8] == b"\x89PNG\r\n\x1a\n" and data[12:16] == b"IHDR":
+        return struct.unpack(">II", data[16:24])
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return struct.unpack("<HH", data[6:10])
+    if data[:2] == b"BM" and len(data) >= 26:
+        w, h = struct.unpack("<ii", data[18:26])
+        return w, abs(h)
+    if data[:2] == b"\xff\xd8":
+        # JPEG: SOFn 세그먼트까지 마커 길이만큼 건너뛰며 탐색
+        i = 2
+        while i + 9 < len(data):
+            if data[i] != 0xFF:
+                i += 1
+                continue
+            marker = data[i + 1]
+            if marker == 0xFF or marker == 0x01 or 0xD0 <= marker <= 0xD8:
+                i += 1 if marker == 0xFF else 2
+                continue
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                h, w = struct.unpack(">HH", data[i + 5:i + 9])
+                return w, h
+            i += 2 + struct.unpack(">H", data[i + 2:i + 4])[0]
+        return None
+    try:
+        # 그 외 형식은 PIL 지연 로딩(헤더만 파싱)으로 확인
+        from PIL import Image
+        return Image.open(io.BytesIO(image_bytes)).size
+    except Exception:
+        return None
+
+
 def _is_meaningful_image(image_bytes: bytes) -> bool:
-    """아이콘/장식 이미지를 걸러내고 정보성 이미지만 통과."""
+    """아이콘/장식 이미지를 걸러내고 정보성 이미지만 통과 (헤더만 검사)."""
     if len(image_bytes) < MIN_IMAGE_BYTES:
         return False
+    size = _probe_image_size(image_bytes)
+    if size is not None:
+        w, h = size
+        if w < MIN_IMAGE_WIDTH or h < MIN_IMAGE_HEIGHT:
+            return False
+    return True
+
+
+def _dhash(image_bytes: bytes, hash_size: int = 8) -> int | None:
+    """지각 해시(dHash): 축소한 흑백 이미지의 인접 픽셀 밝기 차이 비트열. 디코딩 불가 형식은 None."""
     try:
         from PIL import Image
         img = Image.open(io.BytesIO(image_bytes))
-        w, h = img.size
-        if w < MIN_IMAGE_WIDTH or h < MIN_IMAGE_HEIGHT:
-            return False
+        img.draft("L", (hash_size * 16, hash_size * 16))  # JPEG: DCT 단계에서 축소 디코딩
+        img = img.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR, reducing_gap=2.0)
     except Exception:
-        pass
-    return True
+        return None
+    px = img.tobytes()
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (px[offset + col] > px[offset + col + 1])
+    return bits
+
+
+DEDUP_THUMB_SIZE = 64      # 지각 해시가 같을 때 확인용 흑백 축소 이미지 크기
+DEDUP_MAX_PIXEL_DIFF = 24  # 같은 이미지로 볼 축소 이미지 픽셀 밝기 차이 상한 (0~255)
+
+
+def _thumbnail(image_bytes: bytes) -> bytes | None:
+    """중복 확인용 DEDUP_THUMB_SIZE 정사각 흑백 축소 이미지 픽셀. 디코딩 불가 형식은 None."""
+    try:
+        from PIL import Image
+        img = Image.open(io.BytesIO(image_bytes))
+        img.draft("L", (DEDUP_THUMB_SIZE * 2, DEDUP_THUMB_SIZE * 2))
+        img = img.convert("L").resize((DEDUP_THUMB_SIZE, DEDUP_THUMB_SIZE), Image.BILINEAR, reducing_gap=2.0)
+    except Exception:
+        return None
+    return img.tobytes()
+
+
+def _same_picture(a: bytes | None, b: bytes | None) -> bool:
+    """두 축소 이미지의 모든 픽셀 밝기 차이가 DEDUP_MAX_PIXEL_DIFF 이하인지.
+
+    64비트 dHash는 여백이 많은 스크린샷끼리 쉽게 충돌하므로, 해시 일치만으로 합치지 않고
+    해상도/인코딩 차이는 허용하되 내용이 다르면 걸러내기 위해 사용.
+    """
+    if a is None or b is None or len(a) != len(b):
+        return False
+    return max(abs(x - y) for x, y in zip(a, b)) <= DEDUP_MAX_PIXEL_DIFF
+
+
+RESIZE_QUALITY = 85        # 1차 인코딩 JPEG 품질
+RESIZE_RETRY_QUALITY = 75  # 1차 결과가 예산 초과 시 2차 인코딩 품질
+RESIZE_BPP_ESTIMATE = 0.25  # 스크린샷류 JPEG(q85) 픽셀당 바이트 추정치
+RESIZE_MARGIN = 0.9        # 추정 오차를 고려한 예산 여유
 
 
 def _resize_image(image_bytes: bytes, max_bytes: int = 3_500_000) -> tuple[bytes, str]:
-    """PIL로 이미지를 축소하여 크기 제한 내로 맞춤."""
+    """PIL로 이미지를 축소하여 max_bytes 이내 JPEG로 변환 (보통 인코딩 1~2회).
+
+    1) 픽셀 수와 예산으로 축소 비율을 추정 (원본이 JPEG면 원본의 픽셀당 바이트 사용)
+    2) JPEG 원본은 draft()로 DCT 단계에서 축소 디코딩, resize는 reducing_gap으로 정수배 축소 후 보간
+    3) 1차 인코딩 결과가 예산을 넘으면 실측 픽셀당 바이트로 비율을 다시 계산해 2차 인코딩
+    """
     try:
         from PIL import Image
         img = Image.open(io.BytesIO(image_bytes))
-        quality = 85
-        while True:
-            buf = io.BytesIO()
-            if img.mode in ("RGBA", "P"):
-                img = img.convert("RGB")
-            img.save(buf, format="JPEG", quality=quality)
-            if buf.tell() <= max_bytes or quality <= 20:
-                return buf.getvalue(), "image/jpeg"
-            quality -= 15
-            if quality <= 20:
-                # 해상도도 줄이기
-                w, h = img.size
-                img = img.resize((w // 2, h // 2), Image.LANCZOS)
-                quality = 70
+        w, h = img.size
+        pixels = w * h
+        budget = max_bytes * RESIZE_MARGIN
+        bpp = RESIZE_BPP_ESTIMATE
+        if img.format == "JPEG":
+            bpp = max(min(bpp, len(image_bytes) / pixels), 0.05)  # 원본이 더 압축돼 있으면 원본 기준
+        scale = (budget / (pixels * bpp)) ** 0.5
+        if scale > 0.9:
+            scale = 1.0  # 추정상 거의 맞으면 원본 해상도로 먼저 시도
+
+        target = (max(1, int(w * scale)), max(1, int(h * scale)))
+        if img.format == "JPEG" and scale < 1:
+            img.draft("RGB", target)  # 1/2, 1/4, 1/8 단위 축소 디코딩 (target 이상 크기 유지)
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        if img.size != target:
+            img = img.resize(target, Image.LANCZOS, reducing_gap=3.0)
+
+        data = _encode_jpeg(img, RESIZE_QUALITY)
+        if len(data) <= max_bytes:
+            return data, "image/jpeg"
+
+        # 2차: 실측 크기로 비율 재계산 + 품질 하향
+        ratio = (budget / len(data)) ** 0.5 * 0.95
+        img = img.resize((max(1, int(img.size[0] * ratio)), max(1, int(img.size[1] * ratio))),
+                         Image.LANCZOS, reducing_gap=3.0)
+        data = _encode_jpeg(img, RESIZE_RETRY_QUALITY)
+        while len(data) > max_bytes and min(img.size) > 64:
+            # 드문 경우(극단적 노이즈 이미지)만: 절반씩 축소
+            img = img.resize((img.size[0] // 2, img.size[1] // 2), Image.LANCZOS)
+            data = _encode_jpeg(img, RESIZE_RETRY_QUALITY)
+        return data, "image/jpeg"
     except Exception:
         return image_bytes, "image/png"
 
 
+def _encode_jpeg(img, quality: int) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=quality, optimize=False)
+    return buf.getvalue()
+
+
 # ---------------------------------------------------------------------------
 # 이미지 추출 헬퍼
 # ---------------------------------------------------------------------------
 
+SHARED_IMAGE_DIR = "_shared"  # 정보성 이미지 저장 위치 (images/_shared/{지각 해시}{확장자})
+
+
 def _save_image(image_bytes: bytes, ext: str, images_dir: Path, prefix: str, idx: int) -> Path:
     """이미지를 파일로 저장하고 경로 반환."""
     images_dir.mkdir(parents=True, exist_ok=True)
@@ -162,6 +589,142 @@ def _save_image(image_bytes: bytes, ext: str, images_dir: Path, prefix: str, idx
     return path
 
 
+_shared_images: dict[tuple[Path, str], list[Path]] = {}  # (공유 디렉토리, 지각 해시 키) → 저장된 파일들
+_shared_thumbs: dict[Path, bytes | None] = {}               # 저장된 파일 → 축소 이미지
+
+
+def _shared_candidates(shared_dir: Path, key: str) -> list[Path]:
+    """키가 같은 공유 이미지 파일 목록 ({key}.ext, {key}-{sha}.ext). 다른 작업자의 임시 파일은 제외."""
+    paths = _shared_images.get((shared_dir, key))
+    if paths is None or not all(p.exists() for p in paths):
+        paths = []
+        if shared_dir.is_dir():
+            paths = sorted(p for p in shared_dir.glob(f"{key}*")
+                           if not p.name.endswith(".tmp") and p.stem.split("-")[0] == key)
+        _shared_images[(shared_dir, key)] = paths
+    return paths
+
+
+def _matches_shared(path: Path, image_bytes: bytes, thumb: bytes | None) -> bool:
+    """저장된 공유 이미지가 바이트가 같거나 (thumb가 있으면) 축소 이미지 기준으로 같은 그림인지."""
+    try:
+        if path.stat().st_size == len(image_bytes) and path.read_bytes() == image_bytes:
+            return True
+        if thumb is None:
+            return False
+        if path not in _shared_thumbs:
+            _shared_thumbs[path] = _thumbnail(path.read_bytes())
+    except OSError:
+        return False
+    return _same_picture(_shared_thumbs[path], thumb)
+
+
+def _create_new(tmp: Path, path: Path) -> bool:
+    """tmp 내용으로 path를 원자적으로 생성. 이미 있으면 덮어쓰지 않고 False."""
+    try:
+        os.link(tmp, path)
+        return True
+    except FileExistsError:
+        return False
+    except OSError:
+        # 하드 링크 미지원 파일 시스템: 존재 확인 후 교체
+        if path.exists():
+            return False
+        os.replace(tmp, path)
+        return True
+
+
+def _store_shared_image(shared_dir: Path, key: str, image_bytes: bytes, ext: str,
+                        verify: bool = True) -> tuple[Path, bool]:
+    """공유 이미지를 저장하거나 같은 그림의 기존 파일을 찾아 (경로, 새로 저장 여부) 반환.
+
+    키(지각 해시)가 같아도 verify면 바이트 일치 또는 축소 이미지 비교로 같은 그림일 때만 기존 파일을 사용하고,
+    다른 그림은 {key}-{sha256 앞 12자}{ext}로 따로 저장. 파일 생성은 os.link로 원자적으로 하여
+    --jobs 작업자끼리 같은 이름을 동시에 만들어도 서로 덮어쓰지 않음.
+    """
+    thumb = _thumbnail(image_bytes) if verify else None
+    candidates = _shared_candidates(shared_dir, key)
+    for path in candidates:
+        if _matches_shared(path, image_bytes, thumb):
+            return path, False
+
+    shared_dir.mkdir(parents=True, exist_ok=True)
+    names = [f"{key}{ext}", f"{key}-{hashlib.sha256(image_bytes).hexdigest()[:12]}{ext}"]
+    tmp = shared_dir / f"{names[-1]}.{os.getpid()}.tmp"
+    tmp.write_bytes(image_bytes)
+    try:
+        for name in names:
+            path = shared_dir / name
+            if not _create_new(tmp, path):
+                if _matches_shared(path, image_bytes, thumb):
+                    candidates.append(path)
+                    return path, False
+                continue
+            candidates.append(path)
+            _shared_thumbs[path] = thumb
+            return path, True
+    finally:
+        tmp.unlink(missing_ok=True)
+    raise FileExistsError(f"공유 이미지 이름 충돌: {names[-1]}")
+
+
+class DocumentImages:
+    """문서 1개의 이미지 처리: 헤더 검사 → 중복 제거 → 저장 → VLM 설명 요청.
+
+    - 아이콘/장식 이미지는 문서별 디렉토리에 저장 (같은 바이트는 한 번만)
+    - 정보성 이미지는 지각 해시로 후보를 찾고 축소 이미지 비교로 같은 그림임을 확인한 뒤
+      images/_shared에 한 번만 저장하여, 문서가 달라도 같은 파일과 같은 설명(VLM 1회)을 사용
+    """
+
+    def __init__(self, output_dir: Path, doc_stem: str):
+        self.output_dir = output_dir
+        self.images_dir = output_dir / "images" / doc_stem
+        self.rel_base = f"images/{doc_stem}"
+        self.shared_dir = output_dir / "images" / SHARED_IMAGE_DIR
+        self.count = 0
+        self.duplicates = 0
+        self.outputs: set[str] = set()  # 이 문서가 참조하는 이미지 (output_dir 기준)
+        self._seen: dict[bytes, tuple[str, str | None]] = {}
+
+    def add(self, image_bytes: bytes, ext: str, prefix: str) -> tuple[str, str | None]:
+        """이미지 1개 처리. (Markdown 상대 경로, 설명 또는 자리표시자, 아이콘이면 None) 반환."""
+        if not ext.startswith("."):
+            ext = "." + ext
+        self.count += 1
+        name = f"{prefix}_img{self.count:02d}{ext}"
+
+        digest = hashlib.sha256(image_bytes).digest()
+        if digest in self._seen:
+            self.duplicates += 1
+            rel_path, desc = self._seen[digest]
+            print(f"\n    [DUP] {name} -> {rel_path}", flush=True)
+            return rel_path, desc
+
+        if not _is_meaningful_image(image_bytes):
+            saved = _save_image(image_bytes, ext, self.images_dir, prefix, self.count)
+            rel_path = f"{self.rel_base}/{saved.name}"
+            print(f"\n    [SKIP] {saved.name} (아이콘/장식)", flush=True)
+            desc = None
+        else:
+            phash = _dhash(image_bytes)
+            if phash is not None:
+                stored, created = _store_shared_image(self.shared_dir, f"{phash:016x}", image_bytes, ext)
+            else:
+                stored, created = _store_shared_image(self.shared_dir, digest.hex()[:32], image_bytes, ext,
+                                                      verify=False)
+            rel_path = f"images/{SHARED_IMAGE_DIR}/{stored.name}"
+            if not created and (stored.stat().st_size != len(image_bytes) or stored.read_bytes() != image_bytes):
+                # 같은 그림의 다른 파일(해상도/인코딩 차이): 저장된 대표 이미지로 설명
+                self.duplicates += 1
+                print(f"\n    [DUP] {name} -> {rel_path}", flush=True)
+                image_bytes = stored.read_bytes()
+            desc = _vlm_queue.submit(image_bytes, _content_type_from_ext(stored.suffix), name, key=stored.stem)
+
+        self.outputs.add(rel_path)
+        self._seen[digest] = (rel_path, desc)
+        return rel_path, desc
+
+
 def _content_type_from_ext(ext: str) -> str:
     mapping = {
         ".png": "image/png",
@@ -178,8 +741,10 @@ def _content_type_from_ext(ext: str) -> str:
     return mapping.get(ext.lower(), "image/png")
 
 
-def _image_markdown(rel_path: str, description: str) -> list[str]:
-    """이미지 참조와 설명을 마크다운 라인 리스트로 반환."""
+def _image_markdown(rel_path: str, description: str | None) -> list[str]:
+    """이미지 참조와 설명을 마크다운 라인 리스트로 반환 (설명이 None이면 아이콘)."""
+    if description is None:
+        return [f"![아이콘]({rel_path})\n"]
     lines = [
         f"![이미지]({rel_path})\n",
         f"> {description}\n",
@@ -187,18 +752,380 @@ def _image_markdown(rel_path: str, description: str) -> list[str]:
     return lines
 
 
+# ---------------------------------------------------------------------------
+# 출력
+# ---------------------------------------------------------------------------
+
+CHUNK_MAX_TOKENS = 1000  # JSONL 청크당 최대 토큰 수 (경계가 없어도 이 크기에서 분할)
+CHUNK_ENCODING = "cl100k_base"
+
+_WIDE_CHAR = re.compile(r"[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u4e00-\u9fff\uac00-\ud7af]")
+_token_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """토큰 수 계산. tiktoken이 있으면 cl100k_base 기준, 없으면 한글/한자는 글자당 1, 나머지는 4글자당 1로 추정."""
+    global _token_encoding, tiktoken
+    if tiktoken is not None and _token_encoding is None:
+        try:
+            _token_encoding = tiktoken.get_encoding(CHUNK_ENCODING)
+        except Exception:  # 인코딩 파일 다운로드 실패 등
+            tiktoken = None
+    if _token_encoding is not None:
+        return len(_token_encoding.encode(text, disallowed_special=()))
+    wide = len(_WIDE_CHAR.findall(text))
+    return wide + (len(text) - wide + 3) // 4
+
+
+class MarkdownWriter:
+    """변환기 출력 싱크.
+
+    변환기가 넘기는 줄을 즉시 부분 파일에 기록하며 이미지/테이블 수를 집계한다.
+    commit()에서 VLM 설명 자리표시자를 줄 단위로 치환하며 임시 파일로 복사한 뒤 rename으로 교체하므로
+    문서 크기와 관계없이 메모리 사용이 일정하고, 변환 중 실패해도 불완전한 .md가 남지 않는다.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.images = 0  # 설명 대상 이미지 참조 수 (아이콘 제외)
+        self.tables = 0
+        self.bytes = 0   # 최종 파일 크기 (commit 후)
+        self._partial = path.with_name(f"{path.name}.{os.getpid()}.part")
+        self._file = open(self._partial, "w", encoding="utf-8", newline="")
+        self._first = True
+
+    def line(self, text: str = ""):
+        """한 줄 기록 (줄 목록을 줄바꿈으로 이어 붙인 것과 같은 결과가 되도록 두 번째 줄부터 앞에 줄바꿈)."""
+        self._file.write(text if self._first else "\n" + text)
+        self._first = False
+
+    def image(self, rel_path: str, description: str | None):
+        """이미지 참조와 설명 기록 (설명이 None이면 아이콘)."""
+        if description is not None:
+            self.images += 1
+        for text in _image_markdown(rel_path, description):
+            self.line(text)
+
+    def table_header(self, cells: list[str]):
+        """테이블 헤더와 구분선 기록."""
+        self.tables += 1
+        self.line("| " + " | ".join(cells) + " |")
+        self.line("| " + " | ".join(["---"] * len(cells)) + " |")
+
+    def table_row(self, cells: list[str]):
+        self.line("| " + " | ".join(cells) + " |")
+
+    def section(self, **meta):
+        """슬라이드/시트/제목 경계 알림 (Markdown 출력에서는 무시)."""
+
+    def location(self, **meta):
+        """현재 위치(페이지 등) 갱신 (Markdown 출력에서는 무시)."""
+
+    def _finish(self, text: str, used: set[int]) -> str:
+        """commit 시 부분 파일의 한 줄을 최종 형태로 변환."""
+        return _vlm_queue.resolve(text, used)
+
+    def commit(self, used: set[int] | None = None):
+        """자리표시자를 설명으로 치환하며 최종 파일을 원자적으로 교체.
+
+        used를 넘기면 사용한 자리표시자를 정리하지 않고 모아 둔다 (여러 싱크가 같은 설명을 쓰는 경우).
+        """
+        self._file.close()
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        release = used is None
+        used = set() if used is None else used
+        try:
+            with open(self._partial, encoding="utf-8", newline="") as src, \
+                    open(tmp, "w", encoding="utf-8", newline="") as dst:
+                for text in src:
+                    dst.write(self._finish(text, used))
+            self.bytes = tmp.stat().st_size
+            os.replace(tmp, self.path)
+        finally:
+            if release:
+                _vlm_queue.release(used)
+            tmp.unlink(missing_ok=True)
+            self._partial.unlink(missing_ok=True)
+
+    def discard(self):
+        """기록 중인 부분 파일 삭제."""
+        self._file.close()
+        self._partial.unlink(missing_ok=True)
+
+    def __enter__(self) -> "MarkdownWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+
+class ChunkWriter(MarkdownWriter):
+    """임베딩용 JSONL 청크 출력 싱크.
+
+    section() 경계(슬라이드/시트/제목)와 토큰 예산에서 청크를 나누고, 청크마다 원본 위치와
+    포함된 이미지 경로, 토큰 수를 함께 기록한다. 토큰 수는 줄을 받을 때 누적하므로 Markdown을 다시 파싱하지 않는다.
+    """
+
+    def __init__(self, path: Path, source: str, max_tokens: int = CHUNK_MAX_TOKENS):
+        super().__init__(path)
+        self.source = source
+        self.max_tokens = max_tokens
+        self.chunks = 0
+        self._meta: dict = {}        # 현재 위치 (slide / sheet / heading / page)
+        self._chunk_meta: dict = {}  # 청크 본문이 시작된 위치
+        self._lines: list[str] = []
+        self._images: list[str] = []
+        self._tokens = 0
+        self._has_body = False       # 제목/빈 줄 외의 내용이 있는지
+        self._table_header: list[str] | None = None  # 진행 중인 테이블 헤더 (청크가 나뉘면 반복)
+
+    def line(self, text: str = ""):
+        self._table_header = None
+        self._append([text])
+
+    def image(self, rel_path: str, description: str | None):
+        if description is not None:
+            self.images += 1
+        self._table_header = None
+        self._append(_image_markdown(rel_path, description))  # 참조와 설명은 같은 청크에
+        self._images.append(rel_path)
+
+    def table_header(self, cells: list[str]):
+        self.tables += 1
+        header = ["| " + " | ".join(cells) + " |", "| " + " | ".join(["---"] * len(cells)) + " |"]
+        self._table_header = None
+        self._append(header)
+        self._table_header = header
+
+    def table_row(self, cells: list[str]):
+        self._append(["| " + " | ".join(cells) + " |"])
+
+    def section(self, **meta):
+        """경계에서 청크를 닫고 위치 갱신. 본문 없이 쌓인 제목 줄은 다음 청크 앞에 이어짐."""
+        if self._has_body:
+            self._flush()
+        self._meta.update(meta)
+
+    def location(self, **meta):
+        self._meta.update(meta)
+
+    def _append(self, lines: list[str]):
+        tokens = sum(count_tokens(text) + 1 for text in lines)  # +1: 줄바꿈
+        if self._has_body and self._tokens + tokens > self.max_tokens:
+            self._flush()
+            if self._table_header:
+                self._append(self._table_header)
+        self._lines.extend(lines)
+        self._tokens += tokens
+        if not self._has_body and any(text.strip() and not text.startswith("#") for text in lines):
+            self._has_body = True
+            self._chunk_meta = dict(self._meta)
+
+    def _flush(self):
+        if self._has_body:
+            text = "\n".join(self._lines).strip()
+            if self._tokens <= self.max_tokens:
+                pieces = [(text, self._tokens)]
+            else:
+                # 예산을 넘는 한 줄(긴 문단 등)이나 본문 앞에 이어 붙은 제목 줄로 초과한 경우
+                pieces = _split_chunk_text(text, self.max_tokens)
+            for piece, tokens in pieces:
+                self.chunks += 1
+                record = {
+                    "id": f"{self.source}#{self.chunks}",
+                    "source": self.source,
+                    "chunk": self.chunks,
+                    **self._chunk_meta,
+                    "images": self._images if len(pieces) == 1 else
+                    [path for path in self._images if f"]({path})" in piece],
+                    "tokens": tokens,
+                    "text": piece,
+                }
+                self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._lines = []
+        self._images = []
+        self._tokens = 0
+        self._has_body = False
+
+    def _finish(self, text: str, used: set[int]) -> str:
+        """자리표시자를 설명으로 치환하고, 설명 때문에 예산을 넘은 청크는 다시 분할.
+
+        분할로 늘어난 청크 수만큼 뒤 청크의 번호(chunk, id)를 밀어 준다.
+        """
+        placeholder = "\\u0000VLM:" in text  # JSON 안의 자리표시자 (\x00은 \u0000으로 이스케이프됨)
+        if not placeholder and not self._shift:
+            return text
+        record = json.loads(text)
+        if placeholder:
+            record["text"] = _vlm_queue.resolve(record["text"], used)
+            pieces = _split_chunk_text(record["text"], self.max_tokens)
+        else:
+            pieces = [(record["text"], record["tokens"])]
+        lines = []
+        for offset, (piece, tokens) in enumerate(pieces):
+            chunk = record["chunk"] + self._shift + offset
+            lines.append(json.dumps({
+                **record,
+                "id": f"{self.source}#{chunk}",
+                "chunk": chunk,
+                "images": [path for path in record["images"] if f"]({path})" in piece],
+                "tokens": tokens,
+                "text": piece,
+            }, ensure_ascii=False) + "\n")
+        self._shift += len(pieces) - 1
+        return "".join(lines)
+
+    def commit(self, used: set[int] | None = None):
+        self._flush()
+        self._shift = 0  # _finish에서 재분할로 늘어난 청크 수
+        super().commit(used)
+        self.chunks += self._shift
+
+
+def _split_chunk_text(text: str, max_tokens: int) -> list[tuple[str, int]]:
+    """청크 본문을 max_tokens 이내 조각으로 분할하여 (본문, 토큰 수) 목록 반환.
+
+    줄 단위로 채우되 이미지 참조는 뒤따르는 설명 줄과 함께 두고, 테이블 중간에서 나뉘면 헤더를 반복.
+    한 줄(긴 이미지 설명 등)이 예산을 넘으면 단어 단위로 자른다.
+    """
+    units: list[list[str]] = []  # 함께 둘 줄 묶음
+    for text_line in text.split("\n"):
+        last = units[-1] if units else None
+        if (last and last[0].startswith("![") and not any(last[1:])
+                and (not text_line or text_line.startswith(">"))):
+            last.append(text_line)  # 이미지 참조 + 빈 줄 + 설명 줄
+        else:
+            units.append([text_line])
+
+    pieces: list[tuple[str, int]] = []
+    current: list[str] = []
+    tokens = 0
+    header: list[str] | None = None  # 진행 중인 테이블 헤더
+    previous = ""
+
+    def flush():
+        nonlocal current, tokens
+        body = "\n".join(current).strip()
+        if body:
+            pieces.append((body, tokens))
+        current, tokens = [], 0
+
+    for unit in units:
+        first = unit[0]
+        if first.startswith("| ---") and previous.startswith("|"):
+            header = [previous, first]
+        elif not first.startswith("|"):
+            header = None
+        previous = first
+
+        size = sum(count_tokens(item) + 1 for item in unit)
+        if current and tokens + size > max_tokens:
+            flush()
+            if header and first.startswith("|") and not first.startswith("| ---"):
+                current = list(header)
+                tokens = sum(count_tokens(item) + 1 for item in header)
+        if size <= max_tokens:
+            current.extend(unit)
+            tokens += size
+            continue
+
+        # 한 묶음이 예산 초과: 단어 단위로 채움 (공백 없는 긴 단어는 글자 단위)
+        buffer = ""
+        for word in re.split(r"(?<=\s)", "\n".join(unit)):
+            while word:
+                part = word if count_tokens(word) <= max_tokens else word[:max_tokens]
+                word = word[len(part):]
+                part_tokens = count_tokens(part)
+                if (current or buffer) and tokens + part_tokens > max_tokens:
+                    current.append(buffer)
+                    flush()
+                    buffer = ""
+                buffer += part
+                tokens += part_tokens
+        current.append(buffer)
+    flush()
+    return pieces or [(text, count_tokens(text))]
+
+
+class TeeWriter:
+    """같은 출력을 여러 싱크에 기록 (Markdown + JSONL 동시 출력)."""
+
+    def __init__(self, *writers: MarkdownWriter):
+        self.writers = writers
+
+    images = property(lambda self: self.writers[0].images)
+    tables = property(lambda self: self.writers[0].tables)
+    bytes = property(lambda self: sum(w.bytes for w in self.writers))
+    chunks = property(lambda self: sum(getattr(w, "chunks", 0) for w in self.writers))
+
+    def line(self, text: str = ""):
+        for w in self.writers:
+            w.line(text)
+
+    def image(self, rel_path: str, description: str | None):
+        for w in self.writers:
+            w.image(rel_path, description)
+
+    def table_header(self, cells: list[str]):
+        for w in self.writers:
+            w.table_header(cells)
+
+    def table_row(self, cells: list[str]):
+        for w in self.writers:
+            w.table_row(cells)
+
+    def section(self, **meta):
+        for w in self.writers:
+            w.section(**meta)
+
+    def location(self, **meta):
+        for w in self.writers:
+            w.location(**meta)
+
+    def __enter__(self) -> "TeeWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            for w in self.writers:
+                w.discard()
+            return
+        used: set[int] = set()
+        try:
+            for w in self.writers:
+                w.commit(used)
+        finally:
+            _vlm_queue.release(used)
+            for w in self.writers:
+                w.discard()  # 커밋하지 못한 부분 파일 정리 (커밋된 싱크는 영향 없음)
+
+
+def _write_table(rows: list[list[str]], writer: MarkdownWriter):
+    """첫 행을 헤더로 테이블 기록 (나머지 행은 헤더 열 수에 맞춤)."""
+    if not rows:
+        return
+    col_count = len(rows[0])
+    writer.table_header(rows[0])
+    for row in rows[1:]:
+        row += [""] * (col_count - len(row))
+        writer.table_row(row[:col_count])
+
+
 # ---------------------------------------------------------------------------
 # PPTX 변환
 # ---------------------------------------------------------------------------
 
-def _extract_shapes_images(shapes, images_dir: Path, prefix: str, img_counter: list, rel_base: str) -> list[str]:
-    """셰이프 목록에서 이미지를 추출하고 마크다운 라인 반환."""
-    img_lines = []
+def _extract_shapes_images(shapes, images: DocumentImages, prefix: str) -> list[tuple[str, str | None]]:
+    """셰이프 목록에서 이미지를 추출하고 (상대 경로, 설명) 목록 반환."""
+    found = []
     for shape in shapes:
         # 그룹 내부 재귀
         if shape.shape_type == MSO_SHAPE_TYPE.GROUP:
-            img_lines.extend(
-                _extract_shapes_images(shape.shapes, images_dir, prefix, img_counter, rel_base)
+            found.extend(
+                _extract_shapes_images(shape.shapes, images, prefix)
             )
         elif shape.shape_type == MSO_SHAPE_TYPE.PICTURE or (
             hasattr(shape, "image") and shape.shape_type not in (
@@ -211,79 +1138,49 @@ def _extract_shapes_images(shapes, images_dir: Path, prefix: str, img_counter: l
                 if img_ext == ".jpeg":
                     img_ext = ".jpg"
 
-                img_counter[0] += 1
-                saved = _save_image(img_blob, img_ext, images_dir, prefix, img_counter[0])
-                rel_path = f"{rel_base}/{saved.name}"
-
-                if not _is_meaningful_image(img_blob):
-                    print(f"\n    [SKIP] {saved.name} (아이콘/장식)", flush=True)
-                    img_lines.append(f"![아이콘]({rel_path})\n")
-                    continue
-
-                ct = _content_type_from_ext(img_ext)
-                print(f"\n    [VLM] {saved.name} 분석 중...", end="", flush=True)
-                desc = describe_image(img_blob, ct)
-                print(" 완료", flush=True)
-
-                img_lines.extend(_image_markdown(rel_path, desc))
+                found.append(images.add(img_blob, img_ext, prefix))
             except Exception:
                 pass
-    return img_lines
+    return found
 
 
-def pptx_to_markdown(filepath: Path, output_dir: Path) -> str:
-    """PowerPoint 파일을 Markdown으로 변환 (이미지 포함)."""
+def pptx_to_markdown(filepath: Path, images: DocumentImages, writer: MarkdownWriter):
+    """PowerPoint 파일을 Markdown으로 변환하여 writer에 기록 (이미지 포함)."""
     prs = Presentation(str(filepath))
-    doc_stem = filepath.stem
-    images_dir = output_dir / "images" / doc_stem
-    rel_base = f"images/{doc_stem}"
 
-    lines = [f"# {doc_stem}\n"]
-    img_counter = [0]
+    writer.line(f"# {filepath.stem}\n")
 
     for slide_idx, slide in enumerate(prs.slides, 1):
-        lines.append(f"## 슬라이드 {slide_idx}\n")
+        writer.section(slide=slide_idx)
+        writer.line(f"## 슬라이드 {slide_idx}\n")
 
         # 텍스트/테이블 먼저
         for shape in slide.shapes:
             if shape.has_table:
-                table = shape.table
-                rows = []
-                for row in table.rows:
-                    cells = [cell.text.strip().replace("\n", " ") for cell in row.cells]
-                    rows.append(cells)
-
+                rows = [[cell.text.strip().replace("\n", " ") for cell in row.cells] for row in shape.table.rows]
                 if rows:
-                    lines.append("| " + " | ".join(rows[0]) + " |")
-                    lines.append("| " + " | ".join(["---"] * len(rows[0])) + " |")
-                    for row in rows[1:]:
-                        while len(row) < len(rows[0]):
-                            row.append("")
-                        lines.append("| " + " | ".join(row[:len(rows[0])]) + " |")
-                    lines.append("")
+                    _write_table(rows, writer)
+                    writer.line("")
 
             elif shape.shape_type == MSO_SHAPE_TYPE.GROUP:
                 for child in shape.shapes:
                     if child.has_text_frame:
-                        _extract_text_frame(child.text_frame, lines)
+                        _extract_text_frame(child.text_frame, writer)
 
             elif shape.has_text_frame:
-                _extract_text_frame(shape.text_frame, lines)
+                _extract_text_frame(shape.text_frame, writer)
 
         # 이미지
-        img_lines = _extract_shapes_images(
-            slide.shapes, images_dir, f"slide{slide_idx:02d}", img_counter, rel_base
-        )
-        if img_lines:
-            lines.append("")
-            lines.extend(img_lines)
+        found = _extract_shapes_images(slide.shapes, images, f"slide{slide_idx:02d}")
+        if found:
+            writer.line("")
+            for rel_path, desc in found:
+                writer.image(rel_path, desc)
 
-        lines.append("---\n")
+        writer.line("---\n")
 
-    return "\n".join(lines)
 
-
-def _extract_text_frame(text_frame, lines: list):
+def _extract_text_frame(text_frame, writer: MarkdownWriter):
     """텍스트 프레임에서 마크다운 텍스트를 추출."""
     for para in text_frame.paragraphs:
         text = para.text.strip()
@@ -298,132 +1195,125 @@ def _extract_text_frame(text_frame, lines: list):
             is_bold = para.runs[0].font.bold or False
 
         if font_size and font_size >= Pt(24):
-            lines.append(f"### {text}\n")
+            writer.line(f"### {text}\n")
         elif font_size and font_size >= Pt(18):
-            lines.append(f"#### {text}\n")
+            writer.line(f"#### {text}\n")
         elif is_bold:
             if level > 0:
-                lines.append(f"{'  ' * level}- **{text}**")
+                writer.line(f"{'  ' * level}- **{text}**")
             else:
-                lines.append(f"**{text}**\n")
+                writer.line(f"**{text}**\n")
         else:
             if level > 0:
-                lines.append(f"{'  ' * level}- {text}")
+                writer.line(f"{'  ' * level}- {text}")
             else:
-                lines.append(f"{text}\n")
+                writer.line(f"{text}\n")
 
 
 # ---------------------------------------------------------------------------
 # DOCX 변환
 # ---------------------------------------------------------------------------
 
-def docx_to_markdown(filepath: Path, output_dir: Path) -> str:
-    """Word 문서를 Markdown으로 변환 (이미지 포함)."""
-    doc = Document(str(filepath))
-    doc_stem = filepath.stem
-    images_dir = output_dir / "images" / doc_stem
-    rel_base = f"images/{doc_stem}"
-
-    lines = [f"# {doc_stem}\n"]
+_W_P = qn("w:p")
+_W_TBL = qn("w:tbl")
+_W_BR = qn("w:br")
+_W_TYPE = qn("w:type")
+_W_RENDERED_BREAK = qn("w:lastRenderedPageBreak")
+_A_BLIP = qn("a:blip")
+_R_EMBED = qn("r:embed")
 
-    # 이미지 추출 (relationships에서)
-    img_counter = 0
-    image_map = {}  # rId -> (rel_path, description)
-    for rel in doc.part.rels.values():
-        if "image" in rel.reltype:
-            try:
-                img_blob = rel.target_part.blob
-                ext = Path(rel.target_ref).suffix or ".png"
-                img_counter += 1
-                saved = _save_image(img_blob, ext, images_dir, "img", img_counter)
-                rel_path = f"{rel_base}/{saved.name}"
-
-                if not _is_meaningful_image(img_blob):
-                    print(f"\n    [SKIP] {saved.name} (아이콘/장식)", flush=True)
-                    image_map[rel.rId] = (rel_path, None)
-                    continue
 
-                ct = _content_type_from_ext(ext)
-                print(f"\n    [VLM] {saved.name} 분석 중...", end="", flush=True)
-                desc = describe_image(img_blob, ct)
-                print(" 완료", flush=True)
+def docx_to_markdown(filepath: Path, images: DocumentImages, writer: MarkdownWriter):
+    """Word 문서를 Markdown으로 변환하여 writer에 기록 (이미지 포함).
 
-                image_map[rel.rId] = (rel_path, desc)
-            except Exception:
-                pass
+    본문 요소(문단, 테이블)를 문서 순서대로 한 번만 순회하며, 이미지는 본문에서 참조될 때만 추출.
+    """
+    doc = Document(str(filepath))
+    related_parts = doc.part.related_parts
+
+    writer.line(f"# {filepath.stem}\n")
+    placed = {}       # rId -> (rel_path, description), 같은 이미지를 여러 번 참조해도 추출은 1회
+    style_names = {}  # styleId -> 소문자 스타일 이름
+    # 페이지: 수동 페이지 나누기와 Word가 저장한 렌더링 페이지 경계 중 큰 값 기준 (근사치)
+    page_breaks = rendered_breaks = 0
+    page = 1
+    writer.location(page=page)
+
+    def inline_images(element) -> list[tuple[str, str | None]]:
+        """요소 하위의 인라인 이미지를 추출하고 페이지 경계를 갱신 (하위를 한 번에 탐색)."""
+        nonlocal page_breaks, rendered_breaks
+        found = []
+        for node in element.iter(_A_BLIP, _W_BR, _W_RENDERED_BREAK):
+            if node.tag == _W_RENDERED_BREAK:
+                rendered_breaks += 1
+                continue
+            if node.tag == _W_BR:
+                page_breaks += node.get(_W_TYPE) == "page"
+                continue
+            embed = node.get(_R_EMBED)
+            if not embed:
+                continue
+            if embed not in placed:
+                part = related_parts.get(embed)
+                if part is None or not hasattr(part, "blob"):
+                    continue
+                try:
+                    placed[embed] = images.add(part.blob, Path(part.partname).suffix or ".png", "img")
+                except Exception:
+                    continue
+            found.append(placed[embed])
+        return found
+
+    for element in doc.element.body.iterchildren():
+        if element.tag == _W_TBL:
+            _write_docx_table(Table(element, doc), writer)
+            # 셀 안의 이미지는 Markdown 테이블에 넣을 수 없으므로 테이블 바로 뒤에 기록
+            for rel_path, desc in inline_images(element):
+                writer.image(rel_path, desc)
+        elif element.tag == _W_P:
+            for rel_path, desc in inline_images(element):
+                writer.image(rel_path, desc)
+        else:
+            continue  # sectPr 등
+        if 1 + max(page_breaks, rendered_breaks) != page:
+            page = 1 + max(page_breaks, rendered_breaks)
+            writer.location(page=page)
+        if element.tag == _W_TBL:
+            continue
 
-    # 문단 순서대로 처리 (이미지 위치 추적)
-    for para in doc.paragraphs:
+        para = Paragraph(element, doc)
         text = para.text.strip()
-
-        # 인라인 이미지 체크
-        for run in para.runs:
-            inline_shapes = run._element.findall(
-                ".//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}drawing"
-            )
-            for drawing in inline_shapes:
-                blip_elems = drawing.findall(
-                    ".//{http://schemas.openxmlformats.org/drawingml/2006/main}blip"
-                )
-                for blip in blip_elems:
-                    embed = blip.get(
-                        "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
-                    )
-                    if embed and embed in image_map:
-                        rel_path, desc = image_map.pop(embed)
-                        if desc is None:
-                            lines.append(f"![아이콘]({rel_path})\n")
-                        else:
-                            lines.extend(_image_markdown(rel_path, desc))
-
         if not text:
-            lines.append("")
+            writer.line("")
             continue
 
-        style_name = para.style.name.lower() if para.style else ""
+        style_id = element.style
+        if style_id not in style_names:
+            style_names[style_id] = para.style.name.lower() if para.style else ""
+        style_name = style_names[style_id]
+        if "heading" in style_name or style_name.startswith("제목 "):
+            writer.section(heading=text, page=page)
 
         if "heading 1" in style_name or style_name == "제목 1":
-            lines.append(f"## {text}\n")
+            writer.line(f"## {text}\n")
         elif "heading 2" in style_name or style_name == "제목 2":
-            lines.append(f"### {text}\n")
+            writer.line(f"### {text}\n")
         elif "heading 3" in style_name or style_name == "제목 3":
-            lines.append(f"#### {text}\n")
+            writer.line(f"#### {text}\n")
         elif "heading" in style_name:
-            lines.append(f"##### {text}\n")
+            writer.line(f"##### {text}\n")
         elif "list" in style_name or "bullet" in style_name:
-            lines.append(f"- {text}")
+            writer.line(f"- {text}")
         else:
             formatted = _format_docx_paragraph(para)
-            lines.append(f"{formatted}\n")
-
-    # 본문에 매칭되지 않은 나머지 이미지 추가
-    if image_map:
-        lines.append("\n## 기타 이미지\n")
-        for rel_path, desc in image_map.values():
-            if desc is None:
-                lines.append(f"![아이콘]({rel_path})\n")
-            else:
-                lines.extend(_image_markdown(rel_path, desc))
-
-    # 테이블 처리
-    for table in doc.tables:
-        lines.append("")
-        rows = []
-        for row in table.rows:
-            cells = [cell.text.strip().replace("\n", " ") for cell in row.cells]
-            rows.append(cells)
+            writer.line(f"{formatted}\n")
 
-        if rows:
-            col_count = len(rows[0])
-            lines.append("| " + " | ".join(rows[0]) + " |")
-            lines.append("| " + " | ".join(["---"] * col_count) + " |")
-            for row in rows[1:]:
-                while len(row) < col_count:
-                    row.append("")
-                lines.append("| " + " | ".join(row[:col_count]) + " |")
-        lines.append("")
 
-    return "\n".join(lines)
+def _write_docx_table(table: Table, writer: MarkdownWriter):
+    """Word 테이블을 Markdown 테이블로 기록."""
+    writer.line("")
+    _write_table([[cell.text.strip().replace("\n", " ") for cell in row.cells] for row in table.rows], writer)
+    writer.line("")
 
 
 def _format_docx_paragraph(para) -> str:
@@ -448,71 +1338,149 @@ def _format_docx_paragraph(para) -> str:
 # XLSX 변환
 # ---------------------------------------------------------------------------
 
-def xlsx_to_markdown(filepath: Path, output_dir: Path) -> str:
-    """Excel 파일을 Markdown으로 변환 (이미지 포함)."""
-    wb = load_workbook(str(filepath), data_only=True)
-    doc_stem = filepath.stem
-    images_dir = output_dir / "images" / doc_stem
-    rel_base = f"images/{doc_stem}"
+@dataclass
+class XlsxLimits:
+    """xlsx 변환 상한 (None이면 제한 없음)."""
+    max_rows: int | None = None    # 시트당 데이터 행 수
+    max_cols: int | None = None    # 열 수
+    max_sheets: int | None = None  # 변환할 시트 수 (전체 시트에서 고르게 선택)
 
-    lines = [f"# {doc_stem}\n"]
-    img_counter = 0
 
-    for sheet_name in wb.sheetnames:
-        ws = wb[sheet_name]
-        lines.append(f"## {sheet_name}\n")
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_NS_DRAWING = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
 
-        # 시트 내 이미지
-        if hasattr(ws, "_images") and ws._images:
-            for xl_img in ws._images:
-                try:
-                    img_data = xl_img._data()
-                    ext = Path(xl_img.path).suffix if hasattr(xl_img, "path") else ".png"
-                    if not ext:
-                        ext = ".png"
-                    img_counter += 1
-                    saved = _save_image(img_data, ext, images_dir, f"{sheet_name}_img", img_counter)
-                    rel_path = f"{rel_base}/{saved.name}"
-
-                    if not _is_meaningful_image(img_data):
-                        print(f"\n    [SKIP] {saved.name} (아이콘/장식)", flush=True)
-                        lines.append(f"![아이콘]({rel_path})\n")
-                        continue
-
-                    ct = _content_type_from_ext(ext)
-                    print(f"\n    [VLM] {saved.name} 분석 중...", end="", flush=True)
-                    desc = describe_image(img_data, ct)
-                    print(" 완료", flush=True)
-
-                    lines.extend(_image_markdown(rel_path, desc))
-                except Exception:
-                    pass
 
-        # 테이블 데이터
-        rows = []
-        for row in ws.iter_rows(values_only=True):
-            cells = [str(cell) if cell is not None else "" for cell in row]
-            if all(c == "" for c in cells):
+def _zip_rels(zf: zipfile.ZipFile, part: str) -> dict[str, tuple[str, str]]:
+    """OOXML part의 관계 파일을 읽어 {rId: (관계 타입, 대상 part 경로)} 반환."""
+    folder, name = posixpath.split(part)
+    try:
+        root = ET.fromstring(zf.read(posixpath.join(folder, "_rels", name + ".rels")))
+    except KeyError:
+        return {}
+    rels = {}
+    for rel in root.iter(f"{_NS_PKG_REL}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target", "")
+        path = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(folder, target))
+        rels[rel.get("Id")] = (rel.get("Type", ""), path)
+    return rels
+
+
+def _xlsx_sheet_images(zf: zipfile.ZipFile) -> dict[str, list[str]]:
+    """시트 이름 → 이미지 part 경로 목록 (드로잉 순서).
+
+    읽기 전용 모드의 워크시트는 이미지를 로드하지 않으므로 zip의 관계 파일을 직접 따라감.
+    """
+    result = {}
+    wb_rels = _zip_rels(zf, "xl/workbook.xml")
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    for sheet in workbook.iter(f"{_NS_MAIN}sheet"):
+        _, sheet_part = wb_rels.get(sheet.get(f"{_NS_REL}id"), ("", ""))
+        parts = []
+        for rel_type, drawing_part in _zip_rels(zf, sheet_part).values():
+            if not rel_type.endswith("/drawing"):
                 continue
-            rows.append(cells)
-
-        if not rows:
-            lines.append("*(빈 시트)*\n")
+            drawing_rels = _zip_rels(zf, drawing_part)
+            for blip in ET.fromstring(zf.read(drawing_part)).iter(f"{_NS_DRAWING}blip"):
+                rel = drawing_rels.get(blip.get(f"{_NS_REL}embed"))
+                if rel:
+                    parts.append(rel[1])
+        if parts:
+            result[sheet.get("name")] = parts
+    return result
+
+
+def _sample_sheets(names: list[str], max_sheets: int | None) -> list[str]:
+    """시트 목록에서 max_sheets개를 처음~끝까지 고르게 선택."""
+    if not max_sheets or max_sheets >= len(names):
+        return names
+    if max_sheets == 1:
+        return names[:1]
+    step = (len(names) - 1) / (max_sheets - 1)
+    return [names[round(i * step)] for i in range(max_sheets)]
+
+
+def xlsx_to_markdown(filepath: Path, images: DocumentImages, writer: MarkdownWriter,
+                     limits: XlsxLimits | None = None):
+    """Excel 파일을 Markdown으로 변환하여 writer에 기록 (이미지 포함).
+
+    읽기 전용 모드로 행을 하나씩 읽어 바로 기록하므로 시트 크기와 관계없이 메모리 사용이 일정.
+    """
+    limits = limits or XlsxLimits()
+    wb = load_workbook(str(filepath), read_only=True, data_only=True)
+    try:
+        with zipfile.ZipFile(filepath) as zf:
+            sheet_images = _xlsx_sheet_images(zf)
+            sheet_names = _sample_sheets(wb.sheetnames, limits.max_sheets)
+
+            writer.line(f"# {filepath.stem}\n")
+            if len(sheet_names) < len(wb.sheetnames):
+                writer.line(f"*(시트 {len(wb.sheetnames)}개 중 {len(sheet_names)}개만 변환)*\n")
+
+            for sheet_name in sheet_names:
+                writer.section(sheet=sheet_name)
+                writer.line(f"## {sheet_name}\n")
+
+                # 시트 내 이미지
+                for part in sheet_images.get(sheet_name, []):
+                    try:
+                        ext = posixpath.splitext(part)[1] or ".png"
+                        writer.image(*images.add(zf.read(part), ext, f"{sheet_name}_img"))
+                    except Exception:
+                        pass
+
+                # 테이블 데이터
+                _write_sheet_table(wb[sheet_name], writer, limits)
+    finally:
+        wb.close()
+
+
+def _write_sheet_table(ws, writer: MarkdownWriter, limits: XlsxLimits):
+    """시트 행을 읽는 즉시 Markdown 테이블 행으로 기록.
+
+    열 수는 dimension 정보(없으면 첫 행)로 정하고, dimension이 없거나 오래되어 더 넓은 행이 나오면
+    헤더 열 수로 잘라 테이블 구조를 유지 (잘린 경우 안내 문구 출력).
+    """
+    width = ws.max_column or 0  # dimension 정보 (없으면 첫 행 기준)
+    total_rows = ws.max_row
+    if hasattr(ws, "reset_dimensions"):
+        ws.reset_dimensions()  # read-only: 오래된 dimension으로 iter_rows가 열을 조용히 자르지 않도록
+    if limits.max_cols:
+        width = min(width, limits.max_cols) if width else limits.max_cols
+    rows_written = 0
+    clipped = 0  # 헤더보다 열이 많아 잘린 행 수
+    for row in ws.iter_rows(values_only=True):
+        cells = [str(cell) if cell is not None else "" for cell in row]
+        if all(c == "" for c in cells):
             continue
-
-        max_cols = max(len(r) for r in rows)
-        for row in rows:
-            while len(row) < max_cols:
-                row.append("")
-
-        lines.append("| " + " | ".join(rows[0]) + " |")
-        lines.append("| " + " | ".join(["---"] * max_cols) + " |")
-        for row in rows[1:]:
-            escaped = [c.replace("|", "\\|") for c in row]
-            lines.append("| " + " | ".join(escaped) + " |")
-        lines.append("")
-
-    return "\n".join(lines)
+        if limits.max_cols:
+            cells = cells[:limits.max_cols]
+        if rows_written == 0:
+            width = max(width, len(cells))
+            cells += [""] * (width - len(cells))
+            writer.table_header([c.replace("|", "\\|") for c in cells])
+        else:
+            if limits.max_rows is not None and rows_written > limits.max_rows:
+                writer.line("")
+                total = f", 시트 전체 {total_rows:,}행" if total_rows else ""
+                writer.line(f"*(최대 {limits.max_rows:,}행까지만 표시{total})*")
+                break
+            if len(cells) > width and any(cells[width:]):
+                clipped += 1
+            cells = (cells + [""] * (width - len(cells)))[:width]
+            writer.table_row([c.replace("|", "\\|") for c in cells])
+        rows_written += 1
+
+    if clipped:
+        writer.line("")
+        writer.line(f"*({clipped:,}개 행이 {width}열을 넘어 {width}열까지만 표시)*")
+    if rows_written == 0:
+        writer.line("*(빈 시트)*\n")
+    else:
+        writer.line("")
 
 
 # ---------------------------------------------------------------------------
@@ -526,42 +1494,275 @@ CONVERTERS = {
 }
 
 
+@dataclass
+class ConvertResult:
+    """문서 1개 변환 결과 (프로세스 풀에서 반환)."""
+    name: str
+    out_name: str = ""
+    images: int = 0
+    tables: int = 0
+    chunks: int = 0            # JSONL 청크 수
+    bytes: int = 0             # 출력 파일 크기 합계
+    cached_images: int = 0     # 설명 캐시 적중 수
+    duplicate_images: int = 0  # 중복 제거된 이미지 수
+    error: str | None = None
+    elapsed: float = 0.0
+    sha256: str = ""                                   # 원본 내용 해시
+    outputs: list[str] = field(default_factory=list)  # 생성한 파일 (output_dir 기준 상대 경로)
+
+
+OUTPUT_FORMATS = ("md", "jsonl", "both")
+
+
+@dataclass
+class ConvertOptions:
+    """문서 변환 옵션 (프로세스 풀 워커에 그대로 전달)."""
+    xlsx_limits: XlsxLimits = field(default_factory=XlsxLimits)
+    output_format: str = "md"  # md: {stem}.md, jsonl: {stem}.jsonl 청크, both: 둘 다
+    chunk_tokens: int = CHUNK_MAX_TOKENS
+
+
+def _open_writer(filepath: Path, output_dir: Path, options: ConvertOptions) -> MarkdownWriter | TeeWriter:
+    """출력 형식에 맞는 싱크 생성."""
+    writers = []
+    if options.output_format in ("md", "both"):
+        writers.append(MarkdownWriter(output_dir / (filepath.stem + ".md")))
+    if options.output_format in ("jsonl", "both"):
+        writers.append(ChunkWriter(output_dir / (filepath.stem + ".jsonl"), filepath.name, options.chunk_tokens))
+    return writers[0] if len(writers) == 1 else TeeWriter(*writers)
+
+
+def convert_file(filepath: Path, output_dir: Path, options: ConvertOptions | None = None) -> ConvertResult:
+    """문서 1개를 변환하여 {stem}.md (또는 {stem}.jsonl)로 저장. 예외는 결과에 담아 반환."""
+    options = options or ConvertOptions()
+    start = time.perf_counter()
+    hits_before = _vlm_queue.cache_hits
+    try:
+        ext = filepath.suffix.lower()
+        images = DocumentImages(output_dir, filepath.stem)
+        with _open_writer(filepath, output_dir, options) as writer:
+            if ext == ".xlsx":
+                xlsx_to_markdown(filepath, images, writer, options.xlsx_limits)
+            else:
+                CONVERTERS[ext](filepath, images, writer)
+        names = [w.path.name for w in getattr(writer, "writers", (writer,))]
+        return ConvertResult(filepath.name, ", ".join(names), writer.images, writer.tables,
+                             getattr(writer, "chunks", 0), writer.bytes, _vlm_queue.cache_hits - hits_before,
+                             duplicate_images=images.duplicates, elapsed=time.perf_counter() - start,
+                             sha256=_file_sha256(filepath), outputs=[*names, *sorted(images.outputs)])
+    except Exception as e:
+        return ConvertResult(filepath.name, error=str(e), elapsed=time.perf_counter() - start)
+
+
+# ---------------------------------------------------------------------------
+# 증분 변환 (manifest)
+# ---------------------------------------------------------------------------
+
+# 변환기 버전: 이 파일의 내용 해시. 변환 로직이 바뀌면 모든 문서를 다시 변환
+CONVERTER_VERSION = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+MANIFEST_NAME = ".convert-manifest.json"
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir: Path) -> dict:
+    """output_dir의 manifest 로드 (없거나 손상되면 빈 manifest)."""
+    try:
+        manifest = json.loads((output_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+        if isinstance(manifest.get("files"), dict):
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {"files": {}}
+
+
+def save_manifest(output_dir: Path, manifest: dict):
+    """manifest를 임시 파일 + rename으로 원자적으로 저장."""
+    path = output_dir / MANIFEST_NAME
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _converter_key(filepath: Path, options: ConvertOptions) -> str:
+    """manifest에 기록할 변환기 버전 (출력 형식, xlsx 상한 옵션이 바뀌면 다시 변환되도록 포함)."""
+    key = CONVERTER_VERSION
+    if options.output_format != "md":
+        key += f":{options.output_format},{options.chunk_tokens}"
+    limits = options.xlsx_limits
+    if filepath.suffix.lower() == ".xlsx" and limits != XlsxLimits():
+        key += f":{limits.max_rows},{limits.max_cols},{limits.max_sheets}"
+    return key
+
+
+def _is_unchanged(filepath: Path, entry: dict | None, output_dir: Path, converter: str = CONVERTER_VERSION) -> bool:
+    """원본과 출력이 manifest 기록과 같은지 확인.
+
+    크기/mtime이 같으면 해시 없이 통과, mtime만 바뀌었으면 내용 해시로 재확인.
+    """
+    if not entry or entry.get("converter") != converter:
+        return False
+    if not all((output_dir / out).exists() for out in entry.get("outputs", [])):
+        return False
+    stat = filepath.stat()
+    if stat.st_size != entry.get("size"):
+        return False
+    if stat.st_mtime_ns == entry.get("mtime_ns"):
+        return True
+    if _file_sha256(filepath) == entry.get("sha256"):
+        entry["mtime_ns"] = stat.st_mtime_ns  # 내용은 같고 mtime만 변경 (touch, 복사 등)
+        return True
+    return False
+
+
+def _remove_outputs(output_dir: Path, outputs: list[str], keep: set[str] = frozenset()):
+    """manifest에 기록된 출력 파일 삭제 (keep: 다른 문서가 참조하는 공유 이미지, 비게 된 디렉토리도 삭제)."""
+    dirs = set()
+    for out in outputs:
+        if out in keep:
+            continue
+        path = output_dir / out
+        path.unlink(missing_ok=True)
+        if path.parent != output_dir:
+            dirs.add(path.parent)
+    for d in dirs:
+        try:
+            d.rmdir()
+        except OSError:
+            pass  # 다른 파일이 남아 있음
+
+
+def _print_result(result: ConvertResult):
+    if result.error is not None:
+        print(f"오류: {result.error}")
+    else:
+        chunks = f"청크 {result.chunks}개, " if result.chunks else ""
+        print(f"-> {result.out_name} (이미지 {result.images}개, 테이블 {result.tables}개, {chunks}"
+              f"{result.bytes / 1024:,.1f}KB, {result.elapsed:.1f}초)")
+
+
 def main():
     base_dir = Path(__file__).resolve().parent.parent
-    input_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else base_dir / "resources" / "references"
-    output_dir = Path(sys.argv[2]) if len(sys.argv) > 2 else base_dir / "resources" / "references" / "markdown"
+    parser = argparse.ArgumentParser(description="Office 문서(pptx, docx, xlsx)를 Markdown으로 변환")
+    parser.add_argument("input_dir", nargs="?", type=Path, default=base_dir / "resources" / "references",
+                        help="입력 디렉토리 (기본값: resources/references)")
+    parser.add_argument("output_dir", nargs="?", type=Path, default=None,
+                        help="출력 디렉토리 (기본값: resources/references/markdown)")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="동시에 변환할 프로세스 수 (기본값: 1, 0이면 CPU 코어 수)")
+    parser.add_argument("--vlm-concurrency", type=int, default=VLM_CONCURRENCY,
+                        help=f"프로세스당 동시 VLM 요청 수 (기본값: {VLM_CONCURRENCY}, VLM_CONCURRENCY)")
+    parser.add_argument("--vlm-rpm", type=float, default=GROQ_RPM,
+                        help=f"전체 VLM 분당 요청 한도 (기본값: {GROQ_RPM:g}, GROQ_RPM)")
+    parser.add_argument("--no-vlm-cache", action="store_true",
+                        help=f"이미지 설명 캐시 사용 안 함 (캐시 위치: {VLM_CACHE_DIR})")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="md",
+                        help="출력 형식: md, jsonl(임베딩용 청크), both (기본값: md)")
+    parser.add_argument("--chunk-tokens", type=int, default=CHUNK_MAX_TOKENS,
+                        help=f"JSONL 청크당 최대 토큰 수 (기본값: {CHUNK_MAX_TOKENS})")
+    parser.add_argument("--xlsx-max-rows", type=int, help="xlsx 시트당 최대 데이터 행 수 (기본값: 제한 없음)")
+    parser.add_argument("--xlsx-max-cols", type=int, help="xlsx 최대 열 수 (기본값: 제한 없음)")
+    parser.add_argument("--xlsx-max-sheets", type=int,
+                        help="xlsx에서 변환할 시트 수, 처음~끝에서 고르게 선택 (기본값: 전체)")
+    parser.add_argument("--incremental", "-i", action="store_true",
+                        help=f"변경된 문서만 변환하고 삭제된 문서의 출력 제거 ({MANIFEST_NAME} 기준)")
+    args = parser.parse_args()
+
+    input_dir = args.input_dir
+    output_dir = args.output_dir or base_dir / "resources" / "references" / "markdown"
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    options = ConvertOptions(XlsxLimits(args.xlsx_max_rows, args.xlsx_max_cols, args.xlsx_max_sheets),
+                             args.format, args.chunk_tokens)
 
     output_dir.mkdir(parents=True, exist_ok=True)
+    if not args.no_vlm_cache:
+        _description_cache.prune()  # 만료/초과 항목 정리 (실행당 1회)
 
     if not os.environ.get("GROQ_API_KEY"):
         print("경고: GROQ_API_KEY가 설정되지 않았습니다. 이미지 설명이 생략됩니다.\n")
 
-    files = sorted(input_dir.iterdir())
-    converted = 0
-    errors = []
-    total_images = 0
-
+    files = [f for f in sorted(input_dir.iterdir()) if f.suffix.lower() in CONVERTERS]
+    start = time.perf_counter()
+    results: list[ConvertResult] = []
+
+    manifest = load_manifest(output_dir)
+    entries: dict[str, dict] = manifest["files"]
+    skipped = 0
+    removed = []
+    if args.incremental:
+        sources = {f.name for f in files}
+        removed = [name for name in entries if name not in sources]
+        files = [f for f in files
+                 if not _is_unchanged(f, entries.get(f.name), output_dir, _converter_key(f, options))]
+        skipped = len(sources) - len(files)
+    # 삭제된 원본과 다시 변환할 문서의 이전 출력 정리 (다른 문서가 참조하는 공유 이미지는 유지)
+    stale = set(removed) | {f.name for f in files}
+    keep = {out for name, entry in entries.items() if name not in stale for out in entry.get("outputs", [])}
+    for name in removed:
+        _remove_outputs(output_dir, entries.pop(name).get("outputs", []), keep)
+        print(f"삭제: {name} (원본 없음, 출력 제거)")
+    stats = {}
     for f in files:
-        ext = f.suffix.lower()
-        if ext not in CONVERTERS:
+        if f.name in entries:
+            _remove_outputs(output_dir, entries[f.name].get("outputs", []), keep)
+        stats[f.name] = f.stat()
+
+    if jobs == 1 or len(files) < 2:
+        configure_vlm(args.vlm_concurrency, args.vlm_rpm, not args.no_vlm_cache)
+        for f in files:
+            print(f"변환 중: {f.name} ...", end=" ", flush=True)
+            result = convert_file(f, output_dir, options)
+            _print_result(result)
+            results.append(result)
+    else:
+        jobs = min(jobs, len(files))
+        print(f"{len(files)}개 문서를 {jobs}개 프로세스로 변환합니다.\n")
+        slots: list[ConvertResult | None] = [None] * len(files)
+        # 분당 요청 한도는 프로세스 수로 나누어 배분 (전체 합이 한도를 넘지 않도록)
+        with ProcessPoolExecutor(max_workers=jobs, initializer=configure_vlm,
+                                 initargs=(args.vlm_concurrency, args.vlm_rpm / jobs, not args.no_vlm_cache)) as pool:
+            futures = {pool.submit(convert_file, f, output_dir, options): i for i, f in enumerate(files)}
+            for done, future in enumerate(as_completed(futures), 1):
+                i = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:  # 워커 프로세스 비정상 종료 등
+                    result = ConvertResult(files[i].name, error=str(e))
+                slots[i] = result
+                print(f"[{done}/{len(files)}] {result.name} ", end="", flush=True)
+                _print_result(result)
+        results = slots  # 완료 순서와 무관하게 입력(정렬) 순서 유지
+
+    for r in results:
+        if r.error is not None:
+            entries.pop(r.name, None)  # 다음 실행에서 다시 시도
             continue
-
-        print(f"변환 중: {f.name} ...", end=" ", flush=True)
-        try:
-            md_content = CONVERTERS[ext](f, output_dir)
-            out_path = output_dir / (f.stem + ".md")
-            out_path.write_text(md_content, encoding="utf-8")
-
-            # 이미지 수 카운트
-            img_count = md_content.count("![이미지]")
-            total_images += img_count
-            print(f"-> {out_path.name} (이미지 {img_count}개)")
-            converted += 1
-        except Exception as e:
-            print(f"오류: {e}")
-            errors.append((f.name, str(e)))
-
-    print(f"\n완료: {converted}개 문서 변환, 총 이미지 {total_images}개 처리, {len(errors)}개 오류")
+        entries[r.name] = {
+            "size": stats[r.name].st_size,
+            "mtime_ns": stats[r.name].st_mtime_ns,
+            "sha256": r.sha256,
+            "converter": _converter_key(Path(r.name), options),
+            "outputs": r.outputs,
+        }
+    manifest["converter"] = CONVERTER_VERSION
+    save_manifest(output_dir, manifest)
+
+    converted = [r for r in results if r.error is None]
+    errors = [(r.name, r.error) for r in results if r.error is not None]
+    total_images = sum(r.images for r in converted)
+    cached_images = sum(r.cached_images for r in converted)
+    duplicate_images = sum(r.duplicate_images for r in converted)
+
+    print(f"\n완료: {len(converted)}개 문서 변환, 총 이미지 {total_images}개 처리 (캐시 {cached_images}개, 중복 {duplicate_images}개), "
+          f"{len(errors)}개 오류 ({time.perf_counter() - start:.1f}초)")
+    if args.incremental:
+        print(f"증분 변환: 변경 없음 {skipped}개 건너뜀, 삭제된 원본 {len(removed)}개 출력 제거")
     if errors:
         print("\n오류 목록:")
         for name, err in errors:
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""convert-to-markdown JSONL 청크 테스트 - 예산을 넘는 긴 문단/제목이 --chunk-tokens 이내로 나뉘는지 확인
+
+Usage:
+    python test_convert_to_markdown.py   (또는 pytest)
+"""
+import importlib.util
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from docx import Document
+
+_spec = importlib.util.spec_from_file_location(
+    "convert_to_markdown", Path(__file__).parent / "convert-to-markdown.py"
+)
+c2m = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(c2m)
+
+
+def _convert_chunks(doc: Document, chunk_tokens: int) -> list[dict]:
+    """문서를 jsonl로 변환하여 청크 레코드 목록 반환"""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / "doc.docx"
+        out = Path(tmp) / "out"
+        out.mkdir()
+        doc.save(str(src))
+        result = c2m.convert_file(src, out, c2m.ConvertOptions(output_format="jsonl", chunk_tokens=chunk_tokens))
+        assert result.error is None, result.error
+        with open(out / "doc.jsonl", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+
+def _assert_within_budget(records: list[dict], chunk_tokens: int):
+    assert [r["chunk"] for r in records] == list(range(1, len(records) + 1))
+    for r in records:
+        assert r["tokens"] <= chunk_tokens, (r["chunk"], r["tokens"])
+        assert c2m.count_tokens(r["text"]) <= chunk_tokens, (r["chunk"], c2m.count_tokens(r["text"]))
+
+
+def test_long_paragraph_split():
+    """예산을 크게 넘는 문단 1개 (약 3,000단어)"""
+    doc = Document()
+    doc.add_heading("긴 문단", level=1)
+    words = [f"word{i}" for i in range(3000)]
+    doc.add_paragraph(" ".join(words))
+    records = _convert_chunks(doc, 200)
+
+    assert len(records) > 1
+    _assert_within_budget(records, 200)
+    text = " ".join(r["text"] for r in records)
+    assert all(f"word{i}" in text for i in (0, 1500, 2999))  # 내용 누락 없음
+
+
+def test_heading_counted_in_budget():
+    """본문 없이 이어진 제목 줄과 첫 문단의 합이 예산을 넘는 경우"""
+    doc = Document()
+    for i in range(3):
+        doc.add_heading(f"제목 {i} " + "가" * 20, level=1)
+    doc.add_paragraph("본문 " * 50)
+    doc.add_paragraph("다음 문단")
+    _assert_within_budget(_convert_chunks(doc, 120), 120)
+
+
+if __name__ == "__main__":
+    failed = 0
+    for name, func in list(globals().items()):
+        if name.startswith("test_") and callable(func):
+            try:
+                func()
+                print(f"[OK] {name}")
+            except AssertionError as e:
+                failed += 1
+                print(f"[FAIL] {name}: {e}")
+    sys.exit(1 if failed else 0)
@@ -2,7 +2,8 @@
 """YouTube Search CLI - YouTube Data API v3 기반 YouTube 검색 + 자막 추출 도구
 
 사용법:
-  python youtube_search.py <question> [--max-results N] [--days N] [--chunk-seconds N]
+  python youtube_search.py <question> [--max-results N] [--days N] [--chunk-seconds N] [--no-cache]
+  python youtube_search.py --serve [--concurrency N]   (stdin JSON Lines 서비스 모드)
 
 예시:
   python youtube_search.py "파이썬 머신러닝"
@@ -10,12 +11,19 @@
   python youtube_search.py "LLM 강의" -n 10 -d 7 -c 60
 """
 import argparse
+import heapq
 import json
+import math
 import os
 import re
+import sqlite3
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import NamedTuple
 
 # Windows 콘솔 UTF-8 출력 지원
 import io
@@ -35,6 +43,7 @@ except ImportError:
     pass
 
 try:
+    import httplib2
     from googleapiclient.discovery import build
 except ImportError:
     print("오류: google-api-python-client가 설치되지 않았습니다.", file=sys.stderr)
@@ -42,13 +51,165 @@ except ImportError:
     sys.exit(1)
 
 try:
-    from youtube_transcript_api import YouTubeTranscriptApi
+    from youtube_transcript_api import (
+        NoTranscriptFound,
+        TranscriptsDisabled,
+        VideoUnavailable,
+        YouTubeTranscriptApi,
+    )
 except ImportError:
     print("오류: youtube-transcript-api가 설치되지 않았습니다.", file=sys.stderr)
     print("설치: pip install youtube-transcript-api", file=sys.stderr)
     sys.exit(1)
 
 CHUNK_SIZE_SECONDS = 120
+CHUNK_OVERLAP_TOKENS = 40  # 토큰 예산 청킹 시 앞 청크와 겹치는 분량
+PAUSE_SECONDS = 1.0        # 다음 자막까지 이 이상 비면 문장 경계로 간주
+CHUNK_HARD_LIMIT = 1.5     # 경계를 못 찾으면 예산의 1.5배에서 자름
+TRANSCRIPT_WORKERS = 8  # 동시 자막 로드 수
+SERVE_CONCURRENCY = 4   # 서비스 모드 동시 처리 질의 수
+SEARCH_LANGUAGE = "ko"
+TRANSCRIPT_LANGUAGES = ["ko", "en", "ko-KR", "en-US"]  # 한국어 우선, 없으면 영어 자막
+
+# 로컬 캐시 (검색 결과 / 자막 원본 세그먼트)
+CACHE_PATH = Path(os.path.expanduser(
+    os.environ.get("YOUTUBE_SEARCH_CACHE", "~/.cache/youtube-search/cache.sqlite3")
+))
+SEARCH_CACHE_TTL_HOURS = float(os.environ.get("YOUTUBE_SEARCH_CACHE_TTL_HOURS", "24"))
+TRANSCRIPT_CACHE_TTL_DAYS = float(os.environ.get("YOUTUBE_TRANSCRIPT_CACHE_TTL_DAYS", "30"))
+
+# BM25 파라미터
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+class Segment(NamedTuple):
+    """자막 세그먼트 (youtube-transcript-api 스니펫과 같은 필드)"""
+    text: str
+    start: float
+    duration: float
+
+
+class SearchCache:
+    """
+    검색 결과와 자막 세그먼트를 저장하는 SQLite 캐시
+
+    - 검색 결과: (질문, 기간, 언어, 후보 수) 키, search_ttl 초 후 만료 (API 할당량 절약)
+    - 자막 세그먼트: (video_id, 자막 언어) 키, transcript_ttl 초 후 만료.
+      청킹 전 원본을 저장하므로 --chunk-seconds를 바꿔도 네트워크 요청 없이 다시 청킹함.
+      자막 없는 영상도 검색 결과 TTL 동안 기록하여 반복 조회를 건너뜀.
+    - 만료 항목은 열 때 삭제
+    """
+
+    def __init__(
+        self,
+        path: Path = CACHE_PATH,
+        search_ttl: float = SEARCH_CACHE_TTL_HOURS * 3600,
+        transcript_ttl: float = TRANSCRIPT_CACHE_TTL_DAYS * 86400,
+    ):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.search_ttl = search_ttl
+        self.transcript_ttl = transcript_ttl
+        self._lock = threading.Lock()  # 자막 로드 스레드가 함께 사용
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")  # 여러 프로세스가 동시에 읽기
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS search (
+                key TEXT PRIMARY KEY, items TEXT NOT NULL, created REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS segments (
+                video_id TEXT NOT NULL, languages TEXT NOT NULL,
+                segments TEXT, created REAL NOT NULL,
+                PRIMARY KEY (video_id, languages)
+            );
+        """)
+        self.evict()
+
+    def evict(self):
+        """만료된 항목 삭제 (자막 없음 기록은 검색 결과 TTL 기준)"""
+        now = time.time()
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM search WHERE created < ?", (now - self.search_ttl,))
+            self._db.execute(
+                "DELETE FROM segments WHERE created < ? OR (segments IS NULL AND created < ?)",
+                (now - self.transcript_ttl, now - self.search_ttl),
+            )
+
+    @staticmethod
+    def search_key(question: str, days: int, language: str, fetch_count: int) -> str:
+        return json.dumps([question.strip(), days, language, fetch_count], ensure_ascii=False)
+
+    def get_search(self, key: str) -> list[dict] | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT items FROM search WHERE key = ? AND created >= ?",
+                (key, time.time() - self.search_ttl),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_search(self, key: str, items: list[dict]):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO search VALUES (?, ?, ?)",
+                (key, json.dumps(items, ensure_ascii=False), time.time()),
+            )
+
+    def get_segments(self, video_id: str, languages: list[str]) -> list[Segment] | None:
+        """캐시된 세그먼트 (자막 없음으로 기록된 영상은 빈 리스트, 캐시 없음은 None)"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT segments, created FROM segments WHERE video_id = ? AND languages = ?",
+                (video_id, ",".join(languages)),
+            ).fetchone()
+        if row is None:
+            return None
+        data, created = row
+        ttl = self.transcript_ttl if data is not None else self.search_ttl
+        if created < time.time() - ttl:
+            return None
+        return [Segment(*seg) for seg in json.loads(data)] if data is not None else []
+
+    def put_segments(self, video_id: str, languages: list[str], segments: list[Segment] | None):
+        """세그먼트 저장 (None이면 자막 없음으로 기록)"""
+        data = json.dumps([list(seg) for seg in segments], ensure_ascii=False) if segments is not None else None
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?)",
+                (video_id, ",".join(languages), data, time.time()),
+            )
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_youtube = None
+_youtube_lock = threading.Lock()
+_local = threading.local()  # 스레드별 HTTP 연결 / 자막 API 인스턴스
+
+
+def _youtube_client(api_key: str):
+    """YouTube Data API 클라이언트 (프로세스당 1회 생성, 서비스 모드에서 재사용)"""
+    global _youtube
+    with _youtube_lock:
+        if _youtube is None:
+            _youtube = build("youtube", "v3", developerKey=api_key)
+        return _youtube
+
+
+def _thread_http() -> httplib2.Http:
+    """현재 스레드 전용 HTTP 연결 (httplib2.Http는 스레드 간 공유 불가)"""
+    if not hasattr(_local, "http"):
+        _local.http = httplib2.Http()
+    return _local.http
+
+
+def _transcript_api() -> YouTubeTranscriptApi:
+    """현재 스레드 전용 자막 API 인스턴스 (세션 연결 재사용)"""
+    if not hasattr(_local, "transcript_api"):
+        # v1.x: 인스턴스 기반 fetch
+        _local.transcript_api = YouTubeTranscriptApi()
+    return _local.transcript_api
 
 
 def extract_video_id(url: str) -> str | None:
@@ -90,29 +251,66 @@ def _make_chunk(video_id: str, start_seconds: float, text: str) -> dict:
     }
 
 
-def load_transcript(video_id: str, chunk_size_seconds: int = CHUNK_SIZE_SECONDS) -> list[dict]:
+def fetch_segments(video_id: str, cache: SearchCache | None = None) -> list[Segment]:
+    """
+    YouTube 영상의 자막 세그먼트 로드 (캐시 우선)
+
+    자막이 없는 영상(NoTranscriptFound, TranscriptsDisabled, VideoUnavailable)만 캐시에 "자막 없음"으로
+    기록하고, 네트워크 오류/요청 차단/타임아웃 등 일시적 오류는 캐시하지 않아 다음 실행에서 다시 시도함.
+
+    Returns:
+        세그먼트 리스트. 자막이 없거나 로드에 실패하면 빈 리스트
+    """
+    if cache is not None:
+        cached = cache.get_segments(video_id, TRANSCRIPT_LANGUAGES)
+        if cached is not None:
+            return cached
+
+    try:
+        fetched = _transcript_api().fetch(video_id, languages=TRANSCRIPT_LANGUAGES)
+        segments = [Segment(seg.text, seg.start, seg.duration) for seg in fetched]
+    except (NoTranscriptFound, TranscriptsDisabled, VideoUnavailable):
+        segments = []
+    except Exception:
+        return []  # 일시적 오류: 캐시하지 않음
+
+    if cache is not None:
+        cache.put_segments(video_id, TRANSCRIPT_LANGUAGES, segments or None)
+    return segments
+
+
+def load_transcript(
+    video_id: str,
+    chunk_size_seconds: int = CHUNK_SIZE_SECONDS,
+    cache: SearchCache | None = None,
+    chunk_tokens: int = 0,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+) -> list[dict]:
     """
-    YouTube 영상의 자막을 로드하고 타임스탬프 기반으로 청킹
+    YouTube 영상의 자막을 로드하고 청킹
 
     Args:
         video_id: YouTube 동영상 ID
         chunk_size_seconds: 청크 크기 (초 단위, 기본값 120초)
+        cache: 자막 세그먼트 캐시 (None이면 매번 다운로드)
+        chunk_tokens: 0보다 크면 시간 대신 토큰 예산 기반 문장 단위로 청킹 (chunk_by_tokens)
+        overlap_tokens: 토큰 예산 청킹 시 앞 청크와 겹치는 토큰 수 (기본값 40)
 
     Returns:
         청크 리스트. 각 항목: {text, start_seconds, timestamp, timestamp_url}
+        (토큰 예산 청킹은 end_seconds, tokens 추가)
     """
-    try:
-        # v1.x: 인스턴스 기반 fetch (한국어 우선, 없으면 영어 자막)
-        api = YouTubeTranscriptApi()
-        fetched = api.fetch(video_id, languages=["ko", "en", "ko-KR", "en-US"])
-        segments = list(fetched)
-    except Exception:
-        return []
+    segments = fetch_segments(video_id, cache)
+    if chunk_tokens > 0:
+        return chunk_by_tokens(video_id, segments, chunk_tokens, overlap_tokens)
+    return chunk_by_time(video_id, segments, chunk_size_seconds)
 
+
+def chunk_by_time(video_id: str, segments: list[Segment], chunk_size_seconds: int = CHUNK_SIZE_SECONDS) -> list[dict]:
+    """자막 세그먼트를 chunk_size_seconds 단위로 청킹"""
     if not segments:
         return []
 
-    # chunk_size_seconds 단위로 청킹
     chunks = []
     current_texts: list[str] = []
     current_start: float = segments[0].start
@@ -141,18 +339,193 @@ def load_transcript(video_id: str, chunk_size_seconds: int = CHUNK_SIZE_SECONDS)
     return chunks
 
 
+_SENTENCE_END = re.compile(r"(?:[.?!。？！…]|습니다|니다|어요|아요|예요|에요|해요|죠)[\"')\]]*$")
+_WIDE_CHAR = re.compile(r"[\u1100-\u11ff\u3040-\u30ff\u3130-\u318f\u4e00-\u9fff\uac00-\ud7af]")
+
+
+def estimate_tokens(text: str) -> int:
+    """토큰 수 추정 (한글/한자/가나는 글자당 1, 나머지는 4글자당 1)"""
+    wide = len(_WIDE_CHAR.findall(text))
+    return wide + (len(text) - wide + 3) // 4
+
+
+def chunk_by_tokens(
+    video_id: str,
+    segments: list[Segment],
+    chunk_tokens: int,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
+) -> list[dict]:
+    """
+    토큰 예산 기반 문장 단위 청킹 (세그먼트를 한 번만 순회)
+
+    - 누적 토큰이 chunk_tokens 이상이 된 뒤 처음 만나는 문장 끝(문장부호/종결어미)
+      또는 쉼(다음 자막까지 PAUSE_SECONDS 이상)에서 청크를 닫음
+    - 경계 없이 chunk_tokens × CHUNK_HARD_LIMIT를 넘으면 마지막 경계(없으면 현재 위치)에서 자름
+    - 다음 청크는 직전 청크 끝의 세그먼트를 overlap_tokens 이내로 겹쳐서 시작
+
+    Returns:
+        청크 리스트. 각 항목: {text, start_seconds, timestamp, timestamp_url, end_seconds, tokens}
+    """
+    overlap_tokens = min(overlap_tokens, chunk_tokens // 2)
+    chunks = []
+    current: list[tuple[Segment, str, int]] = []  # (세그먼트, 정리된 텍스트, 토큰 수)
+    total = 0
+    carried = 0        # current 앞부분 중 이전 청크와 겹치는 세그먼트 수
+    last_boundary = 0  # current 안에서 마지막 경계 바로 뒤 위치
+
+    def emit(end: int):
+        nonlocal current, total, carried, last_boundary
+        body = current[:end]
+        last = body[-1][0]
+        chunk = _make_chunk(video_id, body[0][0].start, " ".join(text for _, text, _ in body))
+        chunk["end_seconds"] = int(last.start + last.duration)
+        chunk["tokens"] = sum(tokens for *_, tokens in body)
+        chunks.append(chunk)
+
+        # 끝부분 세그먼트를 overlap_tokens 이내로 다음 청크에 겹침
+        overlap: list[tuple[Segment, str, int]] = []
+        size = 0
+        for item in reversed(body):
+            if size + item[2] > overlap_tokens:
+                break
+            overlap.append(item)
+            size += item[2]
+        overlap.reverse()
+        current = overlap + current[end:]
+        total = sum(tokens for *_, tokens in current)
+        carried = len(overlap)
+        last_boundary = 0
+
+    for i, seg in enumerate(segments):
+        text = " ".join(seg.text.split())
+        if not text:
+            continue
+        tokens = estimate_tokens(text)
+        current.append((seg, text, tokens))
+        total += tokens
+
+        next_start = segments[i + 1].start if i + 1 < len(segments) else None
+        is_boundary = (
+            next_start is None
+            or next_start - (seg.start + seg.duration) >= PAUSE_SECONDS
+            or _SENTENCE_END.search(text) is not None
+        )
+        if is_boundary:
+            last_boundary = len(current)
+
+        if total >= chunk_tokens and is_boundary:
+            emit(len(current))
+        elif total >= chunk_tokens * CHUNK_HARD_LIMIT:
+            emit(last_boundary if last_boundary > carried else len(current))
+
+    # 마지막 청크 (겹친 세그먼트 외에 새 내용이 있을 때만)
+    if len(current) > carried:
+        emit(len(current))
+
+    return chunks
+
+
+_WORD_PATTERN = re.compile(r"\w+")
+_HANGUL_PATTERN = re.compile(r"[\uac00-\ud7a3]")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    BM25용 토큰화
+
+    영문/숫자는 소문자 단어 단위, 3글자 이상 한글 단어는 음절 바이그램으로 분리하여
+    조사/어미가 붙은 형태("머신러닝을")도 질문의 단어("머신러닝")와 매칭되도록 함.
+    """
+    tokens = []
+    for word in _WORD_PATTERN.findall(text.lower()):
+        if len(word) > 2 and _HANGUL_PATTERN.search(word):
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+class ChunkIndex:
+    """
+    자막 청크 집합에 대한 BM25 역색인
+
+    색인 시 용어별 (청크 번호, 빈도) 포스팅 목록과 청크 길이를 한 번 계산해 두고,
+    질의 시에는 질문 용어의 포스팅만 순회하여 점수를 계산함.
+    """
+
+    def __init__(self, texts: list[str]):
+        self.postings: dict[str, list[tuple[int, int]]] = {}
+        self.lengths: list[int] = []
+        for doc_id, text in enumerate(texts):
+            counts: dict[str, int] = {}
+            tokens = tokenize(text)
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                self.postings.setdefault(token, []).append((doc_id, tf))
+            self.lengths.append(len(tokens))
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+    def scores(self, query: str) -> list[float]:
+        """청크별 BM25 점수 (질문 용어가 없는 청크는 0)"""
+        n = len(self.lengths)
+        result = [0.0] * n
+        if not n:
+            return result
+        for token in set(tokenize(query)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[doc_id] / (self.avg_length or 1))
+                result[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+        return result
+
+
+def rank_transcripts(question: str, results: list[dict], top_k: int, top_k_total: int) -> list[dict]:
+    """
+    모든 영상의 자막 청크를 질문 기준 BM25로 점수화
+
+    - 각 영상의 transcripts를 점수 상위 top_k개로 줄이고 시간 순서로 정렬 (각 청크에 score 추가)
+    - 전체 영상에서 점수 상위 top_k_total개 청크를 영상 정보와 함께 반환
+    """
+    refs = [(video, chunk) for video in results for chunk in video["transcripts"]]
+    scores = ChunkIndex([chunk["text"] for _, chunk in refs]).scores(question)
+    for (_, chunk), score in zip(refs, scores):
+        chunk["score"] = round(score, 4)
+
+    for video in results:
+        best = heapq.nlargest(top_k, enumerate(video["transcripts"]), key=lambda c: (c[1]["score"], -c[0]))
+        video["transcripts"] = [chunk for _, chunk in sorted(best, key=lambda c: c[0])]
+
+    best = heapq.nlargest(top_k_total, range(len(refs)), key=lambda i: (scores[i], -i))
+    return [
+        {"rank": refs[i][0]["rank"], "video_id": refs[i][0]["video_id"], "title": refs[i][0]["title"], **refs[i][1]}
+        for i in best
+    ]
+
+
 def search_youtube(
     question: str,
     max_results: int = 3,
     days: int = 365,
     chunk_size_seconds: int = CHUNK_SIZE_SECONDS,
     max_fetch: int = 20,
+    workers: int = TRANSCRIPT_WORKERS,
+    cache: SearchCache | None = None,
+    executor: ThreadPoolExecutor | None = None,
+    top_k: int = 0,
+    top_k_total: int | None = None,
+    chunk_tokens: int = 0,
+    overlap_tokens: int = CHUNK_OVERLAP_TOKENS,
 ) -> dict:
     """
     YouTube 검색 후 자막이 있는 영상만 골라 JSON 형식으로 반환
 
     자막이 없는 영상은 건너뛰고, max_results개의 자막 있는 영상이 모일 때까지
-    최대 max_fetch개의 후보를 순서대로 시도함.
+    최대 max_fetch개의 후보를 시도함. 자막은 workers개씩 동시에 로드하되 결과는 검색 관련도 순서를
+    유지하며, 목표 수를 채우면 아직 시작하지 않은 로드는 취소함.
 
     Args:
         question: 검색 질문
@@ -160,11 +533,18 @@ def search_youtube(
         days: 최근 N일 이내 영상만 검색 (기본값: 365)
         chunk_size_seconds: 자막 청크 크기 (초, 기본값: 120)
         max_fetch: API에서 가져올 최대 후보 수 (기본값: 20, 최대: 50)
+        workers: 동시 자막 로드 수 (기본값: 8)
+        cache: 검색 결과/자막 캐시 (None이면 캐시 사용 안 함)
+        executor: 자막 로드에 사용할 공유 스레드 풀 (None이면 workers개 풀을 만들어 사용 후 종료)
+        top_k: 0보다 크면 질문과의 BM25 점수로 영상별 상위 top_k개 청크만 반환 (기본값: 0, 전체 반환)
+        top_k_total: 전체 영상 기준 상위 청크 수 (top_chunks, 기본값: top_k)
+        chunk_tokens: 0보다 크면 토큰 예산 기반 문장 단위 청킹 (기본값: 0, 시간 기반)
+        overlap_tokens: 토큰 예산 청킹 시 청크 간 겹침 토큰 수 (기본값: 40)
 
     Returns:
         {
           "query": str,
-          "params": {max_results, days, chunk_size_seconds, max_fetch},
+          "params": {max_results, days, chunk_size_seconds, max_fetch, workers, top_k, chunk_tokens, overlap_tokens},
           "results": [
             {
               "rank": int,
@@ -178,11 +558,13 @@ def search_youtube(
                   "text": str,
                   "start_seconds": int,
                   "timestamp": str,   # "M:SS"
-                  "timestamp_url": str
+                  "timestamp_url": str,
+                  "score": float      # top_k 사용 시
                 }, ...
               ]
             }, ...
           ],
+          "top_chunks": [...],        # top_k 사용 시: 전체 상위 청크 (rank, video_id, title + 청크 필드)
           "error": str | null
         }
     """
@@ -193,6 +575,10 @@ def search_youtube(
             "days": days,
             "chunk_size_seconds": chunk_size_seconds,
             "max_fetch": max_fetch,
+            "workers": workers,
+            "top_k": top_k,
+            "chunk_tokens": chunk_tokens,
+            "overlap_tokens": overlap_tokens,
         },
         "results": [],
         "error": None,
@@ -204,70 +590,87 @@ def search_youtube(
         return result
 
     try:
-        youtube = build("youtube", "v3", developerKey=api_key)
-
-        # publishedAfter: 최근 N일 이내 영상만 검색 (ISO 8601 형식)
-        published_after = (
-            datetime.now(timezone.utc) - timedelta(days=days)
-        ).strftime("%Y-%m-%dT%H:%M:%SZ")
-
         # 자막 있는 영상 max_results개 확보를 위해 max_fetch개 후보를 API에서 수집
         fetch_count = min(max(max_results, max_fetch), 50)  # YouTube API 최대 50개
-        request = youtube.search().list(
-            q=question,
-            part="snippet",
-            type="video",
-            order="relevance",
-            publishedAfter=published_after,
-            maxResults=fetch_count,
-            relevanceLanguage="ko"
-        )
-        response = request.execute()
+        cache_key = SearchCache.search_key(question, days, SEARCH_LANGUAGE, fetch_count)
+        items = cache.get_search(cache_key) if cache is not None else None
+        if items is not None:
+            print(f"  [CACHE] 검색 결과 캐시 사용", file=sys.stderr)
+        else:
+            youtube = _youtube_client(api_key)
+
+            # publishedAfter: 최근 N일 이내 영상만 검색 (ISO 8601 형식)
+            published_after = (
+                datetime.now(timezone.utc) - timedelta(days=days)
+            ).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+            request = youtube.search().list(
+                q=question,
+                part="snippet",
+                type="video",
+                order="relevance",
+                publishedAfter=published_after,
+                maxResults=fetch_count,
+                relevanceLanguage=SEARCH_LANGUAGE
+            )
+            response = request.execute(http=_thread_http())
+            items = response.get("items", [])
+            if cache is not None and items:
+                cache.put_search(cache_key, items)
 
-        if not response.get("items"):
+        if not items:
             result["error"] = "검색 결과가 없습니다."
             return result
 
-        items = response["items"]
-        rank = 0
-        for idx, item in enumerate(items, 1):
-            # 목표 달성 시 중단
-            if len(result["results"]) >= max_results:
-                break
-
-            video_id = item["id"]["videoId"]
-            title = item["snippet"]["title"]
-            channel = item["snippet"]["channelTitle"]
-            published = item["snippet"]["publishedAt"][:10]
-            url = f"https://www.youtube.com/watch?v={video_id}"
-
-            print(
-                f"  [{idx}/{len(items)}] 후보 검사 중 (자막 확보: {len(result['results'])}/{max_results})",
-                file=sys.stderr
+        print(f"  후보 {len(items)}개 자막 로드 중", file=sys.stderr)
+        pool = executor or ThreadPoolExecutor(max_workers=max(1, workers))
+        futures = [
+            pool.submit(
+                load_transcript, item["id"]["videoId"], chunk_size_seconds, cache, chunk_tokens, overlap_tokens
             )
-            print(f"    {title}", file=sys.stderr)
-            print(f"    자막 로드 중: {url}", file=sys.stderr)
-
-            transcripts = load_transcript(video_id, chunk_size_seconds)
-
-            if not transcripts:
-                print(f"    [!] 자막 없음 — 건너뜀", file=sys.stderr)
-                continue
-
-            rank += 1
-            print(f"    [OK] {len(transcripts)}개 청크 로드 완료", file=sys.stderr)
-            result["results"].append({
-                "rank": rank,
-                "title": title,
-                "channel": channel,
-                "published": published,
-                "video_id": video_id,
-                "url": url,
-                "transcripts": transcripts,
-            })
+            for item in items
+        ]
+        try:
+            # 완료 순서와 무관하게 관련도 순서대로 결과 확인
+            for idx, (item, future) in enumerate(zip(items, futures), 1):
+                video_id = item["id"]["videoId"]
+                title = item["snippet"]["title"]
+                transcripts = future.result()
+
+                print(
+                    f"  [{idx}/{len(items)}] {title} (자막 확보: {len(result['results'])}/{max_results})",
+                    file=sys.stderr
+                )
+                if not transcripts:
+                    print(f"    [!] 자막 없음 — 건너뜀", file=sys.stderr)
+                    continue
+
+                print(f"    [OK] {len(transcripts)}개 청크 로드 완료", file=sys.stderr)
+                result["results"].append({
+                    "rank": len(result["results"]) + 1,
+                    "title": title,
+                    "channel": item["snippet"]["channelTitle"],
+                    "published": item["snippet"]["publishedAt"][:10],
+                    "video_id": video_id,
+                    "url": f"https://www.youtube.com/watch?v={video_id}",
+                    "transcripts": transcripts,
+                })
+                # 목표 달성 시 중단
+                if len(result["results"]) >= max_results:
+                    break
+        finally:
+            # 아직 시작하지 않은 후보 로드 취소 (실행 중인 요청은 완료 후 캐시에만 반영)
+            for future in futures:
+                future.cancel()
+            if executor is None:
+                pool.shutdown()
 
         if not result["results"]:
             result["error"] = f"자막이 있는 영상을 찾지 못했습니다. (후보 {len(items)}개 시도)"
+        elif top_k > 0:
+            result["top_chunks"] = rank_transcripts(
+                question, result["results"], top_k, top_k_total if top_k_total is not None else top_k
+            )
 
     except Exception as e:
         result["error"] = str(e)
@@ -275,6 +678,74 @@ def search_youtube(
     return result
 
 
+def serve(
+    cache: SearchCache | None = None,
+    workers: int = TRANSCRIPT_WORKERS,
+    concurrency: int = SERVE_CONCURRENCY,
+):
+    """
+    stdin JSON Lines 서비스 모드
+
+    YouTube 클라이언트, 자막 API 연결, 캐시, 자막 로드 스레드 풀을 유지한 채
+    요청을 concurrency개까지 동시에 처리하고, 완료되는 순서대로 응답을 한 줄씩 stdout에 출력.
+    stdin이 닫히면 처리 중인 요청을 마친 뒤 종료.
+
+    요청: {"id": 1, "question": "...", "max_results": 3, "days": 365, "chunk_seconds": 120, "max_fetch": 20}
+    응답: {"id": 1, "query": ..., "params": ..., "results": [...], "error": null}
+    """
+    output_lock = threading.Lock()
+
+    def respond(payload: dict):
+        line = json.dumps(payload, ensure_ascii=False)
+        with output_lock:
+            sys.stdout.write(line + "\n")
+            sys.stdout.flush()
+
+    def handle(request: dict):
+        try:
+            output = search_youtube(
+                question=str(request["question"]),
+                max_results=int(request.get("max_results", 3)),
+                days=int(request.get("days", 365)),
+                chunk_size_seconds=int(request.get("chunk_seconds", CHUNK_SIZE_SECONDS)),
+                max_fetch=int(request.get("max_fetch", 20)),
+                top_k=int(request.get("top_k", 0)),
+                chunk_tokens=int(request.get("chunk_tokens", 0)),
+                overlap_tokens=int(request.get("overlap_tokens", CHUNK_OVERLAP_TOKENS)),
+                top_k_total=int(request["top_k_total"]) if request.get("top_k_total") is not None else None,
+                workers=workers,
+                cache=cache,
+                executor=transcript_pool,
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            output = {"error": f"잘못된 요청: {e!r}"}
+        except Exception as e:
+            # HTTP/할당량/SQLite 오류 등: 풀 안에서 삼켜지면 해당 id의 응답이 영영 나오지 않으므로 항상 응답
+            output = {"error": str(e) or repr(e)}
+        respond({"id": request.get("id"), **output})
+
+    api_key = os.environ.get("YOUTUBE_API_KEY")
+    if api_key:
+        _youtube_client(api_key)  # 첫 요청 전에 클라이언트 준비
+
+    print(f"서비스 모드: stdin으로 JSON 요청을 한 줄씩 받습니다 (동시 질의 {concurrency}개, 자막 로드 {workers}개)",
+          file=sys.stderr)
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="transcript") as transcript_pool, \
+            ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="query") as query_pool:
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("요청은 JSON 객체여야 합니다")
+            except ValueError as e:
+                respond({"id": None, "error": f"잘못된 JSON: {e}"})
+                continue
+            query_pool.submit(handle, request)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="YouTube Data API v3 기반 YouTube 검색 + 자막 추출 CLI (JSON 출력)",
@@ -286,7 +757,7 @@ def main():
   python youtube_search.py "LLM 강의" --max-results 10 --days 7 --chunk-seconds 60
         """
     )
-    parser.add_argument("question", help="검색할 키워드 또는 질문")
+    parser.add_argument("question", nargs="?", help="검색할 키워드 또는 질문 (--serve 사용 시 생략)")
     parser.add_argument(
         "--max-results", "-n",
         type=int,
@@ -308,6 +779,20 @@ def main():
         metavar="N",
         help=f"자막 청크 크기 (초 단위, 기본값: {CHUNK_SIZE_SECONDS})"
     )
+    parser.add_argument(
+        "--chunk-tokens", "-t",
+        type=int,
+        default=0,
+        metavar="N",
+        help="시간 대신 토큰 예산(N)으로 문장/쉼 경계에 맞춰 청킹, 0이면 --chunk-seconds 사용 (기본값: 0)"
+    )
+    parser.add_argument(
+        "--overlap-tokens",
+        type=int,
+        default=CHUNK_OVERLAP_TOKENS,
+        metavar="N",
+        help=f"토큰 예산 청킹 시 앞 청크와 겹치는 토큰 수 (기본값: {CHUNK_OVERLAP_TOKENS})"
+    )
     parser.add_argument(
         "--max-fetch", "-f",
         type=int,
@@ -315,16 +800,72 @@ def main():
         metavar="N",
         help="자막 확보를 위해 API에서 가져올 최대 후보 수 (기본값: 20, 최대: 50)"
     )
+    parser.add_argument(
+        "--top-k", "-k",
+        type=int,
+        default=0,
+        metavar="K",
+        help="질문과 관련도(BM25)가 높은 청크만 영상별 K개 반환, 0이면 전체 (기본값: 0)"
+    )
+    parser.add_argument(
+        "--top-k-total",
+        type=int,
+        default=None,
+        metavar="K",
+        help="전체 영상 기준 상위 청크 수 (top_chunks, 기본값: --top-k)"
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="서비스 모드: stdin으로 JSON 요청을 한 줄씩 받아 응답을 한 줄씩 출력"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=SERVE_CONCURRENCY,
+        metavar="N",
+        help=f"서비스 모드 동시 처리 질의 수 (기본값: {SERVE_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"검색 결과/자막 캐시 사용 안 함 (캐시 위치: {CACHE_PATH})"
+    )
+    parser.add_argument(
+        "--workers", "-w",
+        type=int,
+        default=TRANSCRIPT_WORKERS,
+        metavar="N",
+        help=f"동시 자막 로드 수 (기본값: {TRANSCRIPT_WORKERS})"
+    )
 
     args = parser.parse_args()
 
+    if not args.serve and not args.question:
+        parser.error("question이 필요합니다 (또는 --serve)")
+
+    cache = None if args.no_cache else SearchCache()
+    if args.serve:
+        serve(cache, workers=args.workers, concurrency=args.concurrency)
+        if cache is not None:
+            cache.close()
+        return
+
     output = search_youtube(
         question=args.question,
         max_results=args.max_results,
         days=args.days,
         chunk_size_seconds=args.chunk_seconds,
         max_fetch=args.max_fetch,
+        workers=args.workers,
+        cache=cache,
+        top_k=args.top_k,
+        top_k_total=args.top_k_total,
+        chunk_tokens=args.chunk_tokens,
+        overlap_tokens=args.overlap_tokens,
     )
+    if cache is not None:
+        cache.close()
     print(json.dumps(output, ensure_ascii=False, indent=2))
 
 